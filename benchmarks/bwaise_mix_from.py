@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+QSDsan: Quantitative Sustainable Design for sanitation and resource recovery systems
+
+This module is under the University of Illinois/NCSA Open Source License.
+Please refer to https://github.com/QSD-Group/QSDsan/blob/master/LICENSE.txt
+for license details.
+
+Benchmark of :func:`qsdsan.WasteStream.mix_from` on the bwaise systems,
+comparing the vectorized mixing of state variables against the previous
+slot-by-slot implementation, run with:
+
+    python benchmarks/bwaise_mix_from.py
+
+'''
+
+from math import isclose
+from timeit import repeat
+from thermosteam import Stream
+from qsdsan import WasteStream
+from qsdsan._waste_stream import _ws_specific_slots, _ws_mixed_slots
+from qsdsan.systems import bwaise as bw
+
+new_mix_from = WasteStream.mix_from
+
+def legacy_mix_from(self, others):
+    Stream.mix_from(self, others)
+    self._reset_composite_cache()
+    for slot in _ws_specific_slots:
+        try: tot = sum(float(getattr(i, slot))*i.F_vol for i in others)
+        except: continue
+        if tot == 0.:
+            setattr(self, slot, None)
+        else:
+            setattr(self, slot, tot/self.F_vol)
+
+def get_states(sys):
+    return {ws.ID: tuple(getattr(ws, slot) for slot in _ws_mixed_slots)
+            for ws in sys.streams}
+
+def same_states(states1, states2):
+    for ID, values1 in states1.items():
+        for i, j in zip(values1, states2[ID]):
+            if i is None or j is None:
+                if i is not j: return False
+            elif not isclose(i, j, rel_tol=1e-12): return False
+    return True
+
+def get_mixing_units(sys):
+    return [(u.outs[0], u.ins) for u in sys.units
+            if len(u.ins) > 1 and isinstance(u.outs[0], WasteStream)]
+
+def benchmark(number=200):
+    for sys in (bw.sysA, bw.sysB, bw.sysC):
+        pairs = get_mixing_units(sys)
+        times, states = {}, {}
+        for name, mix_from in (('legacy', legacy_mix_from),
+                               ('vectorized', new_mix_from),
+                               ('flow only', Stream.mix_from)):
+            WasteStream.mix_from = mix_from
+            sys.simulate()
+            states[name] = get_states(sys)
+            times[name] = min(repeat(lambda: [out.mix_from(ins) for out, ins in pairs],
+                                     number=number, repeat=15)) / number
+        WasteStream.mix_from = new_mix_from
+        sys.simulate()
+        assert same_states(states['legacy'], states['vectorized'])
+        # time spent on mixing the state variables
+        legacy, vectorized = (times[i]-times['flow only'] for i in ('legacy', 'vectorized'))
+        print(f'{sys.ID}: {len(pairs)} mixing units, '
+              f'legacy {times["legacy"]*1e6:.0f} µs, '
+              f'vectorized {times["vectorized"]*1e6:.0f} µs; '
+              f'state variables only: legacy {legacy*1e6:.0f} µs, '
+              f'vectorized {vectorized*1e6:.0f} µs, '
+              f'speedup {legacy/vectorized:.1f}x')
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+QSDsan: Quantitative Sustainable Design for sanitation and resource recovery systems
+
+This module is under the University of Illinois/NCSA Open Source License.
+Please refer to https://github.com/QSD-Group/QSDsan/blob/master/LICENSE.txt
+for license details.
+
+Benchmark of building a flowsheet with many units, comparing the current
+construction of :class:`qsdsan.WasteStream` against the previous one
+(mass-based property arrays were always created and missing streams were printed),
+run with:
+
+    python benchmarks/flowsheet_startup.py
+
+'''
+
+import io, contextlib
+from timeit import repeat
+from thermosteam import Stream
+import biosteam as bst
+import qsdsan as qs
+from qsdsan import WasteStream, sanunits
+from qsdsan.utils.piping import WSSequence, MissingWS
+
+new_init = WasteStream.__init__
+new_create_missing_stream = WSSequence._create_missing_stream
+
+def legacy_init(self, ID='', flow=(), phase='l', T=298.15, P=101325.,
+                units='kg/hr', price=0., thermo=None, pH=7., SAlk=2.5,
+                impact_item=None, **chemical_flows):
+    Stream.__init__(self, ID=ID, flow=flow, phase=phase, T=T, P=P,
+                    units=units, price=price, thermo=thermo, **chemical_flows)
+    self._init_ws(pH, SAlk, impact_item=impact_item)
+
+def legacy_create_missing_stream(self):
+    MissingWS(None, None).show()
+    return MissingWS(None, None)
+
+def build(N):
+    # a chain of mixers and splitters, each mixer has one extra feed
+    # and one missing inlet
+    bst.main_flowsheet.clear()
+    ws = WasteStream('feed', H2O=1000, units='kg/hr')
+    units = []
+    for i in range(N):
+        M = sanunits.Mixer(f'M{i}', ins=(ws, 'water', ''))
+        S = sanunits.Splitter(f'S{i}', ins=M-0, outs=('', ''), split=0.5)
+        ws = S-0
+        units.extend((M, S))
+    return units
+
+def benchmark(N=200, number=3):
+    components = qs.Components.load_default()
+    qs.set_thermo(components)
+    times = {}
+    for name, init, create in (('legacy', legacy_init, legacy_create_missing_stream),
+                               ('current', new_init, new_create_missing_stream)):
+        WasteStream.__init__ = init
+        WSSequence._create_missing_stream = create
+        with contextlib.redirect_stdout(io.StringIO()):
+            times[name] = min(repeat(lambda: build(N), number=number, repeat=3)) / number
+    WasteStream.__init__ = new_init
+    WSSequence._create_missing_stream = new_create_missing_stream
+    print(f'{2*N} units: legacy {times["legacy"]*1e3:.1f} ms, '
+          f'current {times["current"]*1e3:.1f} ms, '
+          f'speedup {times["legacy"]/times["current"]:.1f}x')
+
+
+if __name__ == '__main__':
+    benchmark()
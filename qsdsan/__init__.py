@@ -30,6 +30,7 @@ from .utils import descriptors
 from ._component import *
 from ._components import *
 from ._waste_stream import *
+from ._stream_table import *
 from ._impact_indicator import *
 from ._impact_item import *
 from ._construction import *
@@ -47,6 +48,7 @@ from . import (
     _component,
     _components,
     _waste_stream,
+    _stream_table,
     _impact_indicator,
     _impact_item,
     _construction,
@@ -69,6 +71,7 @@ __all__ = (
     *_component.__all__,
     *_components.__all__,
     *_waste_stream.__all__,
+    *_stream_table.__all__,
     *_impact_indicator.__all__,
     *_impact_item.__all__,
     *_construction.__all__,
@@ -34,6 +34,23 @@ _key_component_properties = _component._key_component_properties
 _TMH = tmo.base.thermo_model_handle.ThermoModelHandle
 _PH = tmo.base.phase_handle.PhaseHandle
 
+_defined_composite_vars = ('COD', 'BOD5', 'BOD', 'uBOD', 'NOD', 'ThOD', 'cnBOD',
+                           'C', 'N', 'P', 'K', 'Mg', 'Ca', 'solids', 'charge')
+
+# Particle size and volatility of the solids fractions in `SolidsProfile`
+_solids_profile_specs = (('s', None), ('c', None), ('x', None),
+                         ('c', True), ('x', True), ('x', False))
+
+_specific_groups = {'S_VFA': ('S_Ac', 'S_Prop'),
+                    'X_Stor': ('X_OHO_PHA', 'X_GAO_PHA', 'X_PAO_PHA', 
+                              'X_GAO_Gly', 'X_PAO_Gly'),
+                    'X_ANO': ('X_AOO', 'X_NOO'),
+                    'X_Bio': ('X_OHO', 'X_AOO', 'X_NOO', 'X_AMO', 'X_PAO', 
+                             'X_MEOLO', 'X_ACO', 'X_HMO', 'X_PRO', 'X_FO'),
+                    'S_NOx': ('S_NO2', 'S_NO3'),
+                    'X_PAO_PP': ('X_PAO_PP_Lo', 'X_PAO_PP_Hi'),
+                    'TKN': ()}
+
 
 # %%
 
@@ -343,6 +360,7 @@ class CompiledComponents(CompiledChemicals):
         components = self.tuple
         for i in _num_component_properties:
             dct[i] = component_data_array(components, i)
+        dct['_composite_cache'] = {}
 
     def compile(self, skip_checks=False):
         '''Skip, :class:`CompiledComponents` have already been compiled.'''
@@ -368,6 +386,125 @@ class CompiledComponents(CompiledChemicals):
         dct['b'] = np.asarray([1 if cmp.degradability != 'Undegradable' else 0 for cmp in components])
         dct['rb'] = np.asarray([1 if cmp.degradability == 'Readily' else 0 for cmp in components])
         dct['org'] = np.asarray([int(cmp.organic) for cmp in components])
+        dct['_composite_cache'] = {}
+
+    def get_composite_coefficients(self, variable, particle_size=None,
+                                   degradability=None, organic=None,
+                                   volatile=None, specification=None):
+        '''
+        Return the per-component weights of a composite variable so that
+        the dot product of the weights and the mass flows [kg/hr] divided by
+        the volumetric flow [m3/hr] gives the composite variable in mg/L
+        (or mmol/L for "charge").
+        
+        Weights are calculated once for each combination of the specifications
+        and cached, refer to :func:`WasteStream.composite` for the parameters.
+        
+        .. note::
+            
+            Cached weights are cleared by :func:`refresh_constants`, call it
+            after changing component-specific properties of the 
+            :class:`Component` objects.
+        
+        '''
+        key = (variable, particle_size, degradability, organic, volatile, specification)
+        cache = self._composite_cache
+        try: return cache[key]
+        except KeyError: pass
+        
+        if variable not in _defined_composite_vars:
+            raise KeyError(f"Undefined composite variable {variable},"
+                           f"Must be one of {_defined_composite_vars}.")
+        
+        _get = getattr
+        IDs = self.IDs
+        included = np.asarray([ID != 'H2O' for ID in IDs])
+        if specification:
+            if specification == 'TKN':
+                included *= np.asarray([ID not in ('S_N2','S_NO2','S_NO3') for ID in IDs])
+            elif specification not in _specific_groups.keys():
+                raise KeyError(f"Undefined specification {specification}."
+                               f"Must be one of {_specific_groups.keys()}."
+                               "Or, try defining 'subgroup'.")
+            else:
+                group = _specific_groups[specification]
+                included *= np.asarray([ID in group for ID in IDs])
+        
+        exclude_gas = self.s + self.c + self.x
+        i_COD = self.i_COD * (self.i_COD >= 0)
+        if variable == 'COD':
+            var = i_COD * exclude_gas
+        elif variable == 'uBOD':
+            var = i_COD * self.f_uBOD_COD * exclude_gas
+        elif variable in ('BOD5', 'BOD'):
+            var = i_COD * self.f_BOD5_COD * exclude_gas
+        elif variable == 'NOD':
+            var = self.i_NOD * exclude_gas
+        elif variable == 'ThOD':
+            var = self.i_NOD + i_COD
+        elif variable == 'cnBOD':
+            var = (self.i_NOD + i_COD * self.f_BOD5_COD) * exclude_gas
+        elif variable == 'C':
+            var = self.i_C.copy()
+        elif variable == 'N':
+            var = self.i_N * exclude_gas
+        elif variable == 'P':
+            var = self.i_P.copy()
+        elif variable == 'K':
+            var = self.i_K.copy()
+        elif variable == 'Mg':
+            var = self.i_Mg.copy()
+        elif variable == 'Ca':
+            var = self.i_Ca.copy()
+        elif variable == 'solids':
+            var = self.i_mass * exclude_gas
+            if volatile != None:
+                if volatile: var *= self.f_Vmass_Totmass
+                else: var *= 1-self.f_Vmass_Totmass
+        else:
+            var = self.i_charge.copy()
+        
+        if particle_size:
+            if particle_size == 'g':
+                var *= 1-exclude_gas
+            else:
+                var *= _get(self, particle_size)
+        
+        if degradability:
+            if degradability == 'u': var *= 1-self.b
+            elif degradability == 'b': var *= self.b
+            elif degradability == 'rb': var *= self.rb
+            else: var *= self.b-self.rb
+        
+        if organic != None:
+            if organic: var *= self.org
+            else: var *= 1-self.org
+        
+        var = var * included * 1e3 # [kg/m3] to [mg/L]
+        var.setflags(0)
+        cache[key] = var
+        return var
+    
+    def get_solids_coefficients(self):
+        '''
+        Return the per-component weights of all solids fractions
+        as a (components × fractions) array, columns are in the order of
+        :class:`~._waste_stream.SolidsProfile`, i.e., dissolved, colloidal,
+        particulate, volatile colloidal, volatile particulate,
+        and inorganic particulate solids.
+        
+        Refer to :func:`get_composite_coefficients` for the weights and caching.
+        
+        '''
+        cache = self._composite_cache
+        try: return cache['solids_profile']
+        except KeyError: pass
+        get = self.get_composite_coefficients
+        coeffs = np.column_stack([get('solids', particle_size=i, volatile=j)
+                                  for i, j in _solids_profile_specs])
+        coeffs.setflags(0)
+        cache['solids_profile'] = coeffs
+        return coeffs
     
     def subgroup(self, IDs):
         '''Create a new subgroup of :class:`Component` objects.'''
@@ -380,6 +517,40 @@ class CompiledComponents(CompiledChemicals):
                 except: pass
         return new
     
+    def overlay(self, properties):
+        '''
+        Create a new :class:`CompiledComponents` with some of the
+        component-specific properties (e.g., `i_N`) changed.
+        
+        The new object shares the :class:`Component` objects and all the
+        compiled arrays of the original one, only arrays of the changed
+        properties are copied.
+        
+        Parameters
+        ----------
+        properties : dict
+            Properties to be changed, as {property: {component ID: value}}.
+        
+        .. note::
+            
+            Attributes of the :class:`Component` objects are not changed,
+            and the changes will be lost after :func:`refresh_constants`.
+        
+        '''
+        new = object.__new__(self.__class__)
+        dct = new.__dict__
+        dct.update(self.__dict__)
+        for attr, values in properties.items():
+            if attr not in _num_component_properties:
+                raise ValueError(f'"{attr}" is not a numerical component-specific '
+                                 f'property, must be one of {_num_component_properties}.')
+            data = dct[attr].copy()
+            data[self.indices(values.keys())] = tuple(values.values())
+            data.setflags(0)
+            dct[attr] = data
+        dct['_composite_cache'] = {}
+        return new
+    
     def index(self, ID):
         '''Return index of specified component.'''
         try: return self._index[ID]
@@ -43,6 +43,9 @@ class Construction:
 
     __slots__ = ('_item', '_quantity', '_lifetime')
     
+    # Counts changes of all construction activities
+    _version = 0
+    
     def __init__(self, item=None, quantity=0., quantity_unit='',
                  lifetime=None, lifetime_unit='yr'):
         self.item = item
@@ -52,6 +55,7 @@ class Construction:
             self._lifetime = auom(lifetime_unit).convert(lifetime, 'yr')
 
     def _update_quantity(self, quantity=0., quantity_unit=''):
+        Construction._version += 1
         if not quantity_unit or quantity_unit == self.item.functional_unit:
             self._quantity = float(quantity)
         else:
@@ -99,8 +103,9 @@ class Construction:
         return self._lifetime
     @lifetime.setter
     def lifetime(self, lifetime, unit='yr'):
+        Construction._version += 1
         if lifetime is None:
-            self.lifetime = lifetime
+            self._lifetime = lifetime
         else:
             self._lifetime = auom(unit).convert(lifetime, 'yr')
     
@@ -115,6 +120,7 @@ class Construction:
         elif i is not ImpactItem:
             raise TypeError('Only <ImpactItem> or  <ImpactItem>.ID can be set, '
                             f'not {type(i).__name__}.')
+        Construction._version += 1
         self._item = i
 
     @property
@@ -30,6 +30,64 @@ getattr = getattr
 
 __all__ = ('ImpactItem', 'StreamImpactItem')
 
+class CFDict(dict):
+    '''
+    A dict of characterization factors that counts its changes,
+    so that results calculated from the factors (e.g., in :class:`LCA`)
+    can be reused until any of the factors are changed.
+    '''
+    
+    __slots__ = ('version',)
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = 0
+    
+    def _changed(self, new_keys=True):
+        self.version += 1
+        ImpactItem._CF_version += 1
+        # new or removed indicators change the linkage of the items and indicators
+        if new_keys: ImpactItem._link_version += 1
+    
+    def __setitem__(self, key, value):
+        new_key = key not in self
+        super().__setitem__(key, value)
+        self._changed(new_key)
+    
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+    
+    def update(self, *args, **kwargs):
+        n = len(self)
+        keys = set(self)
+        super().update(*args, **kwargs)
+        self._changed(len(self) != n or set(self) != keys)
+    
+    def pop(self, *args):
+        n = len(self)
+        value = super().pop(*args)
+        self._changed(len(self) != n)
+        return value
+    
+    def popitem(self):
+        item = super().popitem()
+        self._changed()
+        return item
+    
+    def setdefault(self, key, default=None):
+        if key not in self: self[key] = default
+        return self[key]
+    
+    def clear(self):
+        super().clear()
+        self._changed()
+    
+    def copy(self):
+        return CFDict(self)
+    __copy__ = copy
+
+
 def check_source(item):
     if item.source:
         raise ValueError(f'This ImpactItem is copied from {item.source.ID}, '
@@ -61,6 +119,12 @@ class ImpactItem:
     _items = {}
     _default_data = None
     
+    # Counts changes of the characterization factors of all items
+    _CF_version = 0
+    
+    # Counts changes of the linkage of items (e.g., to streams, units, and indicators)
+    _link_version = 0
+    
     __slots__ = ('_ID', '_functional_unit', '_price', '_CFs', '_source')
     
     def __init__(self, ID=None, functional_unit='kg', price=0., price_unit='',
@@ -73,7 +137,7 @@ class ImpactItem:
             self._source = None
             self._functional_unit = auom(functional_unit)
             self._update_price(price, price_unit)
-            self._CFs = {}
+            self._CFs = CFDict()
             for CF, value in indicator_CFs.items():
                 try:
                     CF_value, CF_unit = value # unit provided for CF
@@ -295,7 +359,7 @@ class StreamImpactItem(ImpactItem):
         else:
             self._source = None
             self._functional_unit = auom('kg')
-            self._CFs = {}
+            self._CFs = CFDict()
             for CF, value in indicator_CFs.items():
                 try:
                     CF_value, CF_unit = value # unit provided for CF
@@ -414,6 +478,7 @@ class StreamImpactItem(ImpactItem):
                     warn(message=msg, stacklevel=2)
             new_ws._impact_item = self
         self._linked_stream = new_ws
+        ImpactItem._link_version += 1
 
     @property
     def ID(self):
@@ -18,7 +18,7 @@ for license details.
 import math
 import numpy as np
 import pandas as pd
-from . import ImpactItem, WasteStream
+from . import ImpactItem, WasteStream, Construction, Transportation
 from ._units_of_measure import auom
 from .utils.formatting import format_number as f_num
 
@@ -53,20 +53,20 @@ class LCA:
     __slots__ = ('_system',  '_lifetime', '_uptime_ratio',
                  '_construction_units', '_transportation_units',
                  '_lca_streams', '_impact_indicators',
-                 '_other_items', '_other_items_f')
+                 '_other_items', '_other_items_f', '_stream_CFs', '_cache',
+                 '_inventory')
     
     
     def __init__(self, system, lifetime, lifetime_unit='yr', uptime_ratio=1,
                  **item_quantities):
         system.simulate()
-        self._construction_units = set()
-        self._transportation_units = set()
-        self._lca_streams = set()
+        self._stream_CFs = None
+        self._cache = {}
+        self._other_items = {}
+        self._other_items_f = {}
         self._update_system(system)
         self._update_lifetime(lifetime, lifetime_unit)
         self.uptime_ratio = uptime_ratio
-        self._other_items = {}
-        self._other_items_f = {}
         for item, val in item_quantities.items():
             try:
                 f_quantity, unit = val # unit provided for the quantity
@@ -77,21 +77,58 @@ class LCA:
             
     
     def _update_system(self, system):
-        for u in system.units:
-            if u.construction:
-                self._construction_units.add(u)
-            if u.transportation:
-                self._transportation_units.add(u)
-        self._construction_units = sorted(self._construction_units,
-                                          key=lambda u: u.ID)
-        self._transportation_units = sorted(self._transportation_units,
-                                            key=lambda u: u.ID)
-        for s in (i for i in system.feeds+system.products):
-            if s.impact_item:
-                self._lca_streams.add(s)
-        self._lca_streams = sorted(self._lca_streams, key=lambda s: s.ID)
         self._system = system
-
+        self.refresh()
+    
+    def refresh(self):
+        '''
+        Refresh the units, streams, inventories, and impact indicators of this LCA 
+        from the linked system, which are built once and kept until refreshed.
+        
+        .. note::
+            
+            Changes in the activities of the units, the items linked to the 
+            streams, and the indicators of the items are detected and refreshed 
+            automatically, this only needs to be called after the linked system 
+            is changed (e.g., units or streams are added or removed).
+        '''
+        system = self._system
+        units = sorted(system.units, key=lambda u: u.ID)
+        self._construction_units = [u for u in units if u.construction]
+        self._transportation_units = [u for u in units if u.transportation]
+        self._lca_streams = sorted(set(s for s in system.feeds+system.products
+                                       if s.impact_item),
+                                   key=lambda s: s.ID)
+        inventory = self._inventory = {'version': ImpactItem._link_version}
+        # rows of the activities of each unit in the inventories
+        for cat in ('construction', 'transportation'):
+            activities = []
+            rows = inventory[f'{cat}_rows'] = {}
+            for u in getattr(self, f'_{cat}_units'):
+                start = len(activities)
+                activities.extend(getattr(u, cat))
+                rows[u] = range(start, len(activities))
+            inventory[cat] = tuple(activities)
+        inventory['stream'] = stream_items = tuple(s.impact_item for s in self._lca_streams)
+        other_items = [items[i] for i in self._other_items]
+        inds = set()
+        for item in (*(i.item for i in inventory['construction']), 
+                     *(i.item for i in inventory['transportation']),
+                     *stream_items, *other_items):
+            inds.update(item.indicators)
+        self._impact_indicators = tuple(sorted(inds, key=lambda ind: ind.ID))
+        inventory['indicator_index'] = dict((ind.ID, n) for n, ind in 
+                                            enumerate(self._impact_indicators))
+        self._stream_CFs = None
+        self._cache.clear()
+    
+    def _get_inventory(self):
+        # refresh when the linkage of any items has changed
+        inventory = self._inventory
+        if inventory is None or inventory['version'] != ImpactItem._link_version:
+            self.refresh()
+            inventory = self._inventory
+        return inventory
 
     def _update_lifetime(self, lifetime=0., unit='yr'):
         if not unit or unit == 'yr':
@@ -119,6 +156,7 @@ class LCA:
                                  f'item functional unit {fu} is not supported.')
         self._other_items_f[item.ID] = {'item':item, 'f_quantity':f, 'unit':unit}
         self.other_items[item.ID] = {'item':item, 'quantity':quantity}
+        self._inventory = None # indicators to be refreshed
         
     
     def refresh_other_items(self):
@@ -158,7 +196,8 @@ class LCA:
     def get_construction_impacts(self, units, time=None, time_unit='hr'):
         '''
         Return all construction-related impacts for the given unit,
-        normalized to a certain time frame.
+        normalized to a certain time frame. Construction activities with lifetimes
+        are replaced over the lifetime of the LCA.
         '''
         if not (isinstance(units, tuple) or isinstance(units, list) or isinstance(units, set)):
             units = (units,)
@@ -167,17 +206,12 @@ class LCA:
         else:
             converted = auom(time_unit).convert(float(time), 'hr')
             ratio = converted/self.lifetime_hr
-        impacts = dict.fromkeys((i.ID for i in self.indicators), 0.)
-        for i in units:
-            for j in i.construction:
-                impact = j.impacts
-                if j.lifetime is not None:
-                    factor = math.ceil(time/j.lifetime)
-                else:
-                    factor = 1.
-                for m, n in impact.items():
-                    impacts[m] += n*ratio*factor
-        return impacts
+        activities = [j for u, j in self._get_activities(units, 'construction')]
+        lifetime = self.lifetime
+        quantities = [j.quantity*ratio*(1. if j.lifetime is None 
+                                        else math.ceil(lifetime/j.lifetime))
+                      for j in activities]
+        return self._get_impacts(quantities, [j.item for j in activities])
     
     def get_transportation_impacts(self, units, time=None, time_unit='hr'):
         '''
@@ -191,14 +225,52 @@ class LCA:
             time = self.lifetime_hr
         else:
             time = auom(time_unit).convert(float(time), 'hr')
-        impacts = dict.fromkeys((i.ID for i in self.indicators), 0.)
-        for i in units:
-            for j in i.transportation:
-                impact = j.impacts
-                for m, n in impact.items():
-                    impacts[m] += n*time/j.interval
-        return impacts
-    
+        activities = [j for u, j in self._get_activities(units, 'transportation')]
+        quantities = [j.quantity*time/j.interval for j in activities]
+        return self._get_impacts(quantities, [j.item for j in activities])
+    
+    def _get_activities(self, units, category):
+        # (unit, activity) of the units from the rows of the inventory,
+        # units not in the linked system use their own activities
+        inventory = self._get_inventory()
+        activities = inventory[category]
+        rows = inventory[f'{category}_rows']
+        for u in units:
+            try: unit_rows = rows[u]
+            except KeyError:
+                for i in getattr(u, category): yield u, i
+            else:
+                for n in unit_rows: yield u, activities[n]
+    
+    def _get_impacts(self, quantities, items):
+        # impacts of the quantities of the items as a dict of all indicators
+        self.indicators # make sure there are indicators
+        impacts = np.asarray(quantities, dtype=float) @ self._get_CF_matrix(items)
+        return dict(zip(self._inventory['indicator_index'], impacts.tolist()))
+    
+    def _get_CF_matrix(self, items):
+        # characterization factors as (items, indicators)
+        index = self._get_inventory()['indicator_index']
+        CFs = np.zeros((len(items), len(index)))
+        for n, item in enumerate(items):
+            for m, CF in item.CFs.items():
+                CFs[n, index[m]] = CF
+        return CFs
+    
+    def _get_stream_CFs(self, ind_IDs):
+        # row index and CF matrices (all, direct emission, and offset) of the 
+        # stream inventory, kept until the items or any characterization factors change
+        stream_items = self.stream_inventory
+        key = (stream_items, ind_IDs, ImpactItem._CF_version)
+        cached = self._stream_CFs
+        if cached is None or cached[0] != key:
+            CFs = self._get_CF_matrix(stream_items)
+            cached = self._stream_CFs = (key, 
+                                         dict(zip(stream_items, range(len(stream_items)))),
+                                         {'all': CFs,
+                                          'direct_emission': np.maximum(CFs, 0.),
+                                          'offset': np.minimum(CFs, 0.)})
+        return cached[1:]
     
     def get_stream_impacts(self, stream_items=None, exclude=None,
                            kind='all', time=None, time_unit='hr'):
@@ -206,19 +278,23 @@ class LCA:
         Return all stream-related impacts for the given streams,
         normalized to a certain time frame.
         '''
-        if not (isinstance(stream_items, tuple) or isinstance(stream_items, list)
-                or isinstance(stream_items, set)):
+        if kind not in ('all', 'direct_emission', 'offset'):
+            raise ValueError('kind can only be "all", "direct_emission", or "offset", '
+                             f'not {kind}.')
+        if stream_items is None:
+            stream_items = self.stream_inventory
+        elif not (isinstance(stream_items, tuple) or isinstance(stream_items, list)
+                  or isinstance(stream_items, set)):
             stream_items = (stream_items,)
         if not (isinstance(exclude, tuple) or isinstance(exclude, list)
                 or isinstance(exclude, set)):
             exclude = (exclude,)
-        if stream_items == None:
-            stream_items = self.stream_inventory
-        impacts = dict.fromkeys((i.ID for i in self.indicators), 0.)
         if not time:
             time = self.lifetime_hr
         else:
             time = auom(time_unit).convert(float(time), 'hr')
+        ws_items = []
+        F_mass = []
         for j in stream_items:
             # In case that ws instead of the item is given
             if isinstance(j, WasteStream):
@@ -229,18 +305,18 @@ class LCA:
             else:
                 ws = j.linked_stream
             if ws in exclude: continue
-            for m, n in j.CFs.items():
-                if kind == 'all':
-                    pass
-                elif kind == 'direct_emission':
-                    n = max(n, 0)
-                elif kind == 'offset':
-                    n = min(n, 0)
-                else:
-                    raise ValueError('kind can only be "all", "direct_emission", or "offset", '
-                                     f'not {kind}.')
-                impacts[m] += n*time*ws.F_mass
-        return impacts
+            ws_items.append(j)
+            F_mass.append(ws.F_mass)
+        ind_IDs = tuple(i.ID for i in self.indicators)
+        index, CFs = self._get_stream_CFs(ind_IDs)
+        rows = [index.get(j) for j in ws_items]
+        if None in rows: # items not in the inventory
+            CFs = self._get_CF_matrix(ws_items)
+            if kind == 'direct_emission': CFs = np.maximum(CFs, 0.)
+            elif kind == 'offset': CFs = np.minimum(CFs, 0.)
+        else: CFs = CFs[kind][rows]
+        impacts = np.asarray(F_mass, dtype=float) @ CFs * time
+        return dict(zip(ind_IDs, impacts.tolist()))
     
     def get_other_impacts(self):
         '''
@@ -258,6 +334,12 @@ class LCA:
     
     def get_total_impacts(self, exclude=None, time=None, time_unit='hr'):
         '''Return total impacts, normalized to a certain time frame.'''
+        if not (exclude or time):
+            totals = (self.total_construction_impacts, 
+                      self.total_transportation_impacts,
+                      self.total_stream_impacts,
+                      self.total_other_impacts)
+            return {m: sum(i[m] for i in totals) for m in totals[0]}
         impacts = dict.fromkeys((i.ID for i in self.indicators), 0.)
         ws_impacts = self.get_stream_impacts(stream_items=self.stream_inventory,
                                              exclude=exclude, time=time, time_unit=time_unit)
@@ -344,21 +426,106 @@ class LCA:
             tot[m] += trans[m] + ws[m] + other[m]
         return tot
     
-    def _append_cat_sum(self, cat_table, cat, tot):
-        num = len(cat_table)
-        cat_table.loc[num] = ''
-        for i in self.indicators:
-            cat_table[f'{i.ID} [{i.unit}]'][num] = tot[i.ID]
-            cat_table[f'Category {i.ID} Ratio'][num] = 1
-        if cat in ('construction', 'transportation'):        
-            cat_table.rename(index={num: ('Sum', 'All')}, inplace=True)
-            cat_table.index = \
-                pd.MultiIndex.from_tuples(cat_table.index,
-                                          names=[cat.capitalize(), 'SanUnit'])
-        else:
-            cat_table.rename(index={num: 'Sum'}, inplace=True)
-        return cat_table
-    
+    def get_CF_matrix(self):
+        '''
+        Return the characterization factors of all items as a numpy.ndarray 
+        of (items, indicators), the items are the ones of the 
+        :attr:`construction_inventory`, :attr:`transportation_inventory`, 
+        :attr:`stream_inventory`, and :attr:`other_items` (in this order), 
+        the indicators are the :attr:`indicators`.
+        '''
+        items = (*(i.item for i in self.construction_inventory),
+                 *(i.item for i in self.transportation_inventory),
+                 *self.stream_inventory,
+                 *(v['item'] for v in self.other_items.values()))
+        self.indicators # make sure there are indicators
+        return self._get_CF_matrix(items)
+    
+    def evaluate_batch(self, quantities=None, flows=None, CFs=None):
+        '''
+        Return total impacts of multiple samples (e.g., of a Monte Carlo simulation)
+        in one vectorized calculation.
+
+        Parameters
+        ----------
+        quantities : array_like, optional
+            Quantities of the activities in :attr:`construction_inventory`
+            as (samples, construction activities), current quantities will be used if not given.
+        flows : array_like, optional
+            Mass flows [kg/hr] of the streams of :attr:`stream_inventory`
+            as (samples, stream items), current flows will be used if not given.
+        CFs : array_like, optional
+            Characterization factors as (samples, items, indicators), 
+            with the items and indicators of :func:`get_CF_matrix`,
+            current values will be used if not given.
+
+        Returns
+        -------
+        impacts : numpy.ndarray
+            Impacts as (samples, indicators, categories), the categories are 
+            construction, transportation, stream, and other (in this order),
+            same as the total impacts of each category (e.g., :attr:`total_construction_impacts`).
+
+        .. note::
+            
+            Construction activities with lifetimes are replaced over the lifetime of the LCA.
+
+        '''
+        constr = self.construction_inventory
+        trans = self.transportation_inventory
+        stream_items = self.stream_inventory
+        self.refresh_other_items()
+        other = tuple(self.other_items.values())
+        sizes = [len(constr), len(trans), len(stream_items), len(other)]
+        if quantities is None: 
+            quantities = [i.quantity for i in constr]
+        if flows is None:
+            flows = [i.linked_stream.F_mass for i in stream_items]
+        if CFs is None:
+            CFs = self.get_CF_matrix()
+        quantities, flows, CFs = (np.asarray(i, dtype=float) for i in (quantities, flows, CFs))
+        N = max(len(i) if i.ndim == n else 1 for i, n in 
+                ((quantities, 2), (flows, 2), (CFs, 3)))
+        
+        lifetime_hr = self.lifetime_hr
+        factors = np.asarray([1. if i.lifetime is None else math.ceil(self.lifetime/i.lifetime)
+                              for i in constr])
+        # quantities over the lifetime of each item, as (samples, items)
+        amounts = np.concatenate([np.broadcast_to(i, (N, i.shape[-1])) for i in (
+            quantities * factors,
+            np.asarray([i.quantity*lifetime_hr/i.interval for i in trans]),
+            flows * lifetime_hr,
+            np.asarray([i['quantity'] for i in other]))], axis=-1)
+        categories = np.repeat(np.eye(4), sizes, axis=0) # (items, categories)
+        CF_subscripts = 'sri' if CFs.ndim == 3 else 'ri'
+        return np.einsum(f'sr,{CF_subscripts},rc->sic', amounts, CFs, categories)
+    
+    def _get_table(self, index, columns, quantities, row_items, tot, item_ratios=None):
+        # impact table with the sum row, assembled from arrays in one DataFrame
+        ind_IDs = tuple(i.ID for i in self.indicators)
+        CFs = self._get_CF_matrix(row_items)
+        has_CF = np.asarray([[i in item.CFs for i in ind_IDs] for item in row_items], 
+                            dtype=bool).reshape(CFs.shape)
+        tot = np.asarray([tot[i] for i in ind_IDs], dtype=float)
+        quantities = np.asarray(quantities, dtype=float)
+        impacts = quantities[:, None] * CFs
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratios = np.where(has_CF, impacts/tot, 0.)
+        
+        n_row, n_ind = impacts.shape
+        n_col = len(columns)
+        data = np.empty((n_row+1, n_col+2*n_ind), dtype=object)
+        data[:-1, 0] = quantities
+        if item_ratios is not None: data[:-1, 1] = item_ratios
+        data[-1, :n_col] = ''
+        data[:-1, n_col::2] = impacts
+        data[:-1, n_col+1::2] = ratios
+        data[-1, n_col::2] = tot
+        data[-1, n_col+1::2] = 1
+        ind_head = sum(([f'{i.ID} [{i.unit}]', f'Category {i.ID} Ratio'] 
+                        for i in self.indicators), [])
+        return pd.DataFrame(data, index=index, columns=[*columns, *ind_head])
+
     def get_impact_table(self, category=None, time=None, time_unit='hr'):
         '''
         Return a :class:`pandas.DataFrame` table for the given impact category,
@@ -372,102 +539,56 @@ class LCA:
         if category in ('Construction', 'Other'):
             time = time/self.lifetime_hr
         
+        if category not in ('Construction', 'Transportation', 'Stream', 'Other'):
+            raise ValueError(
+                'category can only be "Construction", "Transportation", "Stream", or "Other", ' \
+                f'not {category}.')
+        
         cat = category.lower()
         tot = getattr(self, f'total_{cat}_impacts')
         if category in ('Construction', 'Transportation'):
-            cat = category.lower()
-            units = sorted(getattr(self, f'_{cat}_units'),
-                              key=(lambda su: su.ID))
-            items = sorted(set(i.item for i in getattr(self,  f'{cat}_inventory')),
-                           key=(lambda item: item.ID))
-            if len(items) == 0:
+            # items are grouped by ID (units can have their own objects of the same item),
+            # the first one of each ID is used for the characterization factors
+            item_dct = {}
+            for su, i in self._get_activities(getattr(self, f'{cat}_units'), cat):
+                quantity = i.quantity*time
+                if cat == 'transportation': quantity /= i.interval
+                elif i.lifetime is not None: # replaced over the lifetime
+                    quantity *= math.ceil(self.lifetime/i.lifetime)
+                try: item_dct[i.item.ID][1].append((su.ID, quantity))
+                except KeyError: item_dct[i.item.ID] = (i.item, [(su.ID, quantity)])
+            if len(item_dct) == 0:
                 return f'No {cat}-related impacts.'
-
-            # Note that item_dct = dict.fromkeys([item.ID for item in items], []) won't work
-            item_dct = dict.fromkeys([item.ID for item in items])
-            for item_ID in item_dct.keys():
-                item_dct[item_ID] = dict(SanUnit=[], Quantity=[])
-            for su in units:
-                for i in getattr(su, cat):
-                    item_dct[i.item.ID]['SanUnit'].append(su.ID)
-                    item_dct[i.item.ID]['Quantity'].append(i.quantity*time)
-                    if cat == 'transportation':
-                        item_dct[i.item.ID]['Quantity'][-1] /= i.interval
-            dfs = []
-            for item in items:
-                dct = item_dct[item.ID]
-                dct['SanUnit'].append('Total')
-                dct['Quantity'] = np.array(dct['Quantity'])
-                dct['Quantity'] = np.append(dct['Quantity'], dct['Quantity'].sum())
-                dct['Item Ratio'] = dct['Quantity']/dct['Quantity'].sum()*2
-                for i in self.indicators:
-                    if i.ID in item.CFs:
-                        dct[f'{i.ID} [{i.unit}]'] = impact = dct['Quantity']*item.CFs[i.ID]
-                        dct[f'Category {i.ID} Ratio'] = impact/tot[i.ID]
-                    else:
-                        dct[f'{i.ID} [{i.unit}]'] = dct[f'Category {i.ID} Ratio'] = 0
-                df = pd.DataFrame.from_dict(dct)
-                index0 = f'{item.ID} [{item.functional_unit}]'
-                df.set_index([pd.MultiIndex.from_arrays(
-                    [(index0,)*len(dct['SanUnit'])], names=(category,)),
-                    'SanUnit'],
-                    inplace=True)
-                dfs.append(df)
-
-            table = pd.concat(dfs)
-            return self._append_cat_sum(table, cat, tot)
-        
-        ind_head = sum(([f'{i.ID} [{i.unit}]',
-                         f'Category {i.ID} Ratio'] for i in self.indicators), [])
+            
+            index0, index1, row_items, quantities, item_ratios = [], [], [], [], []
+            for item_ID in sorted(item_dct):
+                item, rows = item_dct[item_ID]
+                unit_IDs, item_quantities = zip(*rows, ('Total', 0.))
+                item_quantities = np.asarray(item_quantities)
+                item_quantities[-1] = total = item_quantities.sum()
+                index0.extend((f'{item_ID} [{item.functional_unit}]',)*len(unit_IDs))
+                index1.extend(unit_IDs)
+                row_items.extend((item,)*len(unit_IDs))
+                quantities.extend(item_quantities)
+                item_ratios.extend(item_quantities/total)
+            index = pd.MultiIndex.from_arrays([[*index0, 'Sum'], [*index1, 'All']],
+                                              names=[cat.capitalize(), 'SanUnit'])
+            return self._get_table(index, ('Quantity', 'Item Ratio'), quantities,
+                                   row_items, tot, item_ratios)
         
         if category == 'Stream':
-            headings = ['Stream', 'Mass [kg]', *ind_head]
-            item_dct = dict.fromkeys(headings)
-            for key in item_dct.keys():
-                item_dct[key] = []
-            for ws_item in self.stream_inventory:
-                ws = ws_item.linked_stream
-                item_dct['Stream'].append(ws.ID)
-                mass = ws.F_mass * time
-                item_dct['Mass [kg]'].append(mass)
-                for ind in self.indicators:
-                    if ind.ID in ws_item.CFs.keys():
-                        impact = ws_item.CFs[ind.ID]*mass
-                        item_dct[f'{ind.ID} [{ind.unit}]'].append(impact)
-                        item_dct[f'Category {ind.ID} Ratio'].append(impact/tot[ind.ID])
-                    else:
-                        item_dct[f'{ind.ID} [{ind.unit}]'].append(0)
-                        item_dct[f'Category {ind.ID} Ratio'].append(0)
-            table = pd.DataFrame.from_dict(item_dct)
-            table.set_index(['Stream'], inplace=True)
-            return self._append_cat_sum(table, cat, tot)
+            row_items = self.stream_inventory
+            index = pd.Index([*(i.linked_stream.ID for i in row_items), 'Sum'], name='Stream')
+            quantities = [i.linked_stream.F_mass*time for i in row_items]
+            return self._get_table(index, ('Mass [kg]',), quantities, row_items, tot)
 
-        elif category == 'Other':
-            headings = ['Other', 'Quantity', *ind_head]
-            item_dct = dict.fromkeys(headings)
-            for key in item_dct.keys():
-                item_dct[key] = []
-            for other_ID in self.other_items.keys():
-                other = self.other_items[other_ID]['item']
-                item_dct['Other'].append(f'{other_ID} [{other.functional_unit}]')
-                quantity = self.other_items[other_ID]['quantity'] * time
-                item_dct['Quantity'].append(quantity)
-                for ind in self.indicators:
-                    if ind.ID in other.CFs.keys():
-                        impact = other.CFs[ind.ID]*quantity
-                        item_dct[f'{ind.ID} [{ind.unit}]'].append(impact)
-                        item_dct[f'Category {ind.ID} Ratio'].append(impact/tot[ind.ID])
-                    else:
-                        item_dct[f'{ind.ID} [{ind.unit}]'].append(0)
-                        item_dct[f'Category {ind.ID} Ratio'].append(0)
-            table = pd.DataFrame.from_dict(item_dct)
-            table.set_index(['Other'], inplace=True)
-            return self._append_cat_sum(table, cat, tot)
-        
         else:
-            raise ValueError(
-                'category can only be "Construction", "Transportation", "Stream", or "Other", ' \
-                f'not {category}.')
+            others = self.other_items.values()
+            row_items = [i['item'] for i in others]
+            index = pd.Index([*(f'{i.ID} [{i.functional_unit}]' for i in row_items), 'Sum'],
+                             name='Other')
+            quantities = [i['quantity']*time for i in others]
+            return self._get_table(index, ('Quantity',), quantities, row_items, tot)
 
     def save_report(self, file=None, sheet_name='LCA',
                     time=None, time_unit='hr',
@@ -480,9 +601,36 @@ class LCA:
                               'Stream', 'Other')]
         with pd.ExcelWriter(file) as writer:
             for table in tables:
+                if isinstance(table, str): continue # no impacts of the category
                 table.to_excel(writer, sheet_name=sheet_name, startrow=n_row)
                 n_row += table.shape[0] + row_space + len(table.columns.names) # extra lines for the heading
 
+    def _get_category_impacts(self, category, state, items, calculate):
+        '''
+        Return the impacts of the category from the cache if its `state` and 
+        the characterization factors of its `items` (a function returning the items) 
+        have not changed since last calculated, otherwise calculate them with
+        `calculate` and update the cache.
+        '''
+        cache = self._cache
+        cached = cache.get(category)
+        CF_version = ImpactItem._CF_version
+        if cached and cached[0] == state:
+            if cached[1] == CF_version: return cached[3].copy()
+            CF_state = self._get_CF_state(items())
+            if cached[2] == CF_state:
+                cache[category] = (state, CF_version, CF_state, cached[3])
+                return cached[3].copy()
+        else: CF_state = self._get_CF_state(items())
+        impacts = calculate()
+        cache[category] = (state, CF_version, CF_state, impacts)
+        return impacts.copy()
+    
+    def _get_CF_state(self, items):
+        # indicators of all items and versions of the characterization factors of the given ones
+        return (tuple(i.ID for i in self.indicators),
+                tuple((id(i.CFs), i.CFs.version) for i in items))
+    
     @property
     def system(self):
         '''[biosteam.System] The system linked to this LCA.'''
@@ -517,75 +665,81 @@ class LCA:
     
     @property
     def indicators(self):
-        '''[set] All impact indicators associated with this LCA.'''
-        if not self.construction_inventory:
-            constr = set()
-        else:
-            constr = set(sum((i.indicators for i in self.construction_inventory
-                              if i is not None), ()))
-        if not self.transportation_inventory:
-            trans = set()
-        else:
-            trans = set(sum((i.indicators for i in self.transportation_inventory
-                             if i is not None), ()))
-        if not self.stream_inventory:
-            ws = set()
-        else:
-            ws = set(sum((i.indicators for i in self.stream_inventory
-                          if i is not None), ()))
-        if not self.other_items:
-            other = set()
-        else:
-            other = set(sum((items[i].indicators for i in self.other_items.keys()), ()))
-        tot = constr.union(trans, ws, other)
-        if len(tot) == 0:
+        '''[tuple] All impact indicators associated with this LCA, sorted by ID.'''
+        self._get_inventory()
+        if len(self._impact_indicators) == 0:
             raise ValueError('No `ImpactIndicators` have been added.')
-        return tot
+        return self._impact_indicators
     
     @property
     def construction_units(self):
-        '''[set] All units in the linked system with constrution activity.'''
+        '''[list] All units in the linked system with constrution activity, sorted by ID.'''
+        self._get_inventory()
         return self._construction_units
     
     @property
     def construction_inventory(self):
         '''[tuple] All construction activities.'''
-        return sum((i.construction for i in self.construction_units), ())
+        return self._get_inventory()['construction']
     
     @property
     def total_construction_impacts(self):
-        '''[dict] Total impacts associated with construction activities.'''
-        return self.get_construction_impacts(self.construction_units)
+        '''
+        [dict] Total impacts associated with construction activities, 
+        only recalculated when any construction activities, their 
+        characterization factors, or the lifetime have changed.
+        '''
+        return self._get_category_impacts(
+            'construction', (Construction._version, self.lifetime),
+            lambda: (i.item for i in self.construction_inventory),
+            lambda: self.get_construction_impacts(self.construction_units))
     
     @property
     def transportation_units(self):
-        '''[set] All units in the linked system with transportation activity.'''
+        '''[list] All units in the linked system with transportation activity, sorted by ID.'''
+        self._get_inventory()
         return self._transportation_units
     
     @property
     def transportation_inventory(self):
         '''[tuple] All transportation activities.'''
-        return sum((i.transportation for i in self.transportation_units), ())
+        return self._get_inventory()['transportation']
     
     @property
     def total_transportation_impacts(self):
-        '''[dict] Total impacts associated with transportation activities.'''
-        return self.get_transportation_impacts(self.transportation_units)
+        '''
+        [dict] Total impacts associated with transportation activities,
+        only recalculated when any transportation activities, their 
+        characterization factors, or the lifetime have changed.
+        '''
+        return self._get_category_impacts(
+            'transportation', (Transportation._version, self.lifetime_hr),
+            lambda: (i.item for i in self.transportation_inventory),
+            lambda: self.get_transportation_impacts(self.transportation_units))
     
     @property
     def lca_streams(self):
-        '''[set] All streams in the linked system with impacts.'''
+        '''[list] All streams in the linked system with impacts, sorted by ID.'''
+        self._get_inventory()
         return self._lca_streams
     
     @property
     def stream_inventory(self):
         '''[tuple] All chemical inputs, fugitive gases, waste emissions, and products.'''
-        return tuple(i.impact_item for i in self.lca_streams)
+        return self._get_inventory()['stream']
     
     @property
     def total_stream_impacts(self):
-        '''[dict] Total impacts associated with `WasteStreams` (e.g., chemicals, emissions).'''
-        return self.get_stream_impacts(stream_items=self.stream_inventory)
+        '''
+        [dict] Total impacts associated with `WasteStreams` (e.g., chemicals, emissions),
+        only recalculated when the mass flows of the streams, their characterization 
+        factors, or the lifetime have changed.
+        '''
+        stream_items = self.stream_inventory
+        state = (stream_items, tuple(i.F_mass for i in self.lca_streams), self.lifetime_hr)
+        return self._get_category_impacts(
+            'stream', state, lambda: stream_items,
+            lambda: self.get_stream_impacts(stream_items=stream_items))
         
     @property
     def other_items (self):
@@ -597,8 +751,17 @@ class LCA:
         
     @property
     def total_other_impacts(self):
-        '''[dict] Total impacts associated with other ImpactItems (e.g., electricity).'''
-        return self.get_other_impacts()
+        '''
+        [dict] Total impacts associated with other ImpactItems (e.g., electricity),
+        only recalculated when the quantities of the items or their 
+        characterization factors have changed.
+        '''
+        self.refresh_other_items()
+        other_items = self.other_items
+        state = tuple((k, v['quantity']) for k, v in other_items.items())
+        return self._get_category_impacts(
+            'other', state, lambda: (v['item'] for v in other_items.values()),
+            self.get_other_impacts)
     
     @property
     def total_impacts(self):
@@ -83,8 +83,58 @@ def get_ic(cmps, conservation_for):
         return Matrix(arr.tolist())
     else: return None
 
+def get_ic_array(components, IDs, conservation_for):
+    '''
+    return conversion factors of the given components as a numpy array, 
+    indexed from the compiled components instead of creating a subgroup.
+    '''
+    idx = components.indices(IDs)
+    return np.vstack([np.asarray(getattr(components, 'i_'+i), dtype=float)[idx]
+                      for i in conservation_for])
+
+def _as_number(coeff, parameters):
+    try: return float(coeff)
+    except (TypeError, ValueError): pass
+    expr = sympify(coeff, locals=parameters)
+    if expr.free_symbols: return None
+    return float(expr)
+
+def solve_numeric(coeff_dct, components, conserved_for, parameters):
+    '''
+    Solve for the unknown stoichiometric coefficients as a linear system of 
+    the conservation rules if all other coefficients are numerical, 
+    return None if they are not or if the solution is not unique.
+    '''
+    if not conserved_for: return None
+    IDs = sorted(coeff_dct)
+    values = []
+    for cmp in IDs:
+        coeff = coeff_dct[cmp]
+        if coeff in ('?', '-(?)'): values.append(np.nan)
+        else:
+            value = _as_number(coeff, parameters)
+            if value is None: return None
+            values.append(value)
+    values = np.asarray(values)
+    ic = get_ic_array(components, IDs, conserved_for)
+    unknown = np.isnan(values)
+    A = ic[:, unknown]
+    b = -ic[:, ~unknown] @ values[~unknown]
+    if np.linalg.matrix_rank(A) < unknown.sum(): return None
+    x = np.linalg.lstsq(A, b, rcond=None)[0]
+    if not np.allclose(A @ x, b, atol=1e-12): return None
+    values[unknown] = x
+    return dict(zip(IDs, values.tolist()))
+
 def symbolize(coeff_dct, components, conserved_for, parameters):
     n = sum([v in ('?', '-(?)') for v in coeff_dct.values()])
+    # numerical coefficients are solved with numpy, sympy is only used for symbolic ones
+    if n > 0: 
+        numeric = solve_numeric(coeff_dct, components, conserved_for, parameters)
+        if numeric is not None: return numeric
+    else:
+        numeric = {k: _as_number(v, parameters) for k, v in coeff_dct.items()}
+        if None not in numeric.values(): return numeric
     if n > 0:
         unknowns = symbols('unknown0:%s' % n)
         i = 0
@@ -96,7 +146,7 @@ def symbolize(coeff_dct, components, conserved_for, parameters):
                 i += 1
             else: v_arr.append(coeff_dct[cmp])
         v = Matrix(sympify(v_arr, parameters))
-        ic = get_ic(components.subgroup(IDs), conserved_for)
+        ic = Matrix(get_ic_array(components, IDs, conserved_for).tolist())
         sol = solve(ic * v, unknowns)
         coeff_dct = dict(zip(IDs, simplify(v.subs(sol))))
         del unknowns                    
@@ -129,7 +179,9 @@ def get_stoichiometric_coeff(reaction, ref_component, components, conserved_for,
                          f"not a '{type(reaction).__name__}' object")        
     if coeff_dct:
         coeff_dct = symbolize(coeff_dct, components, conserved_for, parameters)
-        coeff = dct2list(coeff_dct, components)
+        if all([isa(v, float) for v in coeff_dct.values()]):
+            coeff = dct2arr(coeff_dct, components)
+        else: coeff = dct2list(coeff_dct, components)
     if ref_component:
         normalize_factor = abs(coeff[components._index[ref_component]])
         if isa(coeff, np.ndarray): coeff /= normalize_factor
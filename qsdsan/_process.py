@@ -11,16 +11,68 @@ for license details.
 '''
 
 # import thermosteam as tmo
+import os
+import pickle
+import hashlib
+from collections import OrderedDict
 from ._parse import get_stoichiometric_coeff
 from . import Components
+from thermosteam import settings
 from thermosteam.utils import chemicals_user, read_only
-from sympy import symbols, Matrix, lambdify
+from sympy import symbols, Matrix, lambdify, srepr, sympify, Pow
+from scipy.sparse import csr_matrix
 from sympy.parsing.sympy_parser import parse_expr
 import numpy as np
 import pandas as pd
     
 __all__ = ('Process', 'Processes', 'CompiledProcesses', )
 
+def _as_float(value):
+    try: return float(value)
+    except (TypeError, ValueError): return None
+
+def _dump_process(process):
+    # symbolic expressions are kept as their srepr
+    stoichio = process._stoichiometry
+    if not isinstance(stoichio, np.ndarray):
+        stoichio = [v if isinstance(v, (int, float)) else srepr(v) for v in stoichio]
+    return (process._ID, process._ref_component, stoichio, srepr(process._rate_equation))
+
+def _load_process(data, components, conserved_for, parameters):
+    ID, ref_component, stoichio, rate_eq = data
+    if not isinstance(stoichio, np.ndarray):
+        stoichio = [sympify(v) if isinstance(v, str) else v for v in stoichio]
+    process = object.__new__(Process)
+    process._ID = ID
+    process._components = components
+    process._ref_component = ref_component
+    process._conserved_for = conserved_for
+    process._parameters = {p: symbols(p) for p in parameters}
+    process._stoichiometry = stoichio
+    process._rate_equation = sympify(rate_eq)
+    return process
+
+def _denominator_matrix(exprs, variables):
+    # [i, j] is 1 if variable j is in a denominator of expression i
+    index = {v: j for j, v in enumerate(variables)}
+    M = np.zeros((len(exprs), len(variables)))
+    for i, expr in enumerate(exprs):
+        for p in expr.atoms(Pow):
+            if not p.exp.is_negative: continue
+            for v in p.base.free_symbols:
+                if v in index: M[i, index[v]] = 1.
+    return M
+
+def _zero_undefined(values, C, M_den):
+    # values that are undefined only because of zero concentrations in the
+    # denominators (e.g., X_PP/X_PAO without X_PAO) are taken as the limit of zero,
+    # other non-finite values (e.g., from NaN parameters) are kept
+    undefined = ~np.isfinite(values)
+    if undefined.any():
+        undefined &= ((C == 0.) @ M_den.T) > 0.
+        values[undefined] = 0.
+    return values
+
 class UndefinedProcess(AttributeError):
     '''AttributeError regarding undefined Component objects.'''
     def __init__(self, ID):
@@ -72,7 +124,7 @@ class Process():
         self._components = self._load_chemicals(components)
         self._ref_component = ref_component
         self._conserved_for = conserved_for
-        self._parameters = {p: symbols(p) for p in parameters}
+        self._parameters = {p: symbols(p) for p in (parameters or ())}
         
         self._stoichiometry = get_stoichiometric_coeff(reaction, self._ref_component, self._components, self._conserved_for, self._parameters)
         self._parse_rate_eq(rate_equation)
@@ -82,11 +134,9 @@ class Process():
         return conversion factors (i.e., the 'i_' attributes of the components) 
         as a numpy.ndarray or a SymPy Matrix.
         '''
-        if self._conservation_for:
+        if self._conserved_for:
             cmps = self._components
-            arr = getattr(cmps, 'i_'+self._conservation_for[0])
-            for c in self._conservation_for[1:]:
-                arr = np.vstack((arr, getattr(cmps, 'i_'+c)))
+            arr = np.vstack([getattr(cmps, 'i_'+c) for c in self._conserved_for])
             if as_matrix: return Matrix(arr.tolist())
             return arr
         else: return None
@@ -117,7 +167,8 @@ class Process():
             self._stoichiometry = -self._stoichiometry
         else:
             self._stoichiometry = [-v for v in self._stoichiometry]
-        self._rate_equation = -self._rate_equation
+        if self._rate_equation is not None:
+            self._rate_equation = -self._rate_equation
         
     @property
     def ID(self):
@@ -190,9 +241,13 @@ class Process():
         [SymPy expression] Kinetic rate equation of the process. Also the rate in
         which the reference component is reacted or produced in the process.
         '''
+        if self._rate_equation is None: return None
         return self._rate_equation.subs(self._parameters)
     
     def _parse_rate_eq(self, eq):
+        if eq is None: 
+            self._rate_equation = None
+            return
         cmpconc_symbols = {c: symbols(c) for c in self._components.IDs}
         self._rate_equation = parse_expr(eq, {**cmpconc_symbols, **self._parameters})
     
@@ -205,6 +260,7 @@ class Process():
             self._stoichiometry = [v/factor for v in self._stoichiometry]
     
     def _normalize_rate_eq(self, new_ref):
+        if self._rate_equation is None: return
         factor = self._stoichiometry[self._components._index[new_ref]]
         self._rate_equation *= factor
     
@@ -323,7 +379,7 @@ class Processes():
               Process IDs.
               
         """
-        return Process([getattr(self, i) for i in IDs])
+        return Processes([getattr(self, i) for i in IDs])
     
     def compile(self, skip_checks=False):
         '''Cast as a :class:`CompiledProcesses` object.'''
@@ -361,10 +417,22 @@ class Processes():
     
     _default_data = None
     
+    @staticmethod
+    def _get_cache_path(cache_dir, path, components, conserved_for, parameters):
+        # the file, the components (including the conversion factors used to 
+        # solve for the unknown coefficients), and other inputs are hashed as the key
+        h = hashlib.sha256()
+        with open(path, 'rb') as f: h.update(f.read())
+        h.update(repr((components.IDs, tuple(conserved_for), tuple(parameters))).encode())
+        for i in conserved_for:
+            h.update(np.asarray(getattr(components, 'i_'+i), dtype=float).tobytes())
+        return os.path.join(cache_dir, h.hexdigest()+'.pkl')
+    
     @classmethod
     def load_from_file(cls, path='', components=None, 
                        conserved_for=('COD', 'N', 'P', 'charge'), parameters=None,
-                       use_default_data=False, store_data=False, compile=True):
+                       use_default_data=False, store_data=False, compile=True,
+                       cache_dir=None):
         """
         Create ``CompiledProcesses`` object from a table of process IDs, stoichiometric 
         coefficients, and rate equations stored in a .csv or Excel file. 
@@ -387,6 +455,11 @@ class Processes():
             Whether to store the file as default data. The default is False.
         compile : bool, optional
             Whether to compile processes. The default is True.
+        cache_dir : str, optional
+            Directory to cache the parsed processes (i.e., the solved stoichiometric 
+            coefficients and the rate equations), which will be loaded from the 
+            cache in the next call with the same file, components, `conserved_for`,
+            and `parameters`. The default is None (not cached).
 
         .. note::
     
@@ -405,34 +478,53 @@ class Processes():
                 has -1 or 1 stoichiometric coefficient, the first component with non-zero
                 coefficient is considered the reference.
         """
+        cmps = settings.get_default_chemicals(components)
+        parameters = () if parameters is None else tuple(parameters)
+        data = cache_path = None
         if use_default_data and cls._default_data is not None:
             data = cls._default_data
-        else:
+        elif cache_dir is not None:
+            cache_path = cls._get_cache_path(cache_dir, path, cmps, 
+                                             conserved_for, parameters)
+        
+        if cache_path and os.path.isfile(cache_path):
+            with open(cache_path, 'rb') as f: cached = pickle.load(f)
+            new = cls([_load_process(i, cmps, conserved_for, parameters) 
+                       for i in cached])
+        else: new = None
+        
+        if data is None and (new is None or store_data):
             if path.endswith('.csv'): data = pd.read_csv(path, na_values=0)
             elif path.endswith(('.xls', '.xlsx')): data = pd.read_excel(path, na_values=0)
             else: raise ValueError('Only .csv or Excel files can be used.')
         
-        cmp_IDs = data.columns[1:-1]
-        data.dropna(how='all', subset=cmp_IDs, inplace=True)
-        new = cls(())
-        for i, proc in data.iterrows():
-            ID = proc[0]
-            stoichio = proc[1:-1]
-            if pd.isna(proc[-1]): rate_eq = None
-            else: rate_eq = proc[-1]
-            stoichio = stoichio[-pd.isna(stoichio)].to_dict()
-            for k,v in stoichio.items():
-                try: stoichio[k] = float(v)
-                except: continue
-            ref = [k for k,v in stoichio.items() if v in (-1, 1)]
-            if len(ref) == 0: ref = list(stoichio.keys())[0]                
-            else: ref = ref[0]            
-            process = Process(ID, stoichio, 
-                              ref_component=ref, 
-                              rate_equation=rate_eq,
-                              conserved_for=conserved_for,
-                              parameters=parameters)
-            new.append(process)
+        if new is None:
+            cmp_IDs = data.columns[1:-1]
+            data.dropna(how='all', subset=cmp_IDs, inplace=True)
+            new = cls(())
+            for i, proc in data.iterrows():
+                ID = proc[0]
+                stoichio = proc[1:-1]
+                if pd.isna(proc[-1]): rate_eq = None
+                else: rate_eq = proc[-1]
+                stoichio = stoichio[-pd.isna(stoichio)].to_dict()
+                for k,v in stoichio.items():
+                    try: stoichio[k] = float(v)
+                    except: continue
+                ref = [k for k,v in stoichio.items() if v in (-1, 1)]
+                if len(ref) == 0: ref = list(stoichio.keys())[0]                
+                else: ref = ref[0]            
+                process = Process(ID, stoichio, 
+                                  ref_component=ref, 
+                                  rate_equation=rate_eq,
+                                  components=cmps,
+                                  conserved_for=conserved_for,
+                                  parameters=parameters)
+                new.append(process)
+            if cache_path:
+                os.makedirs(cache_dir, exist_ok=True)
+                with open(cache_path, 'wb') as f: 
+                    pickle.dump([_dump_process(i) for i in new], f)
 
         if store_data:
             cls._default_data = data
@@ -445,7 +537,11 @@ class Processes():
 @read_only(methods=('append', 'extend', '__setitem__'))
 class CompiledProcesses(Processes):
     
-    _cache = {}
+    _cache = OrderedDict()
+    
+    #: [int] Maximum number of compiled objects in the cache,
+    #: the least recently used ones are dropped first.
+    cache_size = 32
     
     def __new__(cls, processes):
         """
@@ -464,13 +560,15 @@ class CompiledProcesses(Processes):
         processes = tuple(processes)
         if processes in cache:
             self = cache[processes]
+            cache.move_to_end(processes)
         else:
             self = object.__new__(cls)
             setfield = setattr
             for i in processes:
                 setfield(self, i.ID, i)
-            self._compile()
+            self._compile(processes)
             cache[processes] = self
+            while len(cache) > cls.cache_size: cache.popitem(last=False)
         return self
 
     # def __dir__(self):
@@ -503,21 +601,40 @@ class CompiledProcesses(Processes):
         cmps.compile()
         dct['_components'] = cmps
         M_stch = []
+        rows, cols, coeffs = [], [], []
         params = {}
         rate_eqs = tuple_([i._rate_equation for i in processes])
         all_numeric = True
-        for i in processes:
+        cmp_index = cmps._index
+        for row, i in enumerate(processes):
             stch = [0]*cmps.size
             params.update(i._parameters)
             if all_numeric and isa(i._stoichiometry, (list, tuple)): all_numeric = False
             for cmp, coeff in i.stoichiometry.items():
-                stch[cmps._index[cmp]] = coeff
+                col = cmp_index[cmp]
+                stch[col] = coeff
+                rows.append(row)
+                cols.append(col)
+                coeffs.append(coeff)
             M_stch.append(stch)
         dct['_parameters'] = params
         if all_numeric: M_stch = np.asarray(M_stch)
         dct['_stoichiometry'] = M_stch
+        dct['_stoichiometry_entries'] = (rows, cols, coeffs)
         dct['_rate_equations'] = rate_eqs
-        dct['_production_rates'] = list(Matrix(M_stch).T * Matrix(rate_eqs))
+        dct['_production_rates'] = None # built when needed
+        dct['_kernels'] = {}
+    
+    def _get_production_rates(self):
+        production_rates = self._production_rates
+        if production_rates is None:
+            # only non-zero stoichiometric coefficients are multiplied
+            production_rates = [0]*self._components.size
+            rate_eqs = self._rate_equations
+            for row, col, coeff in zip(*self._stoichiometry_entries):
+                production_rates[col] += coeff * rate_eqs[row]
+            self.__dict__['_production_rates'] = production_rates
+        return production_rates
         
     @property
     def parameters(self):
@@ -529,6 +646,13 @@ class CompiledProcesses(Processes):
         '''[pandas.DataFrame] Stoichiometric coefficients.'''
         stoichio = self._stoichiometry
         isa = isinstance
+        if isa(stoichio, list) and not self.free_parameters:
+            # evaluated with the compiled kernel if all parameters have values
+            try: kernels = self._compile_stoichiometry()
+            except RuntimeError: pass
+            else:
+                M_stch = kernels['stoichiometry'](kernels['values']).toarray()
+                return pd.DataFrame(M_stch, index=self.IDs, columns=self._components.IDs)
         v_params = {k:v for k,v in self._parameters.items() if isa(v, (float, int))}
         if isa(stoichio, list) and len(v_params) > 0:
             stoichio_vals = []
@@ -554,7 +678,8 @@ class CompiledProcesses(Processes):
     @property
     def production_rates(self):
         '''[pandas.DataFrame] The rates of production of the components.'''
-        rates = [r.subs(self._parameters) for r in self._production_rates]
+        rates = [r.subs(self._parameters) if hasattr(r, 'subs') else r
+                 for r in self._get_production_rates()]
         return pd.DataFrame(rates, index=self._components.IDs, columns=('rate_of_production',))
     
     @property
@@ -563,14 +688,386 @@ class CompiledProcesses(Processes):
         [function] A function object of the components' rates of production. 
         When evaluated, returns a list of production rates.
         '''
+        kernels = self._kernels
+        try: return kernels['production_rates_function']
+        except KeyError: pass
         args = list(symbols(self._components.IDs)) + [v for k,v in self._parameters.items() if k == str(v)]
-        return lambdify(args, self._production_rates)
+        f = kernels['production_rates_function'] = lambdify(args, self._get_production_rates())
+        return f
+    
+    @property
+    def free_parameters(self):
+        '''
+        [tuple] IDs of the parameters without values, 
+        in the order of the parameter vector of :func:`rates`.
+        '''
+        return tuple(k for k, v in self._parameters.items() if k == str(v))
+    
+    def _compile_stoichiometry(self):
+        # parameter vector and stoichiometry kernels, rate equations are not needed
+        kernels = self._kernels
+        if 'stoichiometry' in kernels: return kernels
+        # numerical parameters (and the ones without values) are arguments of the kernels,
+        # other values (e.g., expressions) are substituted
+        numerical = {}
+        substituted = {}
+        for k, v in self._parameters.items():
+            if k == str(v): numerical[k] = np.nan
+            else:
+                value = _as_float(v)
+                if value is None: substituted[k] = v
+                else: numerical[k] = value
+        param_IDs = tuple(numerical)
+        params = tuple(symbols(i) for i in param_IDs)
+        rows, cols, coeffs = self._stoichiometry_entries
+        coeffs = [sympify(v).subs(substituted) for v in coeffs]
+        undefined = set().union(*(i.free_symbols for i in coeffs)) - {*params}
+        if undefined:
+            raise RuntimeError('The following symbols in the stoichiometric coefficients '
+                               f'are not parameters: {sorted(str(i) for i in undefined)}.')
+        
+        kernels['parameter_symbols'] = (params, substituted)
+        kernels['parameter_index'] = dict(zip(param_IDs, range(len(param_IDs))))
+        kernels['values'] = np.asarray(tuple(numerical.values()), dtype=float)
+        kernels['free'] = np.asarray([i for i, ID in enumerate(param_IDs) 
+                                      if ID in self.free_parameters], dtype=int)
+        
+        # sparse stoichiometry matrix, only the data are updated for symbolic coefficients
+        n_cmp = self._components.size
+        M_stch = csr_matrix((np.arange(1., len(coeffs)+1), (rows, cols)), 
+                            shape=(self.size, n_cmp))
+        order = M_stch.data.astype(int) - 1
+        if any(i.free_symbols for i in coeffs):
+            f_stoichio = lambdify((params,), coeffs, modules='numpy', cse=True)
+            def stoichiometry_data(params):
+                return np.stack(np.broadcast_arrays(*f_stoichio(params.T)), axis=-1)
+            def stoichiometry(params):
+                M = M_stch.copy()
+                M.data = stoichiometry_data(params)[order]
+                return M
+        else:
+            data = np.asarray(coeffs, dtype=float)
+            M_stch.data = data[order]
+            stoichiometry_data = lambda params: data
+            stoichiometry = lambda params: M_stch
+        kernels['stoichiometry'] = stoichiometry
+        kernels['stoichiometry_data'] = stoichiometry_data
+        kernels['entries'] = self._get_entry_map(rows, cols)
+        return kernels
+    
+    def _compile_kernels(self):
+        kernels = self._compile_stoichiometry()
+        if 'rate_function' in kernels: return kernels
+        if None in self._rate_equations:
+            raise RuntimeError('Cannot compile rates of processes with missing rate equations.')
+        cmp_symbols = symbols(self._components.IDs)
+        if not isinstance(cmp_symbols, tuple): cmp_symbols = (cmp_symbols,)
+        params, substituted = kernels['parameter_symbols']
+        rate_eqs = [eq.subs(substituted) for eq in self._rate_equations]
+        undefined = set().union(*(i.free_symbols for i in rate_eqs))
+        undefined -= {*cmp_symbols, *params}
+        if undefined:
+            raise RuntimeError('The following symbols are neither components nor '
+                               f'parameters: {sorted(str(i) for i in undefined)}.')
+        
+        kernels['symbols'] = (cmp_symbols, params, rate_eqs)
+        f_rates = lambdify((cmp_symbols, params), rate_eqs, modules='numpy', cse=True)
+        M_den = _denominator_matrix(rate_eqs, cmp_symbols)
+        def rate_function(C, params):
+            C = np.asarray(C, dtype=float)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rates = np.stack(np.broadcast_arrays(*f_rates(C.T, params.T)), axis=-1)
+            return _zero_undefined(rates, C, M_den)
+        kernels['rate_function'] = rate_function
+        return kernels
+    
+    def _get_entry_map(self, rows, cols):
+        # maps the rate of each non-zero coefficient to the component
+        n_cmp = self._components.size
+        return (np.asarray(rows, dtype=int),
+                csr_matrix((np.ones(len(cols)), (cols, range(len(cols)))),
+                           shape=(n_cmp, len(cols))))
+    
+    def _get_rate_derivatives(self):
+        # indices of the non-zero derivatives of the rates with respect to the concentrations
+        kernels = self._compile_kernels()
+        if 'rate_derivatives' not in kernels:
+            cmp_symbols, params, rate_eqs = kernels['symbols']
+            rows, cols = [], []
+            for i, eq in enumerate(rate_eqs):
+                free_symbols = eq.free_symbols
+                for j, cmp in enumerate(cmp_symbols):
+                    if cmp not in free_symbols: continue
+                    rows.append(i)
+                    cols.append(j)
+            kernels['rate_derivatives'] = (rows, cols)
+        return kernels['rate_derivatives']
+    
+    def _get_parameter_vector(self, params=()):
+        # values of all parameters of the kernels with the given free parameters
+        # as (parameters,) or (batch, parameters) for (batch, free parameters)
+        kernels = self._compile_stoichiometry()
+        values = kernels['values']
+        free = kernels['free']
+        params = np.asarray(params, dtype=float)
+        if params.shape[-1] != len(free):
+            raise ValueError(f'Values of {len(free)} free parameters '
+                             f'{self.free_parameters} are needed, not {params.shape[-1]}.')
+        if params.ndim > 1:
+            values = np.repeat(values[None, :], params.shape[0], axis=0)
+            values[:, free] = params
+        elif len(free):
+            values = values.copy()
+            values[free] = params
+        return values
+    
+    @property
+    def rate_function(self):
+        '''
+        [function] Numerical kernel of the process rates, compiled once 
+        and kept when parameter values are changed by :func:`set_parameters`.
+        When evaluated as ``f(C, params=())`` with concentrations `C` of shape 
+        (components,) or (batch, components) and values of the 
+        :attr:`free_parameters` of shape (free parameters,) or 
+        (batch, free parameters), returns rates of shape (processes,) 
+        or (batch, processes). Rates that are undefined only because of
+        zero concentrations in the denominators (e.g., without biomass) are zero,
+        other non-finite rates (e.g., from NaN parameters) are kept.
+        '''
+        f_rates = self._compile_kernels()['rate_function']
+        get_values = self._get_parameter_vector
+        def rate_function(C, params=()):
+            return f_rates(C, get_values(params))
+        return rate_function
+    
+    @property
+    def jacobian_function(self):
+        '''
+        [function] Numerical kernel of the Jacobian of the rates of production 
+        with respect to the concentrations, compiled once from the symbolic derivatives
+        of the rate equations. When evaluated as ``f(C, params=(), sparse=False)``
+        with concentrations `C` of shape (components,) and values of the
+        :attr:`free_parameters`, returns the Jacobian of shape 
+        (components, components) as a numpy.ndarray, or a 
+        scipy.sparse.csr_matrix if `sparse` is True. Derivatives are zero
+        where the rates are zero for being undefined as in :attr:`rate_function`.
+        '''
+        kernels = self._compile_kernels()
+        if 'jacobian_function' not in kernels:
+            cmp_symbols, params, rate_eqs = kernels['symbols']
+            rows, cols = self._get_rate_derivatives()
+            derivatives = [rate_eqs[i].diff(cmp_symbols[j]) for i, j in zip(rows, cols)]
+            f_derivatives = lambdify((cmp_symbols, params), derivatives, 
+                                     modules='numpy', cse=True)
+            M_den = _denominator_matrix(derivatives, cmp_symbols)
+            f_stoichio = kernels['stoichiometry']
+            shape = (len(rate_eqs), len(cmp_symbols))
+            def f_jacobian(C, params, sparse=False):
+                C = np.asarray(C, dtype=float)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    values = np.asarray(f_derivatives(C, params), dtype=float)
+                values = _zero_undefined(values, C, M_den)
+                if sparse:
+                    J_rates = csr_matrix((values, (rows, cols)), shape=shape)
+                    return (f_stoichio(params).T @ J_rates).tocsr()
+                J_rates = np.zeros(shape)
+                J_rates[rows, cols] = values
+                return f_stoichio(params).T @ J_rates
+            kernels['jacobian_function'] = f_jacobian
+        f_jacobian = kernels['jacobian_function']
+        get_values = self._get_parameter_vector
+        def jacobian_function(C, params=(), sparse=False):
+            return f_jacobian(C, get_values(params), sparse)
+        return jacobian_function
+    
+    def rates(self, C, params=()):
+        '''
+        Return the rates of production of the components.
+
+        Parameters
+        ----------
+        C : Iterable[float]
+            Concentrations of the components, as (components,) or 
+            (batch, components).
+        params : Iterable[float], optional
+            Values of the :attr:`free_parameters`, as (free parameters,)
+            or (batch, free parameters).
+
+        Returns
+        -------
+        rates : numpy.ndarray
+            Rates of production as (components,) or (batch, components).
+
+        '''
+        kernels = self._compile_kernels()
+        values = self._get_parameter_vector(params)
+        rates = kernels['rate_function'](C, values)
+        if values.ndim == 1:
+            return (kernels['stoichiometry'](values).T @ rates.T).T
+        # stoichiometric coefficients differ by the parameters of each sample
+        rows, entries = kernels['entries']
+        rates = rates[..., rows] * kernels['stoichiometry_data'](values)
+        return (entries @ rates.T).T
+    
+    def rates_from_streams(self, streams, params=()):
+        '''
+        Return the rates of production of the components at the concentrations 
+        [mg/L] of the waste streams.
+
+        Parameters
+        ----------
+        streams : Iterable[:class:`WasteStream`]
+            Waste streams sharing the same :class:`CompiledComponents`, 
+            which should include all the components of the processes.
+        params : Iterable[float], optional
+            Values of the :attr:`free_parameters`, as (free parameters,)
+            or (streams, free parameters).
+
+        Returns
+        -------
+        rates : numpy.ndarray
+            Rates of production as (streams, components).
+
+        '''
+        streams = tuple(streams)
+        if not streams: return np.zeros((0, self._components.size))
+        cmps = streams[0].components
+        for ws in streams:
+            if ws.components is not cmps:
+                raise ValueError('All waste streams must have the same `CompiledComponents`, '
+                                 f'{ws} does not.')
+        idx = cmps.indices(self._components.IDs)
+        mass = np.asarray([ws.mol[idx] for ws in streams]) * cmps.MW[idx]
+        F_vol = np.asarray([ws.F_vol for ws in streams])
+        C = mass * 1e3 / np.where(F_vol != 0., F_vol, 1.)[:, None] # [kg/hr]*1e3[g/kg]/[m3/hr] = [g/m3]
+        return self.rates(C, params)
+    
+    def check_conservation(self, params=(), tol=1e-8):
+        '''
+        Check conservation of materials of all processes in one matrix 
+        multiplication, each process is only checked for the materials in 
+        its `conserved_for`.
+
+        Parameters
+        ----------
+        params : Iterable[float], optional
+            Values of the :attr:`free_parameters`.
+        tol : float, optional
+            Absolute tolerance of the imbalance. The default is 1e-8.
+
+        Returns
+        -------
+        imbalance : numpy.ndarray
+            Materials created (positive) or destroyed (negative) by the 
+            stoichiometric coefficients as (materials, processes), 
+            materials are given in :attr:`conserved_materials`.
+
+        '''
+        kernels = self._compile_stoichiometry()
+        if 'conservation' not in kernels:
+            materials = self.conserved_materials
+            cmps = self._components
+            ic = np.asarray([getattr(cmps, 'i_'+i) for i in materials], dtype=float)
+            checked = np.asarray([[i in p._conserved_for for p in self.tuple] 
+                                  for i in materials], dtype=bool).reshape((-1, self.size))
+            kernels['conservation'] = (ic.reshape((-1, cmps.size)).T, checked)
+        ic_T, checked = kernels['conservation']
+        values = self._get_parameter_vector(params)
+        imbalance = (kernels['stoichiometry'](values) @ ic_T).T
+        imbalance[~checked] = 0.
+        unconserved = np.abs(imbalance) > tol
+        if unconserved.any():
+            materials = self.conserved_materials
+            raise RuntimeError("The following materials are unconserved by the "
+                               "stoichiometric coefficients. A positive value "
+                               "means the material is created, a negative value "
+                               "means the material is destroyed:\n "
+                               + "\n ".join([f"{self.IDs[j]}, {materials[i]}: {imbalance[i, j]:.2f}" 
+                                             for i, j in zip(*np.nonzero(unconserved))]))
+        return imbalance
+    
+    @property
+    def conserved_materials(self):
+        '''[tuple] Materials in `conserved_for` of any of the processes.'''
+        materials = []
+        for p in self.tuple:
+            materials.extend(i for i in p._conserved_for if i not in materials)
+        return tuple(materials)
+    
+    @property
+    def sparse_stoichiometry(self):
+        '''
+        [scipy.sparse.csr_matrix] Numerical stoichiometric coefficients 
+        (processes, components), all parameters must have values.
+        '''
+        kernels = self._compile_stoichiometry()
+        return kernels['stoichiometry'](self._get_parameter_vector())
+    
+    @property
+    def jacobian_sparsity(self):
+        '''
+        [scipy.sparse.csr_matrix] Sparsity pattern (as booleans) of the Jacobian 
+        of the rates of production (components, components), 
+        e.g., for `jac_sparsity` of ``scipy.integrate.solve_ivp``.
+        '''
+        n_proc, n_cmp = self.size, self._components.size
+        rows, cols, coeffs = self._stoichiometry_entries
+        M_stch = csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(n_proc, n_cmp))
+        rows, cols = self._get_rate_derivatives()
+        J_rates = csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(n_proc, n_cmp))
+        return (M_stch.T @ J_rates).astype(bool).tocsr()
     
     def subgroup(self, IDs):
-        '''Create a new subgroup of ``CompiledProcesses`` objects.'''
-        processes = self[IDs]
-        new = Processes(processes)
-        new.compile()
+        '''
+        Create a new subgroup of ``CompiledProcesses`` objects.
+        
+        The subgroup is sliced from this object without compiling, it has the 
+        same components and parameters, and shares the numerical kernels 
+        (if compiled) until new parameters are set.
+        '''
+        processes = tuple(self[IDs])
+        rows = self.indices(IDs)
+        new = object.__new__(CompiledProcesses)
+        dct = new.__dict__
+        for i in processes: dct[i.ID] = i
+        IDs = tuple(i.ID for i in processes)
+        dct['tuple'] = processes
+        dct['size'] = size = len(IDs)
+        dct['IDs'] = IDs
+        dct['_index'] = dict(zip(IDs, range(size)))
+        dct['_components'] = self._components
+        dct['_parameters'] = self._parameters.copy()
+        stoichio = self._stoichiometry
+        if isinstance(stoichio, np.ndarray): dct['_stoichiometry'] = stoichio[rows]
+        else: dct['_stoichiometry'] = [stoichio[i] for i in rows]
+        # non-zero coefficients of the subgroup, as positions in the entries of this object
+        new_row = dict(zip(rows, range(size)))
+        entry_rows, entry_cols, coeffs = self._stoichiometry_entries
+        positions = sorted((new_row[r], n) for n, r in enumerate(entry_rows) if r in new_row)
+        positions = [n for r, n in positions]
+        dct['_stoichiometry_entries'] = ([new_row[entry_rows[n]] for n in positions],
+                                         [entry_cols[n] for n in positions],
+                                         [coeffs[n] for n in positions])
+        dct['_rate_equations'] = tuple(self._rate_equations[i] for i in rows)
+        dct['_production_rates'] = None
+        dct['_kernels'] = kernels = {}
+        
+        parent = self._kernels
+        if 'stoichiometry' not in parent: return new
+        kernels['parameter_symbols'] = parent['parameter_symbols']
+        kernels['parameter_index'] = parent['parameter_index']
+        kernels['values'] = parent['values'].copy()
+        kernels['free'] = parent['free'].copy()
+        f_stoichio = parent['stoichiometry']
+        f_data = parent['stoichiometry_data']
+        kernels['stoichiometry'] = lambda params: f_stoichio(params)[rows]
+        kernels['stoichiometry_data'] = lambda params: f_data(params)[..., positions]
+        kernels['entries'] = self._get_entry_map(*dct['_stoichiometry_entries'][:2])
+        if 'rate_function' not in parent: return new
+        cmp_symbols, params, rate_eqs = parent['symbols']
+        kernels['symbols'] = (cmp_symbols, params, [rate_eqs[i] for i in rows])
+        f_rates = parent['rate_function']
+        kernels['rate_function'] = lambda C, params: f_rates(C, params)[..., rows]
         return new
     
     def index(self, ID):
@@ -605,5 +1102,26 @@ class CompiledProcesses(Processes):
         return copy    
     
     def set_parameters(self, **parameters):
-        '''Set values to stoichiometric and/or kinetic parameters.'''
-        self._parameters.update(parameters)
\ No newline at end of file
+        '''
+        Set values to stoichiometric and/or kinetic parameters.
+        
+        Numerical values are updated in the parameter vector of the 
+        compiled kernels, which will only be recompiled for new parameters
+        or non-numerical values.
+        '''
+        self._parameters.update(parameters)
+        kernels = self._kernels
+        kernels.pop('production_rates_function', None)
+        if 'parameter_index' not in kernels: 
+            kernels.clear()
+            return
+        index = kernels['parameter_index']
+        values = kernels['values']
+        for k, v in parameters.items():
+            value = _as_float(v)
+            if k not in index or value is None:
+                kernels.clear()
+                return
+            values[index[k]] = value
+        free = self.free_parameters
+        kernels['free'] = np.asarray([index[i] for i in free], dtype=int)
\ No newline at end of file
@@ -19,7 +19,7 @@ for license details.
 # %%
 
 import biosteam as bst
-from . import currency, Construction, Transportation
+from . import currency, ImpactItem, Construction, Transportation
 from .utils.piping import WSIns, WSOuts
 
 NotImplementedMethod = bst.utils.NotImplementedMethod
@@ -203,6 +203,8 @@ class SanUnit(bst.Unit, isabstract=True):
             for j in i:
                 if not isinstance(j, Construction):
                     raise TypeError(f'Only <Construction> can be included, not {type(j).__name__}.')
+        Construction._version += 1
+        ImpactItem._link_version += 1
         self._construction = i
 
     @property
@@ -232,6 +234,8 @@ class SanUnit(bst.Unit, isabstract=True):
             for j in i:
                 if not isinstance(j, Transportation):
                     raise TypeError(f'Only <Transportation> can be included, not {type(j).__name__}.')
+        Transportation._version += 1
+        ImpactItem._link_version += 1
         self._transportation = i
 
     @property
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+QSDsan: Quantitative Sustainable Design for sanitation and resource recovery systems
+
+This module is under the University of Illinois/NCSA Open Source License.
+Please refer to https://github.com/QSD-Group/QSDsan/blob/master/LICENSE.txt
+for license details.
+'''
+
+
+# %%
+
+import os
+import numpy as np
+from numpy.lib.format import open_memmap
+from thermosteam import MultiStream
+from . import WasteStream
+from ._waste_stream import _ws_mixed_slots
+
+__all__ = ('StreamTable',)
+
+# Numerical state variables of WasteStream, named without the leading underscore
+_state_dtype = np.dtype([(slot[1:], float) for slot in _ws_mixed_slots])
+
+# Recorded arrays, also names of the .npy files for memory-mapped tables
+_table_arrays = ('mol', 'T', 'P', 'phase', 'states')
+
+
+class StreamTable:
+    '''
+    Record the states (flow rates, temperature, pressure, phase, and
+    the numerical state variables like `_COD`) of multiple streams
+    into preallocated arrays, each record is a row in the arrays.
+
+    Recorded states can be restored back into the streams,
+    or saved as a .npz file. If `path` is provided, the arrays will be
+    memory-mapped .npy files in this directory so that records are written
+    to the disk as they are made, and the files can be read back
+    (e.g., by :func:`StreamTable.open` or :func:`numpy.load` with `mmap_mode`)
+    and sliced by stream or component without loading all records.
+    Rows of failed evaluations (e.g., samples that failed to simulate) can be
+    marked by :func:`record_failure`, they have NaN flow rates, temperatures,
+    and pressures, and an empty phase, rows that have not been recorded are zeros.
+
+    Parameters
+    ----------
+    streams : Iterable(:class:`thermosteam.Stream`)
+        Streams to be recorded, they must have the same components
+        and cannot be :class:`thermosteam.MultiStream`.
+    size : int
+        Maximum number of records (e.g., number of samples).
+    path : str
+        Directory of the memory-mapped files, if not provided,
+        the arrays will be kept in memory.
+
+    Attributes
+    ----------
+    mol : numpy.ndarray
+        Molar flow rates [kmol/hr] as (records × streams × components).
+    T : numpy.ndarray
+        Temperatures [K] as (records × streams).
+    P : numpy.ndarray
+        Pressures [Pa] as (records × streams).
+    phase : numpy.ndarray
+        Phases as (records × streams).
+    states : numpy.ndarray
+        Structured array of the state variables as (records × streams),
+        unset variables (i.e., None) are recorded as NaN.
+
+    See Also
+    --------
+    :func:`StreamTable.from_system`
+
+    '''
+
+    __slots__ = ('_streams', '_stream_IDs', '_component_IDs', '_index',
+                 '_recorded', '_path', 'mol', 'T', 'P', 'phase', 'states')
+
+    def __init__(self, streams, size, path=None):
+        streams = tuple(streams)
+        if not streams:
+            raise ValueError('at least one stream is needed.')
+        IDs = streams[0].chemicals.IDs
+        isa = isinstance
+        for s in streams:
+            if isa(s, MultiStream):
+                raise TypeError(f'{s} is a `MultiStream`, which cannot be recorded.')
+            if s.chemicals.IDs != IDs:
+                raise ValueError('all streams must have the same components, '
+                                 f'components of {s} are different from {streams[0]}.')
+        self._streams = streams
+        self._stream_IDs = tuple(s.ID for s in streams)
+        self._component_IDs = IDs
+        self._index = 0
+        self._path = path
+        shapes = {'mol': (size, len(streams), len(IDs))}
+        dtypes = {'phase': '<U1', 'states': _state_dtype}
+        fills = {'states': np.nan}
+        if path:
+            os.makedirs(path, exist_ok=True)
+            np.savez(os.path.join(path, 'IDs.npz'),
+                     stream_IDs=np.asarray(self._stream_IDs),
+                     component_IDs=np.asarray(IDs))
+            # number of recorded rows, kept on the disk with the records
+            self._recorded = open_memmap(os.path.join(path, 'recorded.npy'), mode='w+',
+                                         dtype=int, shape=(1,))
+        else: self._recorded = np.zeros(1, dtype=int)
+        for i in _table_arrays:
+            shape = shapes.get(i, (size, len(streams)))
+            dtype = dtypes.get(i, float)
+            if path:
+                array = open_memmap(os.path.join(path, f'{i}.npy'), mode='w+',
+                                    dtype=dtype, shape=shape)
+                if i in fills: array[:] = fills[i]
+            else: array = np.full(shape, fills.get(i, 0), dtype=dtype)
+            setattr(self, i, array)
+
+    @classmethod
+    def from_system(cls, system, size, path=None, stream_type=WasteStream):
+        '''
+        Create a :class:`StreamTable` for all streams of the given type
+        within a system, streams are sorted by their IDs.
+        '''
+        streams = sorted((s for s in system.streams if isinstance(s, stream_type)),
+                         key=lambda s: s.ID)
+        return cls(streams, size, path)
+
+    def _get_row(self, index):
+        # index of the row to be recorded, the next empty row if not given
+        if index is None:
+            index = self._index
+            if index == self.size:
+                raise IndexError(f'all {self.size} rows have been recorded.')
+            self._index += 1
+        else: self._index = max(self._index, index+1)
+        self._recorded[0] = self._index
+        return index
+
+    def record(self, index=None):
+        '''
+        Record the current states of the streams,
+        will use the next empty row if `index` is not given.
+        Return the index of the recorded row.
+        '''
+        index = self._get_row(index)
+        states = self.states[index]
+        for n, s in enumerate(self._streams):
+            self.mol[index, n] = s.mol
+            self.T[index, n] = s.T
+            self.P[index, n] = s.P
+            self.phase[index, n] = s.phase
+            if isinstance(s, WasteStream):
+                states[n] = tuple(np.nan if i is None else i for i in
+                                  (getattr(s, slot) for slot in _ws_mixed_slots))
+            else: states[n] = np.nan
+        return index
+
+    def record_failure(self, index=None):
+        '''
+        Mark a row as failed (e.g., the sample failed to simulate) with
+        NaN flow rates, temperatures, pressures, and state variables, and an empty phase,
+        will use the next empty row if `index` is not given.
+        Return the index of the marked row.
+        '''
+        index = self._get_row(index)
+        for i in ('mol', 'T', 'P', 'states'):
+            getattr(self, i)[index] = np.nan
+        self.phase[index] = ''
+        return index
+
+    @property
+    def failed(self):
+        '''[numpy.ndarray] Whether each row is marked as failed by :func:`record_failure`.'''
+        return np.isnan(self.T).all(axis=1)
+
+    def restore(self, index, streams=None):
+        '''
+        Restore the states recorded in the given row back into the streams
+        (the recorded ones if `streams` is not given).
+        '''
+        streams = self._streams if streams is None else tuple(streams)
+        if len(streams) != self.N_streams:
+            raise ValueError(f'{self.N_streams} streams are needed, '
+                             f'not {len(streams)}.')
+        if np.isnan(self.T[index]).all():
+            raise ValueError(f'row {index} is marked as failed, which cannot be restored.')
+        states = self.states[index]
+        names = _state_dtype.names
+        for n, s in enumerate(streams):
+            s.phase = str(self.phase[index, n])
+            s.mol[:] = self.mol[index, n]
+            s.T = float(self.T[index, n])
+            s.P = float(self.P[index, n])
+            if isinstance(s, WasteStream):
+                for slot, name in zip(_ws_mixed_slots, names):
+                    value = float(states[n][name])
+                    setattr(s, slot, None if np.isnan(value) else value)
+                s._reset_composite_cache()
+
+    def get_stream_data(self, ID):
+        '''Return the recorded molar flow rates of one stream as (records × components).'''
+        return self.mol[:, self._stream_IDs.index(ID)]
+
+    def get_component_data(self, ID):
+        '''Return the recorded molar flow rates of one component as (records × streams).'''
+        return self.mol[:, :, self._component_IDs.index(ID)]
+
+    def save(self, path):
+        '''Save the table, including the number of recorded rows, as a .npz file.'''
+        np.savez(path, **{i: getattr(self, i) for i in _table_arrays},
+                 recorded=np.asarray([self._index]),
+                 stream_IDs=np.asarray(self._stream_IDs),
+                 component_IDs=np.asarray(self._component_IDs))
+
+    @classmethod
+    def load(cls, path, streams=None):
+        '''
+        Load a :class:`StreamTable` from a .npz file saved by :func:`save`,
+        `streams` are needed for restoring the records.
+        '''
+        with np.load(path) as data:
+            return cls._from_arrays(data, data, data['recorded'].copy(), None, streams)
+
+    @classmethod
+    def open(cls, path, streams=None, mode='r'):
+        '''
+        Open the memory-mapped files of a :class:`StreamTable` in the
+        given directory, `mode` is passed to :func:`numpy.load` as `mmap_mode`,
+        `streams` are needed for restoring the records.
+        '''
+        with np.load(os.path.join(path, 'IDs.npz')) as IDs:
+            arrays = {i: np.load(os.path.join(path, f'{i}.npy'), mmap_mode=mode)
+                      for i in (*_table_arrays, 'recorded')}
+            return cls._from_arrays(IDs, arrays, arrays['recorded'], path, streams)
+
+    @classmethod
+    def _from_arrays(cls, IDs, arrays, recorded, path, streams):
+        self = object.__new__(cls)
+        self._stream_IDs = tuple(str(i) for i in IDs['stream_IDs'])
+        self._component_IDs = tuple(str(i) for i in IDs['component_IDs'])
+        self._streams = () if streams is None else tuple(streams)
+        self._path = path
+        for i in _table_arrays: setattr(self, i, arrays[i])
+        self._recorded = recorded
+        self._index = int(recorded[0])
+        return self
+
+    def flush(self):
+        '''Write changes of memory-mapped arrays to the disk.'''
+        for i in (*_table_arrays, '_recorded'):
+            array = getattr(self, i)
+            if isinstance(array, np.memmap): array.flush()
+
+    def __len__(self):
+        return self._index
+
+    def __repr__(self):
+        return (f'<{type(self).__name__}: {self._index}/{self.size} records of '
+                f'{self.N_streams} streams>')
+
+    @property
+    def size(self):
+        '''[int] Maximum number of records.'''
+        return self.mol.shape[0]
+
+    @property
+    def N_streams(self):
+        '''[int] Number of recorded streams.'''
+        return self.mol.shape[1]
+
+    @property
+    def path(self):
+        '''[str] Directory of the memory-mapped files, None if kept in memory.'''
+        return self._path
+
+    @property
+    def streams(self):
+        '''[tuple] Recorded streams.'''
+        return self._streams
+
+    @property
+    def stream_IDs(self):
+        '''[tuple] IDs of the recorded streams.'''
+        return self._stream_IDs
+
+    @property
+    def component_IDs(self):
+        '''[tuple] IDs of the components.'''
+        return self._component_IDs
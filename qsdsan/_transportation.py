@@ -32,6 +32,9 @@ class Transportation:
     __slots__ = ('_item', '_load_type', '_load', '_distance', '_interval',
                  'default_units')
     
+    # Counts changes of all transportation activities
+    _version = 0
+    
     def __init__(self, item=None,
                  load_type='mass', load=1., load_unit='kg',
                  distance=1., distance_unit='km',
@@ -63,6 +66,7 @@ class Transportation:
         
     
     def _update_value(self, var, value, unit=''):
+        Transportation._version += 1
         default_unit = self.default_units[var]
         if not unit or unit == default_unit:
             setattr(self, '_'+var, value)
@@ -118,6 +122,7 @@ class Transportation:
         elif i is not ImpactItem:
             raise TypeError('Only <ImpactItem> or  <ImpactItem>.ID can be set, '
                             f'not {type(i).__name__}.')
+        Transportation._version += 1
         self._item = i
 
     @property
@@ -135,6 +140,7 @@ class Transportation:
         else:
             raise ValueError('load_type can only be "mass" or "volume", '
                              f'not {i}.')
+        Transportation._version += 1
         self._load_type = i
         
     @property
@@ -18,18 +18,17 @@ for license details.
 
 # %%
 import numpy as np
+from collections import namedtuple
+from inspect import signature
 # import biosteam as bst
 from thermosteam import Stream, MultiStream, utils, settings
-from . import Components
+from ._components import _specific_groups
 from ._units_of_measure import auom
 
 
 __all__ = ('WasteStream',)
 
 
-_defined_composite_vars = ('COD', 'BOD5', 'BOD', 'uBOD', 'NOD', 'ThOD', 'cnBOD',
-                           'C', 'N', 'P', 'K', 'Mg', 'Ca', 'solids', 'charge')
-
 _common_composite_vars = ('_COD', '_BOD', '_uBOD', '_TC', '_TOC', '_TN', 
                           '_TKN', '_TP', '_TK', '_TMg', '_TCa', 
                           '_dry_mass', '_charge', '_ThOD', '_cnBOD')
@@ -37,15 +36,57 @@ _common_composite_vars = ('_COD', '_BOD', '_uBOD', '_TC', '_TOC', '_TN',
 _ws_specific_slots = (*_common_composite_vars,
                       '_pH', '_SAlk', '_ratios', '_impact_item')
 
-_specific_groups = {'S_VFA': ('S_Ac', 'S_Prop'),
-                    'X_Stor': ('X_OHO_PHA', 'X_GAO_PHA', 'X_PAO_PHA', 
-                              'X_GAO_Gly', 'X_PAO_Gly'),
-                    'X_ANO': ('X_AOO', 'X_NOO'),
-                    'X_Bio': ('X_OHO', 'X_AOO', 'X_NOO', 'X_AMO', 'X_PAO', 
-                             'X_MEOLO', 'X_ACO', 'X_HMO', 'X_PRO', 'X_FO'),
-                    'S_NOx': ('S_NO2', 'S_NO3'),
-                    'X_PAO_PP': ('X_PAO_PP_Lo', 'X_PAO_PP_Hi'),
-                    'TKN': ()}
+# numerical slots that will be mixed based on volumetric flows in `mix_from`
+_ws_mixed_slots = (*_common_composite_vars, '_pH', '_SAlk')
+_ws_mixed_slots_arr = np.asarray(_ws_mixed_slots)
+
+# WasteStream properties that can be calculated from composite variables,
+# with the slot of user-defined values and the kwargs for `composite`
+_composite_properties = {'COD': ('_COD', dict(variable='COD')),
+                         'BOD': ('_BOD', dict(variable='BOD')),
+                         'BOD5': ('_BOD', dict(variable='BOD')),
+                         'uBOD': ('_uBOD', dict(variable='uBOD')),
+                         'cnBOD': ('_cnBOD', dict(variable='cnBOD')),
+                         'ThOD': ('_ThOD', dict(variable='ThOD')),
+                         'TC': ('_TC', dict(variable='C')),
+                         'TOC': ('_TOC', dict(variable='C', organic=True)),
+                         'TN': ('_TN', dict(variable='N')),
+                         'TKN': ('_TKN', dict(variable='N', specification='TKN')),
+                         'TP': ('_TP', dict(variable='P')),
+                         'TK': ('_TK', dict(variable='K')),
+                         'TMg': ('_TMg', dict(variable='Mg')),
+                         'TCa': ('_TCa', dict(variable='Ca')),}
+
+
+class SolidsProfile(namedtuple('SolidsProfile',
+                               ('dissolved', 'colloidal', 'particulate',
+                                'volatile_colloidal', 'volatile_particulate',
+                                'inorganic_particulate'))):
+    '''
+    Solids fractions of a :class:`WasteStream` in mg/L,
+    returned by :func:`WasteStream.solids_profile`.
+    '''
+    __slots__ = ()
+
+    @property
+    def TDS(self):
+        '''[float] Total dissolved solids (including colloidal ones), in mg/L.'''
+        return self.dissolved + self.colloidal
+
+    @property
+    def TSS(self):
+        '''[float] Total suspended solids, in mg/L.'''
+        return self.particulate
+
+    @property
+    def VSS(self):
+        '''[float] Volatile suspended solids, in mg/L.'''
+        return self.volatile_particulate
+
+    @property
+    def ISS(self):
+        '''[float] Inorganic/involatile suspended solids, in mg/L.'''
+        return self.inorganic_particulate
 
 _default_ratios = {'iHi_XPAOPP': 0,
                    'iCB_XCB': 0.15,
@@ -60,46 +101,335 @@ vol_unit = auom('L/hr')
 conc_unit = auom('mg/L')
 
 
+#%% functions for influent characterization
+
+def _update_ratios(r, ratios):
+    for name, ratio in ratios.items():
+        if name not in r.keys():
+            raise ValueError(f'Cannot identify ratio named "{name}".'
+                             f'Must be one of {r.keys()}.')
+        elif isinstance(ratio, (int, float)) and (ratio > 1 or ratio < 0):
+            raise ValueError(f"ratio {name}: {ratio} is out of range [0,1].")
+        r[name] = ratio
+    return r
+
+def _set_states(C, components, **states):
+    # `C` is the (number of influents) × (number of components) concentration matrix
+    index = components.index
+    for ID, value in states.items():
+        C[:, index(ID)] = value
+
+def _get_state(C, components, ID):
+    return C[:, components.index(ID)]
+
+def _check_states(C, components):
+    bad = (C < 0).any(axis=0)
+    if bad.any():
+        IDs = components.IDs
+        bad_vars = {IDs[i]: C[:, i].min() for i in np.flatnonzero(bad)}
+        raise ValueError(f"The following state variable(s) was found negative: {bad_vars}.")
+
+def _inorganic_states(C, components, conc_factor, SAlk, S_H2, S_CH4, S_N2, DO,
+                      S_NH4, S_NO2, S_NO3, S_PO4, S_Ca, S_Mg, S_K, X_MAP, X_HAP, 
+                      X_HDP, X_FePO4, X_AlPO4, X_FeOH, X_AlOH, X_MgCO3, X_CaCO3,
+                      S_CAT, S_AN):
+    _set_states(C, components, S_H2=S_H2, S_CH4=S_CH4, S_N2=S_N2, S_O2=DO,
+                S_NH4=S_NH4, S_NO2=S_NO2, S_NO3=S_NO3, S_PO4=S_PO4, 
+                S_CO3=SAlk*12*conc_factor, # 1 meq/L SAlk ~ 1 mmol/L HCO3- ~ 12 mg C/L (12 mg C/mmol HCO3-)
+                S_Ca=S_Ca, S_Mg=S_Mg, S_K=S_K, X_MAP=X_MAP, X_HAP=X_HAP, 
+                X_HDP=X_HDP, X_FePO4=X_FePO4, X_AlPO4=X_AlPO4, X_FeOH=X_FeOH,
+                X_AlOH=X_AlOH, X_MgCO3=X_MgCO3, X_CaCO3=X_CaCO3, 
+                S_CAT=S_CAT, S_AN=S_AN)
+
+def _iss_states(C, components, r, TSS, VSS, X_Org_ISS, X_PAO_PP):
+    cmps = components
+    _set_states(C, cmps, X_PAO_PP_Hi=X_PAO_PP*r['iHi_XPAOPP'],
+                X_PAO_PP_Lo=X_PAO_PP*(1-r['iHi_XPAOPP']))
+    ISS = TSS - VSS
+    other_ig_iss = C @ (cmps.i_mass * cmps.x * (1-cmps.org))
+    _set_states(C, cmps, X_Ig_ISS=ISS-X_Org_ISS-other_ig_iss)
+
+def _vss_states(C, components, iVSS_TSS):
+    cmps = components
+    VSS = C @ (cmps.i_mass * cmps.f_Vmass_Totmass * cmps.x * cmps.org)
+    TSS = VSS/iVSS_TSS
+    X_Org_ISS = C @ (cmps.i_mass * (1-cmps.f_Vmass_Totmass) * cmps.x * cmps.org)
+    return TSS, VSS, X_Org_ISS
+
+
 #%% functions for calibrations of N, P contents and BOD:COD ratio of certain components
-        
-def _calib_SF_iN(components, concentrations, STKN):    
-    cmp_c = np.asarray([v for v in concentrations.values()])
-    SN = (cmp_c * components.i_N * (components.s + components.c)).sum()
-    SF_N = concentrations['S_F'] * components.S_F.i_N
-    SNOx_N = concentrations['S_NO2'] * components.S_NO2.i_N + concentrations['S_NO3'] * components.S_NO3.i_N
+
+def _calib_SF_iN(components, C, STKN):
+    cmps = components
+    i_N = cmps.i_N
+    iSF, iSNO2, iSNO3 = cmps.indices(('S_F', 'S_NO2', 'S_NO3'))
+    SN = C @ (i_N * (cmps.s + cmps.c))
+    SF_N = C[:, iSF] * i_N[iSF]
+    SNOx_N = C[:, iSNO2] * i_N[iSNO2] + C[:, iSNO3] * i_N[iSNO3]
     other_stkn = SN - SF_N - SNOx_N
-    SF_N = STKN - other_stkn           
-    if SF_N < 0:
-        raise ValueError("Negative N content for S_F was estimated.")                        
-    return SF_N/concentrations['S_F']
-    
-def _calib_XBsub_iN(components, concentrations, XTKN):
-    cmp_c = np.asarray([v for v in concentrations.values()])        
-    other_xtkn = (cmp_c * components.i_N * components.x).sum() - concentrations['X_B_Subst'] * components.X_B_Subst.i_N                
+    SF_N = STKN - other_stkn
+    # only calibrate influents with both S_NH4 and S_F
+    calib = (STKN > 0) & (C[:, iSF] > 0)
+    if (SF_N[calib] < 0).any():
+        raise ValueError("Negative N content for S_F was estimated.")
+    return np.where(calib, SF_N/np.where(calib, C[:, iSF], 1.), i_N[iSF])
+
+def _calib_XBsub_iN(components, C, XTKN):
+    i = components.index('X_B_Subst')
+    other_xtkn = C @ (components.i_N * components.x) - C[:, i] * components.i_N[i]
     XB_Subst_N = XTKN - other_xtkn
-    if XB_Subst_N < 0:
-        raise ValueError("Negative N content for X_B_Subst was estimated.")            
-    return XB_Subst_N/concentrations['X_B_Subst']
-    
+    if (XB_Subst_N < 0).any():
+        raise ValueError("Negative N content for X_B_Subst was estimated.")
+    return XB_Subst_N/C[:, i]
 
-def _calib_XBsub_iP(components, concentrations, TP):
-    cmp_c = np.asarray([v for v in concentrations.values()])    
-    other_p = (cmp_c * components.i_P).sum() - concentrations['X_B_Subst'] * components.X_B_Subst.i_P
+def _calib_XBsub_iP(components, C, TP):
+    i = components.index('X_B_Subst')
+    other_p = C @ components.i_P - C[:, i] * components.i_P[i]
     XB_Subst_P = TP - other_p
-    if XB_Subst_P < 0:
-        raise ValueError("Negative P content for X_B_Subst was estimated.")    
-    return XB_Subst_P/concentrations['X_B_Subst']
-    
-def _calib_XBsub_fBODCOD(components, concentrations, substrate_IDs, BOD):
-    cmp_c = np.asarray([v for v in concentrations.values()])
-    c_sub = np.asarray([v for k,v in concentrations.items() if k in substrate_IDs])
-    XB_sub = components.subgroup(substrate_IDs)
-    other_BOD = (cmp_c * (components.x + components.c + components.s) * components.f_BOD5_COD).sum() - (c_sub * XB_sub.f_BOD5_COD).sum()
-    fbodtocod_sub = (BOD - other_BOD)/c_sub.sum()
-    if fbodtocod_sub > 1 or fbodtocod_sub < 0:
+    if (XB_Subst_P < 0).any():
+        raise ValueError("Negative P content for X_B_Subst was estimated.")
+    return XB_Subst_P/C[:, i]
+
+def _calib_XBsub_fBODCOD(components, C, substrate_IDs, BOD):
+    cmps = components
+    idx = cmps.indices(substrate_IDs)
+    c_sub = C[:, idx]
+    other_BOD = C @ ((cmps.x + cmps.c + cmps.s) * cmps.f_BOD5_COD) - c_sub @ cmps.f_BOD5_COD[idx]
+    fbodtocod_sub = (BOD - other_BOD)/c_sub.sum(axis=1)
+    if (fbodtocod_sub > 1).any() or (fbodtocod_sub < 0).any():
         raise ValueError("BOD5-to-COD ratio for X_B_Subst and X_Stor was estimated out of range [0,1].")
     return fbodtocod_sub
 
+def _calib_N_P(components, C, S_NH4, iSNH_STKN, TKN, TP):
+    STKN = S_NH4/iSNH_STKN
+    n = C.shape[0]
+    return {'i_N': {'S_F': _calib_SF_iN(components, C, np.broadcast_to(STKN, n)),
+                    'X_B_Subst': _calib_XBsub_iN(components, C, TKN-STKN)},
+            'i_P': {'X_B_Subst': _calib_XBsub_iP(components, C, TP)}}
+
+
+#%% influent models, each returns the concentration matrix and calibrated properties
+
+_substrate_IDs = ('X_B_Subst', 'X_OHO_PHA', 'X_GAO_PHA', 'X_PAO_PHA', 'X_GAO_Gly', 'X_PAO_Gly')
+
+def _codstates_states(components, r, conc_factor, n, SAlk,
+                      COD, TKN, TP, iVSS_TSS, iSNH_STKN,
+                      S_NH4, S_NO2, S_NO3, S_PO4, S_Ca, S_Mg, S_K, S_CAT, S_AN, S_N2,
+                      frSUInf, frSF, frXCUInf, frSUE, frSCH3OH, frSAc, frSProp,
+                      frXOHO, frXAOO, frXNOO, frXAMO, frXPAO, frXPRO, frXACO, frXHMO,
+                      frXMEOLO, frXFO, frXOHO_PHA, frXGAO_PHA, frXPAO_PHA, 
+                      frXGAO_Gly, frXPAO_Gly, frXU_OHO_E, frXU_PAO_E,
+                      X_FePO4, X_AlPO4, X_FeOH, X_AlOH, X_MAP, X_HAP, X_HDP,
+                      X_PAO_PP, X_MgCO3, X_CaCO3, DO, S_H2, S_CH4):
+    cmps = components
+    C = np.zeros((n, cmps.size))
+
+    #************ user-defined states **************
+    _inorganic_states(C, cmps, conc_factor, SAlk, S_H2, S_CH4, S_N2, DO,
+                      S_NH4, S_NO2, S_NO3, S_PO4, S_Ca, S_Mg, S_K, X_MAP, X_HAP, 
+                      X_HDP, X_FePO4, X_AlPO4, X_FeOH, X_AlOH, X_MgCO3, X_CaCO3,
+                      S_CAT, S_AN)
+
+    #************ organic components **************
+    S_IDs = ('S_CH3OH', 'S_Ac', 'S_Prop', 'S_F', 'S_U_Inf', 'S_U_E')
+    _set_states(C, cmps, S_CH3OH=COD*frSCH3OH, S_Ac=COD*frSAc, S_Prop=COD*frSProp,
+                S_F=COD*frSF, S_U_Inf=COD*frSUInf, S_U_E=COD*frSUE)
+    S_Org = C[:, cmps.indices(S_IDs)].sum(axis=1)
+
+    XC_U_Inf = COD * frXCUInf
+    _set_states(C, cmps, C_U_Inf=XC_U_Inf*r['iCUInf_XCUInf'],
+                X_U_Inf=XC_U_Inf*(1-r['iCUInf_XCUInf']))
+
+    _set_states(C, cmps, X_OHO=COD*frXOHO, X_AOO=COD*frXAOO, X_NOO=COD*frXNOO,
+                X_AMO=COD*frXAMO, X_PAO=COD*frXPAO, X_ACO=COD*frXACO,
+                X_HMO=COD*frXHMO, X_PRO=COD*frXPRO, X_MEOLO=COD*frXMEOLO,
+                X_FO=COD*frXFO)
+    X_Bio = C[:, cmps.indices(_specific_groups['X_Bio'])].sum(axis=1)
+
+    _set_states(C, cmps, X_OHO_PHA=COD*frXOHO_PHA, X_GAO_PHA=COD*frXGAO_PHA,
+                X_PAO_PHA=COD*frXPAO_PHA, X_GAO_Gly=COD*frXGAO_Gly,
+                X_PAO_Gly=COD*frXPAO_Gly)
+    X_Stor = C[:, cmps.indices(_specific_groups['X_Stor'])].sum(axis=1)
+
+    _set_states(C, cmps, X_U_OHO_E=COD*frXU_OHO_E, X_U_PAO_E=COD*frXU_PAO_E)
+    X_U_E = COD*frXU_OHO_E + COD*frXU_PAO_E
+
+    XC_B = COD - S_Org - XC_U_Inf - X_U_E
+    C_B = XC_B * r['iCB_XCB']
+    C_B_BAP = C_B * r['iBAP_CB']
+    C_B_UAP = C_B * r['iUAP_CB']
+    _set_states(C, cmps, C_B_BAP=C_B_BAP, C_B_UAP=C_B_UAP,
+                C_B_Subst=C_B-C_B_BAP-C_B_UAP,
+                X_B_Subst=XC_B-C_B-X_Bio-X_Stor)
+
+    #************ inorganic components **************
+    TSS, VSS, X_Org_ISS = _vss_states(C, cmps, iVSS_TSS)
+    _iss_states(C, cmps, r, TSS, VSS, X_Org_ISS, X_PAO_PP)
+
+    # TODO: calibrate pH, SAlk, SCAT, SAN
+    _check_states(C, cmps)
+
+    #************ calibrate XB_subst, SF's N, P content *************
+    return C, _calib_N_P(cmps, C, S_NH4, iSNH_STKN, TKN, TP)
+
+
+def _cod_bod_states(components, r, conc_factor, n, SAlk,
+                    COD, sCOD, sBOD, BOD, TKN, TP, iVSS_TSS, iSNH_STKN,
+                    S_NH4, S_NO2, S_NO3, S_PO4, S_Ca, S_Mg, S_K, S_CAT, S_AN, S_N2,
+                    C_B, S_CH3OH, S_Ac, S_Prop, X_OHO_PHA, X_GAO_PHA, X_PAO_PHA,
+                    X_GAO_Gly, X_PAO_Gly, X_U_OHO_E, X_U_PAO_E,
+                    X_OHO, X_AOO, X_NOO, X_AMO, X_PAO, X_PRO, X_ACO, X_HMO,
+                    X_MEOLO, X_FO, X_FePO4, X_AlPO4, X_FeOH, X_AlOH, X_MAP, X_HAP,
+                    X_HDP, X_PAO_PP, X_MgCO3, X_CaCO3, DO, S_H2, S_CH4):
+    # shared by the COD- and BOD-based models
+    cmps = components
+    C = np.zeros((n, cmps.size))
+
+    #************ user-defined inorganic states **************
+    _inorganic_states(C, cmps, conc_factor, SAlk, S_H2, S_CH4, S_N2, DO,
+                      S_NH4, S_NO2, S_NO3, S_PO4, S_Ca, S_Mg, S_K, X_MAP, X_HAP, 
+                      X_HDP, X_FePO4, X_AlPO4, X_FeOH, X_AlOH, X_MgCO3, X_CaCO3,
+                      S_CAT, S_AN)
+
+    #************ organic components **************
+    _set_states(C, cmps, S_CH3OH=S_CH3OH, S_Ac=S_Ac, S_Prop=S_Prop)
+    other_sBOD = C @ (cmps.s * cmps.org * cmps.f_BOD5_COD)
+    iSF = cmps.index('S_F')
+    C[:, iSF] = (sBOD - other_sBOD)/cmps.f_BOD5_COD[iSF]
+
+    S_U = sCOD - C @ (cmps.s * cmps.org)
+    S_U_Inf = S_U * r['iSUInf_SU']
+    _set_states(C, cmps, S_U_Inf=S_U_Inf, S_U_E=S_U-S_U_Inf)
+
+    C_B_BAP = C_B * r['iBAP_CB']
+    C_B_UAP = C_B * r['iUAP_CB']
+    _set_states(C, cmps, C_B_BAP=C_B_BAP, C_B_UAP=C_B_UAP,
+                C_B_Subst=C_B-C_B_BAP-C_B_UAP)
+
+    XC_B = C_B/r['iCB_XCB']
+    XC_U = COD - sCOD - XC_B
+    XC_U_Inf = XC_U - X_U_OHO_E - X_U_PAO_E
+    _set_states(C, cmps, X_U_OHO_E=X_U_OHO_E, X_U_PAO_E=X_U_PAO_E,
+                C_U_Inf=XC_U_Inf*r['iCUInf_XCUInf'],
+                X_U_Inf=XC_U_Inf*(1-r['iCUInf_XCUInf']))
+
+    _set_states(C, cmps, X_OHO=X_OHO, X_AOO=X_AOO, X_NOO=X_NOO, X_AMO=X_AMO,
+                X_PAO=X_PAO, X_ACO=X_ACO, X_HMO=X_HMO, X_PRO=X_PRO,
+                X_MEOLO=X_MEOLO, X_FO=X_FO, X_OHO_PHA=X_OHO_PHA,
+                X_GAO_PHA=X_GAO_PHA, X_PAO_PHA=X_PAO_PHA,
+                X_GAO_Gly=X_GAO_Gly, X_PAO_Gly=X_PAO_Gly)
+    _set_states(C, cmps, X_B_Subst=COD-C@(cmps.org*(cmps.s+cmps.c+cmps.x)))
+
+    #************ inorganic components **************
+    TSS, VSS, X_Org_ISS = _vss_states(C, cmps, iVSS_TSS)
+    _iss_states(C, cmps, r, TSS, VSS, X_Org_ISS, X_PAO_PP)
+
+    # TODO: calibrate pH, SAlk, SCAT, SAN
+    _check_states(C, cmps)
+
+    #************ calibrate XB_subst, SF's N, P content *************
+    calibrated = _calib_N_P(cmps, C, S_NH4, iSNH_STKN, TKN, TP)
+    fbodtocod_sub = _calib_XBsub_fBODCOD(cmps, C, _substrate_IDs, BOD)
+    calibrated['f_BOD5_COD'] = dict.fromkeys(_substrate_IDs, fbodtocod_sub)
+    return C, calibrated
+
+
+def _codbased_states(components, r, conc_factor, n, SAlk, COD, 
+                     iSCOD_COD, iSBOD_SCOD, iBOD_COD, **states):
+    sCOD = COD * iSCOD_COD
+    sBOD = sCOD * iSBOD_SCOD
+    return _cod_bod_states(components, r, conc_factor, n, SAlk,
+                           COD=COD, sCOD=sCOD, sBOD=sBOD, BOD=COD*iBOD_COD,
+                           **states)
+
+
+def _bodbased_states(components, r, conc_factor, n, SAlk, BOD,
+                     iSBOD_BOD, iSBOD_SCOD, iBOD_COD, **states):
+    COD = BOD / iBOD_COD
+    sBOD = BOD * iSBOD_BOD
+    return _cod_bod_states(components, r, conc_factor, n, SAlk,
+                           COD=COD, sCOD=sBOD/iSBOD_SCOD, sBOD=sBOD,
+                           BOD=COD*iBOD_COD, **states)
+
+
+def _sludge_states(components, r, conc_factor, n, SAlk,
+                   TSS, TKN, TP, S_NH4, S_PO4, iVSS_TSS, iscCOD_COD, iSNH_STKN,
+                   frXUInf_VSS, frXUE_VSS, frXOHO_VSS, frXAOO_VSS, frXNOO_VSS,
+                   frXPAO_VSS, frCB_scCOD, frSU_scCOD, 
+                   S_Ca, S_Mg, S_K, S_CAT, S_AN, S_N2,
+                   frXACO_VSS, frXHMO_VSS, frXPRO_VSS, frXFO_VSS, frXMEOLO_VSS,
+                   frXAMO_VSS, frXOHO_PHA_VSS, frXGAO_PHA_VSS, frXPAO_PHA_VSS,
+                   frXGAO_Gly_VSS, frXPAO_Gly_VSS, 
+                   frSCH3OH_scCOD, frSAc_scCOD, frSProp_scCOD,
+                   S_NO2, S_NO3, X_PAO_PP, X_FeOH, X_AlOH, X_FePO4, X_AlPO4,
+                   X_MAP, X_HAP, X_HDP, X_MgCO3, X_CaCO3, DO, S_H2, S_CH4):
+    cmps = components
+    C = np.zeros((n, cmps.size))
+
+    #************ user-defined inorganic states **************
+    _inorganic_states(C, cmps, conc_factor, SAlk, S_H2, S_CH4, S_N2, DO,
+                      S_NH4, S_NO2, S_NO3, S_PO4, S_Ca, S_Mg, S_K, X_MAP, X_HAP, 
+                      X_HDP, X_FePO4, X_AlPO4, X_FeOH, X_AlOH, X_MgCO3, X_CaCO3,
+                      S_CAT, S_AN)
+
+    #************ particulate components **************
+    VSS = TSS * iVSS_TSS
+    if r['iXUOHOE_XUE']: frOHO = r['iXUOHOE_XUE']
+    else:
+        frX = np.asarray(frXOHO_VSS + frXPAO_VSS, dtype=float)
+        frOHO = np.where(frX==0, 0.5, frXOHO_VSS/np.where(frX==0, 1., frX))
+    _set_states(C, cmps, X_U_Inf=frXUInf_VSS*VSS,
+                X_U_OHO_E=frXUE_VSS*VSS*frOHO, 
+                X_U_PAO_E=frXUE_VSS*VSS*(1-frOHO),
+                X_OHO=frXOHO_VSS*VSS, X_AOO=frXAOO_VSS*VSS, X_NOO=frXNOO_VSS*VSS,
+                X_AMO=frXAMO_VSS*VSS, X_PAO=frXPAO_VSS*VSS, X_ACO=frXACO_VSS*VSS,
+                X_HMO=frXHMO_VSS*VSS, X_PRO=frXPRO_VSS*VSS, 
+                X_MEOLO=frXMEOLO_VSS*VSS, X_FO=frXFO_VSS*VSS, 
+                X_OHO_PHA=frXOHO_PHA_VSS*VSS, X_GAO_PHA=frXGAO_PHA_VSS*VSS,
+                X_PAO_PHA=frXPAO_PHA_VSS*VSS, X_GAO_Gly=frXGAO_Gly_VSS*VSS,
+                X_PAO_Gly=frXPAO_Gly_VSS*VSS)
+    _set_states(C, cmps, X_B_Subst=VSS-C@(cmps.org*cmps.x))
+
+    # convert gVSS to gCOD
+    org_x = (cmps.org * cmps.x).astype(bool)
+    C[:, org_x] /= (cmps.i_mass * cmps.f_Vmass_Totmass)[org_x]
+
+    _set_states(C, cmps, X_PAO_PP_Hi=X_PAO_PP*r['iHi_XPAOPP'],
+                X_PAO_PP_Lo=X_PAO_PP*(1-r['iHi_XPAOPP']))
+    ig_ISS = TSS - C @ (cmps.i_mass * cmps.x * cmps.org)
+    other_ig_iss = C @ (cmps.i_mass * cmps.x * (1-cmps.org))
+    _set_states(C, cmps, X_Ig_ISS=ig_ISS-other_ig_iss)
+
+    #*********** soluble and colloidal components *************
+    xCOD = C @ (cmps.x * cmps.org)
+    scCOD = xCOD * iscCOD_COD / (1-iscCOD_COD)
+
+    S_U_Inf = frSU_scCOD * scCOD * r['iSUInf_SU']
+    C_B = frCB_scCOD * scCOD
+    C_B_BAP = C_B * r['iBAP_CB']
+    C_B_UAP = C_B * r['iUAP_CB']
+    _set_states(C, cmps, S_CH3OH=frSCH3OH_scCOD*scCOD, S_Ac=frSAc_scCOD*scCOD,
+                S_Prop=frSProp_scCOD*scCOD, S_U_Inf=S_U_Inf,
+                S_U_E=frSU_scCOD*scCOD-S_U_Inf,
+                C_B_BAP=C_B_BAP, C_B_UAP=C_B_UAP, C_B_Subst=C_B-C_B_BAP-C_B_UAP,
+                C_U_Inf=_get_state(C, cmps, 'X_U_Inf')*r['iCUInf_XCUInf']/(1-r['iCUInf_XCUInf']))
+    _set_states(C, cmps, S_F=scCOD-C@((cmps.s+cmps.c)*cmps.org))
+
+    # TODO: calibrate pH, SAlk, SCAT, SAN
+    _check_states(C, cmps)
+
+    #************ calibrate XB_subst, SF's N, P content *************
+    return C, _calib_N_P(cmps, C, S_NH4, iSNH_STKN, TKN, TP)
+
+
+_inf_models = {'codstates': _codstates_states,
+               'codbased': _codbased_states,
+               'bodbased': _bodbased_states,
+               'sludge': _sludge_states}
+
+# arguments of the influent models that are not used for concentrations
+_inf_model_args = ('cls', 'ID', 'flow_tot', 'units', 'phase', 'T', 'P',
+                   'price', 'thermo', 'pH', 'ratios')
 
 
 # %%
@@ -123,7 +453,7 @@ class WasteStream(Stream):
     '''
     
     # Child class will inherit parent class's slots
-    __slots__ = _ws_specific_slots
+    __slots__ = (*_ws_specific_slots, '_composite_cache')
     _default_ratios = _default_ratios
     ticket_name = 'ws'
     
@@ -134,6 +464,8 @@ class WasteStream(Stream):
                  TMg=None, TCa=None, dry_mass=None, charge=None, ratios=None,
                  ThOD=None, cnBOD=None, impact_item=None, **chemical_flows):
         
+        # no flows to convert, skip creating the property arrays of `units`
+        if not (chemical_flows or len(flow)): units = None
         super().__init__(ID=ID, flow=flow, phase=phase, T=T, P=P,
                          units=units, price=price, thermo=thermo, **chemical_flows)
         self._init_ws(pH, SAlk, COD, BOD, uBOD, TC, TOC, TN, TKN,
@@ -166,6 +498,7 @@ class WasteStream(Stream):
         if impact_item:
             impact_item._linked_stream = self
         self._impact_item = impact_item
+        self._composite_cache = None
 
     
     def show(self, T='K', P='Pa', flow='g/hr', composition=False, N=15,
@@ -251,15 +584,8 @@ class WasteStream(Stream):
         return self._ratios
     @ratios.setter
     def ratios(self, ratios):
-        r = self._ratios or WasteStream._default_ratios
-        for name, ratio in ratios.items():
-            if name not in r.keys():
-                raise ValueError(f'Cannot identify ratio named "{name}".'
-                                 f'Must be one of {r.keys()}.')
-            elif isinstance(ratio, (int, float)) and (ratio > 1 or ratio < 0):
-                raise ValueError(f"ratio {name}: {ratio} is out of range [0,1].")
-            r[name] = ratio
-        self._ratios = r
+        r = self._ratios or _default_ratios.copy()
+        self._ratios = _update_ratios(r, ratios)
 
     def composite(self, variable, subgroup=None, particle_size=None, 
                   degradability=None, organic=None, volatile=None,
@@ -297,90 +623,141 @@ class WasteStream(Stream):
             The estimated value of the composite variable, in [mg/L] or [mmol/L] (for "Charge").
 
         """
-        _get = getattr
-        if self.F_vol == 0.:
-            return 0.
-        
-        if variable not in _defined_composite_vars:
-            raise KeyError(f"Undefined composite variable {variable},"
-                           f"Must be one of {_defined_composite_vars}.")            
-        
-        #!!! assuming it's a liquid WasteStream
-        #TODO: deal with units
-        if subgroup:
-            cmps = subgroup
-            
+        cache = self._get_composite_cache()
+        if cache is not None:
+            key = (variable, subgroup, particle_size, degradability,
+                   organic, volatile, specification)
+            try: return cache[key]
+            except KeyError: pass
+        
+        F_vol = self.F_vol
+        if F_vol == 0.:
+            value = 0.
         else:
+            #!!! assuming it's a liquid WasteStream
+            #TODO: deal with units
             cmps = self.components
+            mass = self.mol * cmps.MW
+            coeffs = cmps.get_composite_coefficients(variable, particle_size,
+                                                     degradability, organic,
+                                                     volatile, specification)
+            if subgroup:
+                idx = cmps.indices(subgroup.IDs)
+                coeffs, mass = coeffs[idx], mass[idx]
+            value = (coeffs @ mass)/F_vol
+        
+        if cache is not None:
+            cache[key] = value
+        return value
 
-        IDs = list(cmps.IDs)            
-        if 'H2O' in IDs: IDs.remove('H2O')
-
-        if specification:
-            if specification == 'TKN': 
-                IDs = [ID for ID in IDs if ID not in ('S_N2','S_NO2','S_NO3')]
-            elif specification not in _specific_groups.keys():
-                raise KeyError(f"Undefined specification {specification}."
-                               f"Must be one of {_specific_groups.keys()}."
-                               "Or, try defining 'subgroup'.")
-            else: 
-                IDs = [ID for ID in IDs if ID in _specific_groups[specification]]
-                
-        IDs = tuple(IDs)
-        cmps = cmps.subgroup(IDs)
-        cmp_c = self.imass[IDs]/self.F_vol*1e3      #[mg/L]
-        exclude_gas = _get(cmps, 's')+_get(cmps, 'c')+_get(cmps, 'x')        
-        
-        if variable == 'COD': 
-            var = cmps.i_COD * cmp_c * exclude_gas * (cmps.i_COD >= 0)
-        elif variable == 'uBOD': 
-            var = cmps.i_COD * cmps.f_uBOD_COD * cmp_c * exclude_gas * (cmps.i_COD >= 0)
-        elif variable in ('BOD5', 'BOD'): 
-            var = cmps.i_COD * cmps.f_BOD5_COD * cmp_c * exclude_gas * (cmps.i_COD >= 0)
-        elif variable == 'NOD':
-            var = cmps.i_NOD * cmp_c * exclude_gas
-        elif variable == 'ThOD':
-            var = (cmps.i_NOD + cmps.i_COD * (cmps.i_COD >= 0)) * cmp_c
-        elif variable == 'cnBOD':
-            var = (cmps.i_NOD + cmps.i_COD * cmps.f_BOD5_COD * (cmps.i_COD >= 0)) * cmp_c * exclude_gas
-        elif variable == 'C':
-            var = cmps.i_C * cmp_c
-        elif variable == 'N':
-            var = cmps.i_N * cmp_c * exclude_gas
-        elif variable == 'P':
-            var = cmps.i_P * cmp_c
-        elif variable == 'K':
-            var = cmps.i_K * cmp_c
-        elif variable == 'Mg':
-            var = cmps.i_Mg * cmp_c
-        elif variable == 'Ca':
-            var = cmps.i_Ca * cmp_c
-        elif variable == 'solids':
-            var = cmps.i_mass * cmp_c * exclude_gas
-            if volatile != None:
-                if volatile: var *= cmps.f_Vmass_Totmass
-                else: var *= 1-cmps.f_Vmass_Totmass
-        else:
-            var = cmps.i_charge * cmp_c
-        
-        dummy = np.ones(len(cmp_c))
-        if particle_size:
-            if particle_size == 'g': 
-                dummy *= 1-exclude_gas
+    @property
+    def cache_composites(self):
+        '''
+        [bool] Whether to cache the calculated composite variables (e.g., COD, TN)
+        of this waste stream, default to False.
+        Cached values are reused until the flow rates (including direct writes
+        through `mol` or `imass`), phase, temperature, pressure,
+        or components of the waste stream change.
+        '''
+        return self._composite_cache is not None
+    @cache_composites.setter
+    def cache_composites(self, i):
+        self._composite_cache = {} if i else None
+
+    def _get_composite_cache(self):
+        # cached values are cleared if the stream has been changed,
+        # the flow rates are compared with a copy kept in the cache
+        # so that in-place writes to `mol` are caught without hashing the array
+        cache = self._composite_cache
+        if cache is not None:
+            mol = self.mol
+            state = (self.phase, self.T, self.P, self.chemicals)
+            last = cache.get(None)
+            if last is None or last[1:] != state or not (last[0] == mol).all():
+                cache.clear()
+                cache[None] = (mol.copy(), *state)
+        return cache
+
+    def _reset_composite_cache(self):
+        cache = getattr(self, '_composite_cache', None)
+        if cache: cache.clear()
+
+    def reset_cache(self):
+        '''Reset cache regarding equilibrium methods and the cached composite variables.'''
+        Stream.reset_cache(self)
+        self._reset_composite_cache()
+
+    @staticmethod
+    def composite_many(streams, variables, as_load=False):
+        '''
+        Calculate composite variables of multiple waste streams at once.
+
+        Parameters
+        ----------
+        streams : Iterable[:class:`WasteStream`]
+            Waste streams sharing the same :class:`CompiledComponents`.
+        variables : Iterable[str or dict]
+            Each variable can be a composite property of :class:`WasteStream`
+            (e.g., "COD", "TN", "TKN"), a composite variable
+            (e.g., "N", "solids", refer to :func:`composite`),
+            or a dict of keyword arguments of :func:`composite`
+            (e.g., {"variable": "solids", "particle_size": "x"}).
+            For properties, user-defined values (e.g., `_COD`) are used
+            if given, same as getting the property of the waste stream.
+        as_load : bool, optional
+            Whether to return the flow rates of the variables (i.e., the variables
+            multiplied by the volumetric flow rates of the waste streams),
+            in kg/hr for variables in mg/L. The default is False.
+
+        Returns
+        -------
+        values : numpy.ndarray
+            An array of (number of streams × number of variables).
+
+        '''
+        streams = tuple(streams)
+        variables = tuple(variables)
+        slots = []
+        kwargs = []
+        for var in variables:
+            if isinstance(var, dict):
+                slots.append(None)
+                kwargs.append(var)
+            elif var in _composite_properties:
+                slot, kw = _composite_properties[var]
+                slots.append(slot)
+                kwargs.append(kw)
             else:
-                dummy *= _get(cmps, particle_size)
-        
-        if degradability:
-            if degradability == 'u': dummy *= 1-_get(cmps, 'b')
-            elif degradability == 'b': dummy *= _get(cmps, 'b')
-            elif degradability == 'rb': dummy *= _get(cmps, 'rb')
-            else: dummy *= _get(cmps, 'b')-_get(cmps, 'rb')
-
-        if organic != None:
-            if organic: dummy *= _get(cmps, 'org')
-            else: dummy *= 1-_get(cmps, 'org')
-        
-        return (dummy*var).sum()
+                slots.append(None)
+                kwargs.append(dict(variable=var))
+        if not streams:
+            return np.zeros((0, len(variables)))
+        
+        cmps = streams[0].components
+        for ws in streams:
+            if ws.components is not cmps:
+                raise ValueError('All waste streams must have the same `CompiledComponents`, '
+                                 f'{ws} does not.')
+        coeffs = np.column_stack([cmps.get_composite_coefficients(**kw)
+                                  for kw in kwargs])
+        mass = np.asarray([ws.mol for ws in streams]) * cmps.MW
+        F_vol = np.asarray([ws.F_vol for ws in streams])
+        nonzero = F_vol != 0.
+        if as_load:
+            values = mass @ coeffs / 1e3
+        else:
+            values = mass @ coeffs / np.where(nonzero, F_vol, 1.)[:, None]
+        values = np.where(nonzero[:, None], values, 0.)
+
+        for n, slot in enumerate(slots):
+            if not slot: continue
+            for m, ws in enumerate(streams):
+                if ws.phase == 'g':
+                    raise AttributeError(f'{ws.phase} phase waste stream does not have {variables[n]}.')
+                value = getattr(ws, slot)
+                if value:
+                    values[m, n] = value*F_vol[m]/1e3 if as_load else value
+        return values
 
     
     @property
@@ -399,6 +776,14 @@ class WasteStream(Stream):
         else:
             raise AttributeError(f'{self.phase} phase waste stream does not have {prop}.')
     
+    def _composite_property(self, prop):
+        # Only calculate the composite variable when no value is given
+        if self.phase != 'g':
+            slot, kwargs = _composite_properties[prop]
+            return getattr(self, slot) or self.composite(**kwargs)
+        else:
+            raise AttributeError(f'{self.phase} phase waste stream does not have {prop}.')
+    
     @property
     def pH(self):
         '''[float] pH, unitless.'''
@@ -412,12 +797,12 @@ class WasteStream(Stream):
     @property
     def COD(self):
         '''[float] Chemical oxygen demand in mg/L.'''
-        return self._liq_sol_properties('COD', self.composite('COD'))
+        return self._composite_property('COD')
 
     @property    
     def BOD(self):
         '''[float] Biochemical oxygen demand in mg/L. Same as BOD5.'''
-        return self._liq_sol_properties('BOD', self.composite('BOD'))
+        return self._composite_property('BOD')
 
     @property    
     def BOD5(self):
@@ -427,59 +812,59 @@ class WasteStream(Stream):
     @property    
     def uBOD(self):
         '''[float] Ultimate biochemical oxygen demand, in mg/L.'''
-        return self._liq_sol_properties('uBOD', self.composite('uBOD'))
+        return self._composite_property('uBOD')
 
     @property    
     def cnBOD(self):
         '''[float] Carbonaceous nitrogenous BOD, in mg/L. Biochemical oxygen demand including nitrification.'''
-        return self._liq_sol_properties('cnBOD', self.composite('cnBOD'))
+        return self._composite_property('cnBOD')
 
     @property    
     def ThOD(self):
         '''[float] Theoretical oxygen demand, in mg/L.'''
-        return self._liq_sol_properties('ThOD', self.composite('ThOD'))
+        return self._composite_property('ThOD')
     
     #!!! Maybe include C_frac, etc. to calculate C_mass/F_mass - valid for all phases
     # Or a function to calculate it?
     @property
     def TC(self):
         '''[float] Total carbon, in mg/L.'''
-        return self._liq_sol_properties('TC', self.composite('C'))
+        return self._composite_property('TC')
     
     @property
     def TOC(self):
         '''[float] Total organic carbon, in mg/L.'''
-        return self._liq_sol_properties('TOC', self.composite('C', organic=True))
+        return self._composite_property('TOC')
         
     @property
     def TN(self):
         '''[float] Total nitrogen, in mg/L.'''
-        return self._liq_sol_properties('TN', self.composite('N'))
+        return self._composite_property('TN')
     
     @property
     def TKN(self):
         '''[float] Total Kjeldahl nitrogen, in mg/L.'''
-        return self._liq_sol_properties('TKN', self.composite('N', specification='TKN'))
+        return self._composite_property('TKN')
     
     @property
     def TP(self):
         '''[float] Total phosphorus, in mg/L.'''
-        return self._liq_sol_properties('TP', self.composite('P'))
+        return self._composite_property('TP')
     
     @property
     def TK(self):
         '''[float] Total potassium, in mg/L.'''
-        return self._liq_sol_properties('TK', self.composite('K'))
+        return self._composite_property('TK')
     
     @property
     def TMg(self):
         '''[float] Total magnesium, in mg/L.'''
-        return self._liq_sol_properties('TMg', self.composite('Mg'))
+        return self._composite_property('TMg')
     
     @property
     def TCa(self):
         '''[float] Total calcium, in mg/L.'''
-        return self._liq_sol_properties('TCa', self.composite('Ca'))
+        return self._composite_property('TCa')
     
     @property
     def dry_mass(self):
@@ -509,6 +894,7 @@ class WasteStream(Stream):
         for slot in _ws_specific_slots:
             value = getattr(other, slot)
             setattr(self, slot, value)
+        self._reset_composite_cache()
     
     def copy_flow(self, other, IDs=..., *, remove=False, exclude=False, if_copy_ws=False):
         #!!! How to inherit the Stream copy_flow function?
@@ -529,24 +915,83 @@ class WasteStream(Stream):
                 other.imol.data[:, index] = 0
             else:
                 mol[index] = 0
+                if isinstance(other, WasteStream): other._reset_composite_cache()
 
         if if_copy_ws:
             for slot in _ws_specific_slots:
                 value = getattr(other, slot)
                 setattr(self, slot, value)
+        self._reset_composite_cache()
 
     def mix_from(self, others):
+        others = tuple(others)
         Stream.mix_from(self, others)
-        for slot in _ws_specific_slots:
-            #!!! This need reviewing, might not be good to calculate some
-            # attributes like pH
-            try: tot = sum(float(getattr(i, slot))*i.F_vol for i in others)
-            except: continue
-            if tot == 0.:
-                setattr(self, slot, None)
-            else:
-                setattr(self, slot, tot/self.F_vol)
+        self._reset_composite_cache()
+        if not others:
+            for slot in _ws_specific_slots: setattr(self, slot, None)
+            return
+        # state variables can only be mixed among waste streams
+        isa = isinstance
+        if not all([isa(i, WasteStream) for i in others]): return
+        
+        #!!! This need reviewing, might not be good to calculate some
+        # attributes like pH
+        _get = getattr
+        raw = [[_get(i, slot) for slot in _ws_mixed_slots] for i in others]
+        # only mix variables that have been set for all streams
+        mixed = ~np.asarray([[j is None for j in i] for i in raw]).any(axis=0)
+        if not mixed.any(): return
+        values = np.asarray(raw, dtype=float)[:, mixed]
+        F_vols = np.asarray([i.F_vol if i.F_mol else 0. for i in others])
+        tots = F_vols @ values
+        F_vol = self.F_vol
+        for slot, tot in zip(_ws_mixed_slots_arr[mixed], tots):
+            if tot == 0.: setattr(self, slot, None)
+            else: setattr(self, slot, tot/F_vol)
+
+    def empty(self):
+        '''Empty stream flow rates.'''
+        Stream.empty(self)
+        self._reset_composite_cache()
+
+
+    def solids_profile(self):
+        '''
+        Calculate all solids fractions at once.
+
+        Returns
+        -------
+        profile : :class:`SolidsProfile`
+            Dissolved, colloidal, particulate, volatile colloidal,
+            volatile particulate, and inorganic particulate solids, all in mg/L.
+
+        Examples
+        --------
+        >>> from qsdsan._waste_stream import SolidsProfile
+        >>> profile = SolidsProfile(100., 20., 200., 15., 150., 50.)
+        >>> profile.TSS, profile.VSS, profile.ISS
+        (200.0, 150.0, 50.0)
+        >>> profile.TDS
+        120.0
+
+        '''
+        cache = self._get_composite_cache()
+        if cache is not None:
+            try: return cache['solids_profile']
+            except KeyError: pass
+
+        F_vol = self.F_vol
+        if F_vol == 0.:
+            values = (0.,) * len(SolidsProfile._fields)
+        else:
+            cmps = self.components
+            mass = self.mol * cmps.MW
+            values = (mass @ cmps.get_solids_coefficients())/F_vol
+        profile = SolidsProfile(*values)
 
+        if cache is not None:
+            cache['solids_profile'] = profile
+        return profile
 
     def get_TDS(self, include_colloidal=True):
         '''
@@ -563,9 +1008,10 @@ class WasteStream(Stream):
             In mg/L.
 
         '''
-        TDS = self.composite('solids', particle_size='s')
+        profile = self.solids_profile()
+        TDS = profile.dissolved
         if include_colloidal:
-            TDS += self.composite('solids', particle_size='c')
+            TDS += profile.colloidal
         return TDS
     
     def get_TSS(self, include_colloidal=False):
@@ -583,176 +1029,52 @@ class WasteStream(Stream):
             In mg/L.
 
         '''
-        TSS = self.composite('solids', particle_size='x')
+        profile = self.solids_profile()
+        TSS = profile.particulate
         if include_colloidal:
-            TSS += self.composite('solids', particle_size='c')        
+            TSS += profile.colloidal
         return TSS
     
     def get_VSS(self, include_colloidal=False):
         '''[float] Volatile suspended solids, in mg/L.'''
-        VSS = self.composite('solids', particle_size='x', volatile=True)
+        profile = self.solids_profile()
+        VSS = profile.volatile_particulate
         if include_colloidal:
-            VSS += self.composite('solids', particle_size='c', volatile=True)        
+            VSS += profile.volatile_colloidal
         return VSS        
     
     def get_ISS(self):
         '''[float] Inorganic/involatile suspended solids, in mg/L.'''
-        return self.composite('solids', particle_size='x', volatile=False)
+        return self.solids_profile().inorganic_particulate
 
     @classmethod
-    def codstates_inf_model(cls, ID, flow_tot=0., units = ('L/hr', 'mg/L'), 
-                            phase='l', T=298.15, P=101325., price=0., thermo=None, 
-                            pH=7., SAlk=10., ratios=None, 
-                            COD=430., TKN=40., TP=10., iVSS_TSS=0.75, iSNH_STKN=0.9,
-                            S_NH4=25., S_NO2=0., S_NO3=0., S_PO4=8., 
-                            S_Ca=140., S_Mg=50., S_K=28., S_CAT=3., S_AN=12., S_N2=18., 
-                            frSUInf=0.05, frSF=0.2, frXCUInf=0.13, 
-                            frSUE=0., frSCH3OH=0., frSAc=0., frSProp=0., 
-                            frXOHO=0., frXAOO=0., frXNOO=0., frXAMO=0., frXPAO=0., 
-                            frXPRO=0., frXACO=0., frXHMO=0., frXMEOLO=0., frXFO=0.,
-                            frXOHO_PHA=0., frXGAO_PHA=0., frXPAO_PHA=0., 
-                            frXGAO_Gly=0., frXPAO_Gly=0., frXU_OHO_E=0., frXU_PAO_E=0.,
-                            X_FePO4=0., X_AlPO4=0., X_FeOH=0., X_AlOH=0., 
-                            X_MAP=0., X_HAP=0., X_HDP=0., X_PAO_PP=0., 
-                            X_MgCO3=0., X_CaCO3=0., DO=0., S_H2=0., S_CH4=0.):
-        
+    def _from_inf_model(cls, model, ID, flow_tot, units, phase, T, P, price,
+                        thermo, pH, ratios, **states):
         if thermo: cmps = thermo.chemicals
         else: cmps = _load_components(None)
-                
-        cmp_dct = dict.fromkeys(cmps.IDs, 0.)
-
-        new = cls(ID=ID, phase=phase, T=T, P=P, units='kg/hr', price=price, 
-                  thermo=thermo, pH=pH, SAlk=SAlk)
-
-        if ratios: new.ratios = ratios
-        else: new.ratios = WasteStream._default_ratios
-        r = new._ratios
-
-        #************ user-defined states **************        
-        cmp_dct['S_H2'] = S_H2
-        cmp_dct['S_CH4'] = S_CH4
-        cmp_dct['S_N2'] = S_N2
-        cmp_dct['S_O2'] = DO
-        cmp_dct['S_NH4'] = S_NH4
-        cmp_dct['S_NO2'] = S_NO2
-        cmp_dct['S_NO3'] = S_NO3
-        cmp_dct['S_PO4'] = S_PO4
-        cmp_dct['S_CO3'] = SAlk * 12 * conc_unit.conversion_factor(units[1])             # 1 meq/L SAlk ~ 1 mmol/L HCO3- ~ 12 mg C/L (12 mg C/mmol HCO3-)
-        cmp_dct['S_Ca'] = S_Ca
-        cmp_dct['S_Mg'] = S_Mg
-        cmp_dct['S_K'] = S_K
-        cmp_dct['X_MAP'] = X_MAP
-        cmp_dct['X_HAP'] = X_HAP
-        cmp_dct['X_HDP'] = X_HDP
-        cmp_dct['X_FePO4'] = X_FePO4
-        cmp_dct['X_AlPO4'] = X_AlPO4
-        cmp_dct['X_FeOH'] = X_FeOH
-        cmp_dct['X_AlOH'] = X_AlOH
-        cmp_dct['X_MgCO3'] = X_MgCO3
-        cmp_dct['X_CaCO3'] = X_CaCO3
-        cmp_dct['S_CAT'] = S_CAT
-        cmp_dct['S_AN'] = S_AN
-        
-        #************ organic components **************
-        cmp_dct['S_CH3OH'] = COD * frSCH3OH
-        cmp_dct['S_Ac'] = COD * frSAc
-        cmp_dct['S_Prop'] = COD * frSProp
-        cmp_dct['S_F'] = COD * frSF
-        cmp_dct['S_U_Inf'] = COD * frSUInf
-        cmp_dct['S_U_E'] = COD * frSUE
-        
-        S_Org = sum([v for k,v in cmp_dct.items() if k in ('S_CH3OH','S_Ac','S_Prop','S_F','S_U_Inf','S_U_E')])
-        
-        XC_U_Inf = COD * frXCUInf
-        cmp_dct['C_U_Inf'] = XC_U_Inf * r['iCUInf_XCUInf']
-        cmp_dct['X_U_Inf'] = XC_U_Inf * (1 - r['iCUInf_XCUInf'])
-        
-        cmp_dct['X_OHO'] = COD * frXOHO
-        cmp_dct['X_AOO'] = COD * frXAOO
-        cmp_dct['X_NOO'] = COD * frXNOO
-        cmp_dct['X_AMO'] = COD * frXAMO
-        cmp_dct['X_PAO'] = COD * frXPAO
-        cmp_dct['X_ACO'] = COD * frXACO
-        cmp_dct['X_HMO'] = COD * frXHMO
-        cmp_dct['X_PRO'] = COD * frXPRO
-        cmp_dct['X_MEOLO'] = COD * frXMEOLO
-        cmp_dct['X_FO'] = COD * frXFO
-        
-        X_Bio = sum([v for k,v in cmp_dct.items() if k.startswith('X_') and k.endswith('O')])
-        
-        cmp_dct['X_OHO_PHA'] = COD * frXOHO_PHA
-        cmp_dct['X_GAO_PHA'] = COD * frXGAO_PHA
-        cmp_dct['X_PAO_PHA'] = COD * frXPAO_PHA
-        cmp_dct['X_GAO_Gly'] = COD * frXGAO_Gly
-        cmp_dct['X_PAO_Gly'] = COD * frXPAO_Gly
-        
-        X_Stor = sum([v for k,v in cmp_dct.items() if k.endswith(('PHA','Gly'))])
-        
-        cmp_dct['X_U_OHO_E'] = COD * frXU_OHO_E
-        cmp_dct['X_U_PAO_E'] = COD * frXU_PAO_E
-        
-        X_U_E = cmp_dct['X_U_OHO_E'] + cmp_dct['X_U_PAO_E']
-        
-        XC_B = COD - S_Org - XC_U_Inf - X_U_E
-        C_B = XC_B * r['iCB_XCB']
-        cmp_dct['C_B_BAP'] = C_B * r['iBAP_CB']
-        cmp_dct['C_B_UAP'] = C_B * r['iUAP_CB']
-        cmp_dct['C_B_Subst'] = C_B - cmp_dct['C_B_BAP'] - cmp_dct['C_B_UAP']
-        
-        cmp_dct['X_B_Subst'] = XC_B - C_B - X_Bio - X_Stor
-        
-        cmp_c = np.asarray([v for v in cmp_dct.values()])
-        VSS = (cmp_c * cmps.i_mass * cmps.f_Vmass_Totmass * cmps.x * cmps.org).sum()
-        TSS = VSS/iVSS_TSS
-        X_Org_ISS = (cmp_c * cmps.i_mass * (1-cmps.f_Vmass_Totmass) * cmps.x * cmps.org).sum()
 
-        del S_Org, XC_U_Inf, X_Bio, X_Stor, X_U_E, XC_B, C_B
-        
-        #************ inorganic components **************
-        cmp_dct['X_PAO_PP_Hi'] = X_PAO_PP * r['iHi_XPAOPP']
-        cmp_dct['X_PAO_PP_Lo'] = X_PAO_PP * (1 - r['iHi_XPAOPP'])
-        
-        ISS = TSS - VSS
-        cmp_c = np.asarray([v for v in cmp_dct.values()])
-        other_ig_iss = (cmp_c * cmps.i_mass * cmps.x * (1-cmps.org)).sum()
-        cmp_dct['X_Ig_ISS'] = ISS - X_Org_ISS - other_ig_iss
-        
-        del ISS, VSS, TSS, X_Org_ISS, other_ig_iss, cmp_c
-        
-        # TODO: calibrate pH, SAlk, SCAT, SAN
-        bad_vars = {k:v for k,v in cmp_dct.items() if v<0}
-        if len(bad_vars) > 0:
-            raise ValueError(f"The following state variable(s) was found negative: {bad_vars}.")
-        
-        del bad_vars
-        
-        #************ calibrate XB_subst, SF's N, P content *************
-        if S_NH4 > 0 and cmp_dct['S_F'] > 0:
-            SFi_N = _calib_SF_iN(cmps, cmp_dct, S_NH4/iSNH_STKN)
-        XB_Substi_N = _calib_XBsub_iN(cmps, cmp_dct, TKN - S_NH4/iSNH_STKN)
-        XB_Substi_P = _calib_XBsub_iP(cmps, cmp_dct, TP)
-        
-        cmps = Components(cmps)
-        if S_NH4 > 0 and cmp_dct['S_F'] > 0: cmps.S_F.i_N = SFi_N
-        cmps.X_B_Subst.i_N = XB_Substi_N
-        cmps.X_B_Subst.i_P = XB_Substi_P
-        cmps.compile()
+        r = _update_ratios(_default_ratios.copy(), ratios or {})
+        factor = conc_unit.conversion_factor(units[1])
+        C, calibrated = _inf_models[model](cmps, r, factor, 1, **states)
+        IDs = cmps.IDs
+        cmps = cmps.overlay({attr: {i: v[0] for i, v in values.items()}
+                             for attr, values in calibrated.items()})
         _set_thermo(cmps)
         
         #************ convert concentrations to flow rates *************
         flow_tot /= vol_unit.conversion_factor(units[0])
-        factor = conc_unit.conversion_factor(units[1])
-            
-        cmp_dct = {k:v/factor*flow_tot*1e-6 for k,v in cmp_dct.items()}       # [mg/L]*[L/hr]*1e-6[kg/mg] = [kg/hr]
+        cmp_dct = dict(zip(IDs, C[0]/factor*flow_tot*1e-6))    # [mg/L]*[L/hr]*1e-6[kg/mg] = [kg/hr]
         dwt = sum(cmp_dct.values())         # dry weight
         
+        cmp_dct['H2O'] = flow_tot - dwt
+        new = cls(ID=ID, phase=phase, T=T, P=P, units='kg/hr', price=price, 
+                  thermo=thermo, pH=pH, SAlk=states['SAlk'], **cmp_dct)
+        imass = new.imass
         den = 1
         i = 0
         while True:
             den0 = den
-            cmp_dct['H2O'] = flow_tot*den0 - dwt
-            new = cls(ID=ID, phase=phase, T=T, P=P, units='kg/hr', price=price, 
-                      thermo=thermo, pH=pH, SAlk=SAlk, **cmp_dct)
+            imass['H2O'] = flow_tot*den0 - dwt
             den = flow_tot*den0/(new.F_vol*1e3)            
             i += 1
             if abs(den-den0) <= 1e-3: break
@@ -761,6 +1083,85 @@ class WasteStream(Stream):
         new.ratios = r
         return new
 
+    @classmethod
+    def batch_inf_model(cls, model='codstates', units='mg/L', thermo=None,
+                        ratios=None, **states):
+        '''
+        Characterize multiple influents at once with one of the influent models,
+        without creating any :class:`WasteStream` or compiling new components.
+        
+        Parameters
+        ----------
+        model : str
+            Influent model, can be "codstates", "codbased", "bodbased", or "sludge"
+            (e.g., "codstates" for :func:`WasteStream.codstates_inf_model`).
+        units : str
+            Unit of the input and output concentrations.
+        thermo : obj
+            Thermo property package, will use the default one if not provided.
+        ratios : dict
+            Ratios used in the influent model.
+        states : float or Iterable
+            Inputs of the influent model (e.g., `COD`, `TKN`, `frSF`),
+            iterables should have one value for each influent,
+            default values of the model will be used for those not provided.
+        
+        Returns
+        -------
+        concentrations : numpy.ndarray
+            Concentrations of the components (excluding water),
+            one row for each influent and one column for each component.
+        calibrated : dict
+            Calibrated component properties, as
+            {property: {component ID: 1D array with one value for each influent}}.
+        
+        See Also
+        --------
+        :func:`WasteStream.codstates_inf_model`
+        
+        :func:`WasteStream.codbased_inf_model`
+        
+        :func:`WasteStream.bodbased_inf_model`
+        
+        :func:`WasteStream.sludge_inf_model`
+        '''
+        try: func = _inf_models[model]
+        except KeyError:
+            raise ValueError(f'Influent model "{model}" not recognized, '
+                             f'must be one of {tuple(_inf_models.keys())}.')
+        params = signature(getattr(cls, f'{model}_inf_model')).parameters
+        kwargs = {k: p.default for k, p in params.items() if k not in _inf_model_args}
+        for k, v in states.items():
+            if k not in kwargs:
+                raise TypeError(f'"{k}" is not an input of the "{model}" model.')
+            kwargs[k] = np.asarray(v, dtype=float)
+        n = max(np.size(v) for v in kwargs.values())
+
+        if thermo: cmps = thermo.chemicals
+        else: cmps = _load_components(None)
+        r = _update_ratios(_default_ratios.copy(), ratios or {})
+        return func(cmps, r, conc_unit.conversion_factor(units), n, **kwargs)
+
+    @classmethod
+    def codstates_inf_model(cls, ID, flow_tot=0., units = ('L/hr', 'mg/L'), 
+                            phase='l', T=298.15, P=101325., price=0., thermo=None, 
+                            pH=7., SAlk=10., ratios=None, 
+                            COD=430., TKN=40., TP=10., iVSS_TSS=0.75, iSNH_STKN=0.9,
+                            S_NH4=25., S_NO2=0., S_NO3=0., S_PO4=8., 
+                            S_Ca=140., S_Mg=50., S_K=28., S_CAT=3., S_AN=12., S_N2=18., 
+                            frSUInf=0.05, frSF=0.2, frXCUInf=0.13, 
+                            frSUE=0., frSCH3OH=0., frSAc=0., frSProp=0., 
+                            frXOHO=0., frXAOO=0., frXNOO=0., frXAMO=0., frXPAO=0., 
+                            frXPRO=0., frXACO=0., frXHMO=0., frXMEOLO=0., frXFO=0.,
+                            frXOHO_PHA=0., frXGAO_PHA=0., frXPAO_PHA=0., 
+                            frXGAO_Gly=0., frXPAO_Gly=0., frXU_OHO_E=0., frXU_PAO_E=0.,
+                            X_FePO4=0., X_AlPO4=0., X_FeOH=0., X_AlOH=0., 
+                            X_MAP=0., X_HAP=0., X_HDP=0., X_PAO_PP=0., 
+                            X_MgCO3=0., X_CaCO3=0., DO=0., S_H2=0., S_CH4=0.):
+        states = {k: v for k, v in locals().items() if k not in _inf_model_args}
+        return cls._from_inf_model('codstates', ID, flow_tot, units, phase, T, P, 
+                                   price, thermo, pH, ratios, **states)
+
 
     @classmethod
     def codbased_inf_model(cls, ID, flow_tot=0., units = ('L/hr', 'mg/L'), 
@@ -778,158 +1179,9 @@ class WasteStream(Stream):
                            X_FePO4=0., X_AlPO4=0., X_FeOH=0., X_AlOH=0., 
                            X_MAP=0., X_HAP=0., X_HDP=0., X_PAO_PP=0., 
                            X_MgCO3=0., X_CaCO3=0., DO=0., S_H2=0., S_CH4=0.):
-        
-           
-        if thermo: cmps = thermo.chemicals
-        else: cmps = _load_components(None)
-        
-        cmp_dct = dict.fromkeys(cmps.IDs, 0.)
-
-        new = cls(ID=ID, phase=phase, T=T, P=P, units='kg/hr', price=price, 
-                  thermo=thermo, pH=pH, SAlk=SAlk)
-
-        if ratios: new.ratios = ratios
-        else: new.ratios = WasteStream._default_ratios
-        r = new._ratios
-
-        #************ user-defined inorganic states **************        
-        cmp_dct['S_H2'] = S_H2
-        cmp_dct['S_CH4'] = S_CH4
-        cmp_dct['S_N2'] = S_N2
-        cmp_dct['S_O2'] = DO
-        cmp_dct['S_NH4'] = S_NH4
-        cmp_dct['S_NO2'] = S_NO2
-        cmp_dct['S_NO3'] = S_NO3
-        cmp_dct['S_PO4'] = S_PO4
-        cmp_dct['S_CO3'] = SAlk * 12 * conc_unit.conversion_factor(units[1])       # 1 meq/L SAlk ~ 1 mmol/L HCO3- ~ 12 mg C/L (12 mg C/mmol HCO3-)
-        cmp_dct['S_Ca'] = S_Ca
-        cmp_dct['S_Mg'] = S_Mg
-        cmp_dct['S_K'] = S_K
-        cmp_dct['X_MAP'] = X_MAP
-        cmp_dct['X_HAP'] = X_HAP
-        cmp_dct['X_HDP'] = X_HDP
-        cmp_dct['X_FePO4'] = X_FePO4
-        cmp_dct['X_AlPO4'] = X_AlPO4
-        cmp_dct['X_FeOH'] = X_FeOH
-        cmp_dct['X_AlOH'] = X_AlOH
-        cmp_dct['X_MgCO3'] = X_MgCO3
-        cmp_dct['X_CaCO3'] = X_CaCO3
-        cmp_dct['S_CAT'] = S_CAT
-        cmp_dct['S_AN'] = S_AN
-        
-        #************ organic components **************
-        sCOD = COD * iSCOD_COD
-        sBOD = sCOD * iSBOD_SCOD
-        cmp_dct['S_CH3OH'] = S_CH3OH
-        cmp_dct['S_Ac'] = S_Ac
-        cmp_dct['S_Prop'] = S_Prop
-        
-        cmp_c = np.asarray([v for v in cmp_dct.values()])
-        other_sBOD = (cmp_c * cmps.s * cmps.org * cmps.f_BOD5_COD).sum()
-        cmp_dct['S_F'] = (sBOD - other_sBOD)/cmps.S_F.f_BOD5_COD
-        
-        cmp_c = np.asarray([v for v in cmp_dct.values()])        
-        S_U = sCOD - (cmp_c * cmps.s * cmps.org).sum()
-        cmp_dct['S_U_Inf'] = S_U * r['iSUInf_SU']
-        cmp_dct['S_U_E'] = S_U - cmp_dct['SU_Inf']
-        
-        cmp_dct['C_B_BAP'] = C_B * r['iBAP_CB']
-        cmp_dct['C_B_UAP'] = C_B * r['iUAP_CB']
-        cmp_dct['C_B_Subst'] = C_B - cmp_dct['C_B_BAP'] - cmp_dct['C_B_UAP']
-
-        XC_B = C_B/r['iCB_XCB']
-        XC_U = COD - sCOD - XC_B
-        cmp_dct['X_U_OHO_E'] = X_U_OHO_E
-        cmp_dct['X_U_PAO_E'] = X_U_PAO_E
-        
-        XC_U_Inf = XC_U - X_U_OHO_E - X_U_PAO_E
-        cmp_dct['C_U_Inf'] = XC_U_Inf * r['iCUInf_XCUInf']
-        cmp_dct['X_U_Inf'] = XC_U_Inf * (1 - r['iCUInf_XCUInf'])
-        
-        cmp_dct['X_OHO'] = X_OHO
-        cmp_dct['X_AOO'] = X_AOO
-        cmp_dct['X_NOO'] = X_NOO
-        cmp_dct['X_AMO'] = X_AMO
-        cmp_dct['X_PAO'] = X_PAO
-        cmp_dct['X_ACO'] = X_ACO
-        cmp_dct['X_HMO'] = X_HMO
-        cmp_dct['X_PRO'] = X_PRO
-        cmp_dct['X_MEOLO'] = X_MEOLO
-        cmp_dct['X_FO'] = X_FO
-        cmp_dct['X_OHO_PHA'] = X_OHO_PHA
-        cmp_dct['X_GAO_PHA'] = X_GAO_PHA
-        cmp_dct['X_PAO_PHA'] = X_PAO_PHA
-        cmp_dct['X_GAO_Gly'] = X_GAO_Gly
-        cmp_dct['X_PAO_Gly'] = X_PAO_Gly
-                
-        cmp_c = np.asarray([v for v in cmp_dct.values()])
-        cmp_dct['X_B_Subst'] = COD - (cmp_c * cmps.org * (cmps.s + cmps.c + cmps.x)).sum()
-        
-        cmp_c = np.asarray([v for v in cmp_dct.values()])
-        VSS = (cmp_c * cmps.i_mass * cmps.f_Vmass_Totmass * cmps.x * cmps.org).sum()
-        TSS = VSS/iVSS_TSS
-        X_Org_ISS = (cmp_c * cmps.i_mass * (1-cmps.f_Vmass_Totmass) * cmps.x * cmps.org).sum()
-
-        del sCOD, sBOD, other_sBOD, S_U, XC_U, XC_B, XC_U_Inf
-        
-        #************ inorganic components **************
-        cmp_dct['X_PAO_PP_Hi'] = X_PAO_PP * r['iHi_XPAOPP']
-        cmp_dct['X_PAO_PP_Lo'] = X_PAO_PP * (1 - r['iHi_XPAOPP'])
-        
-        ISS = TSS - VSS
-        cmp_c = np.asarray([v for v in cmp_dct.values()])
-        other_ig_iss = (cmp_c * cmps.i_mass * cmps.x * (1-cmps.org)).sum()
-        cmp_dct['X_Ig_ISS'] = ISS - X_Org_ISS - other_ig_iss
-        
-        del ISS, VSS, TSS, X_Org_ISS, other_ig_iss, cmp_c
-        
-        # TODO: calibrate pH, SAlk, SCAT, SAN
-        bad_vars = {k:v for k,v in cmp_dct.items() if v<0}
-        if len(bad_vars) > 0:
-            raise ValueError(f"The following state variable(s) was found negative: {bad_vars}.")
-        
-        del bad_vars
-        
-        #************ calibrate XB_subst, SF's N, P content *************
-        if S_NH4 > 0 and cmp_dct['S_F'] > 0:
-            SFi_N = _calib_SF_iN(cmps, cmp_dct, S_NH4/iSNH_STKN)
-        XB_Substi_N = _calib_XBsub_iN(cmps, cmp_dct, TKN - S_NH4/iSNH_STKN)
-        XB_Substi_P = _calib_XBsub_iP(cmps, cmp_dct, TP)
-        
-        BOD = COD * iBOD_COD
-        sub_IDs = ('X_B_Subst', 'X_OHO_PHA', 'X_GAO_PHA', 'X_PAO_PHA', 'X_GAO_Gly', 'X_PAO_Gly')
-        fbodtocod_sub = _calib_XBsub_fBODCOD(cmps, cmp_dct, sub_IDs, BOD)
-        
-        cmps = Components(cmps)
-        if S_NH4 > 0 and cmp_dct['S_F'] > 0: cmps.S_F.i_N = SFi_N
-        cmps.X_B_Subst.i_N = XB_Substi_N
-        cmps.X_B_Subst.i_P = XB_Substi_P
-        for i in sub_IDs: cmps[i].f_BOD5_COD = fbodtocod_sub
-        cmps.compile()
-        _set_thermo(cmps)
-        
-        #************ convert concentrations to flow rates *************
-        flow_tot /= vol_unit.conversion_factor(units[0])
-        factor = conc_unit.conversion_factor(units[1])
-            
-        cmp_dct = {k:v/factor*flow_tot*1e-6 for k,v in cmp_dct.items()}       # [mg/L]*[L/hr]*1e-6[kg/mg] = [kg/hr]
-        dwt = sum(cmp_dct.values())
-        
-        den = 1
-        i = 0
-        while True:
-            den0 = den
-            cmp_dct['H2O'] = flow_tot*den0 - dwt
-            new = cls(ID=ID, phase=phase, T=T, P=P, units='kg/hr', price=price, 
-                      thermo=thermo, pH=pH, SAlk=SAlk, **cmp_dct)
-            den = flow_tot*den0/(new.F_vol*1e3)            
-            i += 1
-            if abs(den-den0) <= 1e-3: break
-            if i > 50: raise ValueError('Density calculation failed to converge within 50 iterations.')
-
-        new.ratios = r        
-        
-        return new
+        states = {k: v for k, v in locals().items() if k not in _inf_model_args}
+        return cls._from_inf_model('codbased', ID, flow_tot, units, phase, T, P, 
+                                   price, thermo, pH, ratios, **states)
 
 
     @classmethod
@@ -948,159 +1200,9 @@ class WasteStream(Stream):
                            X_FePO4=0., X_AlPO4=0., X_FeOH=0., X_AlOH=0., 
                            X_MAP=0., X_HAP=0., X_HDP=0., X_PAO_PP=0., 
                            X_MgCO3=0., X_CaCO3=0., DO=0., S_H2=0., S_CH4=0.):
-        
-           
-        if thermo: cmps = thermo.chemicals
-        else: cmps = _load_components(None)
-        
-        cmp_dct = dict.fromkeys(cmps.IDs, 0.)
-
-        new = cls(ID=ID, phase=phase, T=T, P=P, units='kg/hr', price=price, 
-                  thermo=thermo, pH=pH, SAlk=SAlk)
-
-        if ratios: new.ratios = ratios
-        else: new.ratios = WasteStream._default_ratios
-        r = new._ratios
-
-        #************ user-defined inorganic states **************        
-        cmp_dct['S_H2'] = S_H2
-        cmp_dct['S_CH4'] = S_CH4
-        cmp_dct['S_N2'] = S_N2
-        cmp_dct['S_O2'] = DO
-        cmp_dct['S_NH4'] = S_NH4
-        cmp_dct['S_NO2'] = S_NO2
-        cmp_dct['S_NO3'] = S_NO3
-        cmp_dct['S_PO4'] = S_PO4
-        cmp_dct['S_CO3'] = SAlk * 12 * conc_unit.conversion_factor(units[1])       # 1 meq/L SAlk ~ 1 mmol/L HCO3- ~ 12 mg C/L (12 mg C/mmol HCO3-)
-        cmp_dct['S_Ca'] = S_Ca
-        cmp_dct['S_Mg'] = S_Mg
-        cmp_dct['S_K'] = S_K
-        cmp_dct['X_MAP'] = X_MAP
-        cmp_dct['X_HAP'] = X_HAP
-        cmp_dct['X_HDP'] = X_HDP
-        cmp_dct['X_FePO4'] = X_FePO4
-        cmp_dct['X_AlPO4'] = X_AlPO4
-        cmp_dct['X_FeOH'] = X_FeOH
-        cmp_dct['X_AlOH'] = X_AlOH
-        cmp_dct['X_MgCO3'] = X_MgCO3
-        cmp_dct['X_CaCO3'] = X_CaCO3
-        cmp_dct['S_CAT'] = S_CAT
-        cmp_dct['S_AN'] = S_AN
-        
-        #************ organic components **************
-        COD = BOD / iBOD_COD
-        sBOD = BOD * iSBOD_BOD
-        cmp_dct['S_CH3OH'] = S_CH3OH
-        cmp_dct['S_Ac'] = S_Ac
-        cmp_dct['S_Prop'] = S_Prop
-        
-        cmp_c = np.asarray([v for v in cmp_dct.values()])
-        other_sBOD = (cmp_c * cmps.s * cmps.org * cmps.f_BOD5_COD).sum()
-        cmp_dct['S_F'] = (sBOD - other_sBOD)/cmps.S_F.f_BOD5_COD
-        
-        sCOD = sBOD / iSBOD_SCOD
-        cmp_c = np.asarray([v for v in cmp_dct.values()])        
-        S_U = sCOD - (cmp_c * cmps.s * cmps.org).sum()
-        cmp_dct['S_U_Inf'] = S_U * r['iSUInf_SU']
-        cmp_dct['S_U_E'] = S_U - cmp_dct['SU_Inf']
-        
-        cmp_dct['C_B_BAP'] = C_B * r['iBAP_CB']
-        cmp_dct['C_B_UAP'] = C_B * r['iUAP_CB']
-        cmp_dct['C_B_Subst'] = C_B - cmp_dct['C_B_BAP'] - cmp_dct['C_B_UAP']
-
-        XC_B = C_B/r['iCB_XCB']
-        XC_U = COD - sCOD - XC_B
-        cmp_dct['X_U_OHO_E'] = X_U_OHO_E
-        cmp_dct['X_U_PAO_E'] = X_U_PAO_E
-        
-        XC_U_Inf = XC_U - X_U_OHO_E - X_U_PAO_E
-        cmp_dct['C_U_Inf'] = XC_U_Inf * r['iCUInf_XCUInf']
-        cmp_dct['X_U_Inf'] = XC_U_Inf * (1 - r['iCUInf_XCUInf'])
-        
-        cmp_dct['X_OHO'] = X_OHO
-        cmp_dct['X_AOO'] = X_AOO
-        cmp_dct['X_NOO'] = X_NOO
-        cmp_dct['X_AMO'] = X_AMO
-        cmp_dct['X_PAO'] = X_PAO
-        cmp_dct['X_ACO'] = X_ACO
-        cmp_dct['X_HMO'] = X_HMO
-        cmp_dct['X_PRO'] = X_PRO
-        cmp_dct['X_MEOLO'] = X_MEOLO
-        cmp_dct['X_FO'] = X_FO
-        cmp_dct['X_OHO_PHA'] = X_OHO_PHA
-        cmp_dct['X_GAO_PHA'] = X_GAO_PHA
-        cmp_dct['X_PAO_PHA'] = X_PAO_PHA
-        cmp_dct['X_GAO_Gly'] = X_GAO_Gly
-        cmp_dct['X_PAO_Gly'] = X_PAO_Gly
-                
-        cmp_c = np.asarray([v for v in cmp_dct.values()])
-        cmp_dct['X_B_Subst'] = COD - (cmp_c * cmps.org * (cmps.s + cmps.c + cmps.x)).sum()
-        
-        cmp_c = np.asarray([v for v in cmp_dct.values()])
-        VSS = (cmp_c * cmps.i_mass * cmps.f_Vmass_Totmass * cmps.x * cmps.org).sum()
-        TSS = VSS/iVSS_TSS
-        X_Org_ISS = (cmp_c * cmps.i_mass * (1-cmps.f_Vmass_Totmass) * cmps.x * cmps.org).sum()
-
-        del sCOD, sBOD, other_sBOD, S_U, XC_U, XC_B, XC_U_Inf
-        
-        #************ inorganic components **************
-        cmp_dct['X_PAO_PP_Hi'] = X_PAO_PP * r['iHi_XPAOPP']
-        cmp_dct['X_PAO_PP_Lo'] = X_PAO_PP * (1 - r['iHi_XPAOPP'])
-        
-        ISS = TSS - VSS
-        cmp_c = np.asarray([v for v in cmp_dct.values()])
-        other_ig_iss = (cmp_c * cmps.i_mass * cmps.x * (1-cmps.org)).sum()
-        cmp_dct['X_Ig_ISS'] = ISS - X_Org_ISS - other_ig_iss
-        
-        del ISS, VSS, TSS, X_Org_ISS, other_ig_iss, cmp_c
-        
-        # TODO: calibrate pH, SAlk, SCAT, SAN
-        bad_vars = {k:v for k,v in cmp_dct.items() if v<0}
-        if len(bad_vars) > 0:
-            raise ValueError(f"The following state variable(s) was found negative: {bad_vars}.")
-        
-        del bad_vars
-        
-        #************ calibrate XB_subst, SF's N, P content *************
-        if S_NH4 > 0 and cmp_dct['S_F'] > 0:
-            SFi_N = _calib_SF_iN(cmps, cmp_dct, S_NH4/iSNH_STKN)
-        XB_Substi_N = _calib_XBsub_iN(cmps, cmp_dct, TKN - S_NH4/iSNH_STKN)
-        XB_Substi_P = _calib_XBsub_iP(cmps, cmp_dct, TP)
-        
-        BOD = COD * iBOD_COD
-        sub_IDs = ('X_B_Subst', 'X_OHO_PHA', 'X_GAO_PHA', 'X_PAO_PHA', 'X_GAO_Gly', 'X_PAO_Gly')
-        fbodtocod_sub = _calib_XBsub_fBODCOD(cmps, cmp_dct, sub_IDs, BOD)
-        
-        cmps = Components(cmps)
-        if S_NH4 > 0 and cmp_dct['S_F'] > 0: cmps.S_F.i_N = SFi_N
-        cmps.X_B_Subst.i_N = XB_Substi_N
-        cmps.X_B_Subst.i_P = XB_Substi_P
-        for i in sub_IDs: cmps[i].f_BOD5_COD = fbodtocod_sub
-        cmps.compile()
-        _set_thermo(cmps)
-
-        #************ convert concentrations to flow rates *************
-        flow_tot /= vol_unit.conversion_factor(units[0])
-        factor = conc_unit.conversion_factor(units[1])
-            
-        cmp_dct = {k:v/factor*flow_tot*1e-6 for k,v in cmp_dct.items()}       # [mg/L]*[L/hr]*1e-6[kg/mg] = [kg/hr]
-        dwt = sum(cmp_dct.values())
-        
-        den = 1
-        i = 0
-        while True:
-            den0 = den
-            cmp_dct['H2O'] = flow_tot*den0 - dwt
-            new = cls(ID=ID, phase=phase, T=T, P=P, units='kg/hr', price=price, 
-                      thermo=thermo, pH=pH, SAlk=SAlk, **cmp_dct)
-            den = flow_tot*den0/(new.F_vol*1e3)            
-            i += 1
-            if abs(den-den0) <= 1e-3: break
-            if i > 50: raise ValueError('Density calculation failed to converge within 50 iterations.')
-        
-        new.ratios = r
-        
-        return new
+        states = {k: v for k, v in locals().items() if k not in _inf_model_args}
+        return cls._from_inf_model('bodbased', ID, flow_tot, units, phase, T, P, 
+                                   price, thermo, pH, ratios, **states)
 
 
     @classmethod
@@ -1121,151 +1223,7 @@ class WasteStream(Stream):
                          S_NO2=0., S_NO3=0., X_PAO_PP=0., X_FeOH=0., X_AlOH=0., 
                          X_FePO4=0., X_AlPO4=0., X_MAP=0., X_HAP=0., X_HDP=0., 
                          X_MgCO3=0., X_CaCO3=0., DO=0., S_H2=0., S_CH4=0.):
-        
-        
-        if thermo: cmps = thermo.chemicals
-        else: cmps = _load_components(None)
-        
-        cmp_dct = dict.fromkeys(cmps.IDs, 0.)
-
-        new = cls(ID=ID, phase=phase, T=T, P=P, units='kg/hr', price=price, 
-                  thermo=thermo, pH=pH, SAlk=SAlk)
-
-        if ratios: new.ratios = ratios
-        else: new.ratios = WasteStream._default_ratios
-        r = new._ratios
-
-        #************ user-defined inorganic states **************        
-        cmp_dct['S_H2'] = S_H2
-        cmp_dct['S_CH4'] = S_CH4
-        cmp_dct['S_N2'] = S_N2
-        cmp_dct['S_O2'] = DO
-        cmp_dct['S_NH4'] = S_NH4
-        cmp_dct['S_NO2'] = S_NO2
-        cmp_dct['S_NO3'] = S_NO3
-        cmp_dct['S_PO4'] = S_PO4
-        cmp_dct['S_CO3'] = SAlk * 12 * conc_unit.conversion_factor(units[1])       # 1 meq/L SAlk ~ 1 mmol/L HCO3- ~ 12 mg C/L (12 mg C/mmol HCO3-)
-        cmp_dct['S_Ca'] = S_Ca
-        cmp_dct['S_Mg'] = S_Mg
-        cmp_dct['S_K'] = S_K
-        cmp_dct['X_MAP'] = X_MAP
-        cmp_dct['X_HAP'] = X_HAP
-        cmp_dct['X_HDP'] = X_HDP
-        cmp_dct['X_FePO4'] = X_FePO4
-        cmp_dct['X_AlPO4'] = X_AlPO4
-        cmp_dct['X_FeOH'] = X_FeOH
-        cmp_dct['X_AlOH'] = X_AlOH
-        cmp_dct['X_MgCO3'] = X_MgCO3
-        cmp_dct['X_CaCO3'] = X_CaCO3
-        cmp_dct['S_CAT'] = S_CAT
-        cmp_dct['S_AN'] = S_AN
-        
-        #************ particulate components **************
-        VSS = TSS * iVSS_TSS
-        cmp_dct['X_U_Inf'] = frXUInf_VSS * VSS
-        
-        if r['iXUOHOE_XUE']: frOHO = r['iXUOHOE_XUE']
-        else: 
-            try: frOHO = frXOHO_VSS/(frXOHO_VSS + frXPAO_VSS)
-            except ZeroDivisionError: frOHO = 0.5
-        cmp_dct['X_U_OHO_E'] = frXUE_VSS * VSS * frOHO
-        cmp_dct['X_U_PAO_E'] = frXUE_VSS * VSS * (1-frOHO)
-        
-        cmp_dct['X_OHO'] = frXOHO_VSS * VSS
-        cmp_dct['X_AOO'] = frXAOO_VSS * VSS
-        cmp_dct['X_NOO'] = frXNOO_VSS * VSS
-        cmp_dct['X_AMO'] = frXAMO_VSS * VSS
-        cmp_dct['X_PAO'] = frXPAO_VSS * VSS
-        cmp_dct['X_ACO'] = frXACO_VSS * VSS
-        cmp_dct['X_HMO'] = frXHMO_VSS * VSS
-        cmp_dct['X_PRO'] = frXPRO_VSS * VSS
-        cmp_dct['X_MEOLO'] = frXMEOLO_VSS * VSS
-        cmp_dct['X_FO'] = frXFO_VSS * VSS
-        cmp_dct['X_OHO_PHA'] = frXOHO_PHA_VSS * VSS
-        cmp_dct['X_GAO_PHA'] = frXGAO_PHA_VSS * VSS
-        cmp_dct['X_PAO_PHA'] = frXPAO_PHA_VSS * VSS
-        cmp_dct['X_GAO_Gly'] = frXGAO_Gly_VSS * VSS
-        cmp_dct['X_PAO_Gly'] = frXPAO_Gly_VSS * VSS
-        
-        cmp_c = np.asarray([v for v in cmp_dct.values()])
-        cmp_dct['X_B_Subst'] = VSS - (cmp_c * cmps.org * cmps.x).sum()
-        
-        # convert gVSS to gCOD
-        for cmp in cmps:
-            if cmp.organic and cmp.particle_size == 'Particulate':
-                cmp_dct[cmp.ID] /= cmp.i_mass * cmp.f_Vmass_Totmass
-        
-        cmp_dct['X_PAO_PP_Hi'] = X_PAO_PP * r['iHi_XPAOPP']
-        cmp_dct['X_PAO_PP_Lo'] = X_PAO_PP * (1 - r['iHi_XPAOPP'])
-        
-        cmp_c = np.asarray([v for v in cmp_dct.values()])
-        ig_ISS = TSS - (cmp_c * cmps.i_mass * cmps.x * cmps.org).sum()
-        other_ig_iss = (cmp_c * cmps.i_mass * cmps.x * (1-cmps.org)).sum()
-        cmp_dct['X_Ig_ISS'] = ig_ISS - other_ig_iss
-        
-        del other_ig_iss, cmp_c
-        
-        #*********** soluble and colloidal components *************
-        cmp_c = np.asarray([v for v in cmp_dct.values()])
-        xCOD = (cmp_c * cmps.x * cmps.org).sum()
-        scCOD = xCOD * iscCOD_COD / (1-iscCOD_COD)
-        
-        cmp_dct['S_CH3OH'] = frSCH3OH_scCOD * scCOD
-        cmp_dct['S_Ac'] = frSAc_scCOD * scCOD
-        cmp_dct['S_Prop'] = frSProp_scCOD * scCOD
-        cmp_dct['S_U_Inf'] = frSU_scCOD * scCOD * r['iSUInf_SU']
-        cmp_dct['S_U_E'] = frSU_scCOD * scCOD - cmp_dct['SU_Inf']
-        
-        C_B = frCB_scCOD * scCOD
-        cmp_dct['C_B_BAP'] = C_B * r['iBAP_CB']
-        cmp_dct['C_B_UAP'] = C_B * r['iUAP_CB']
-        cmp_dct['C_B_Subst'] = C_B - cmp_dct['C_B_BAP'] - cmp_dct['C_B_UAP']        
-        cmp_dct['C_U_Inf'] = cmp_dct['X_U_Inf'] * r['iCUInf_XCUInf'] / (1-r['iCUInf_XCUInf'])
-        
-        cmp_c = np.asarray([v for v in cmp_dct.values()])
-        cmp_dct['S_F'] = scCOD - (cmp_c * (cmps.s + cmps.c) * cmps.org).sum()
-                
-        # TODO: calibrate pH, SAlk, SCAT, SAN
-        bad_vars = {k:v for k,v in cmp_dct.items() if v<0}
-        if len(bad_vars) > 0:
-            raise ValueError(f"The following state variable(s) was found negative: {bad_vars}.")
-        
-        del bad_vars
-        
-        #************ calibrate XB_subst, SF's N, P content *************
-        if S_NH4 > 0 and cmp_dct['S_F'] > 0:
-            SFi_N = _calib_SF_iN(cmps, cmp_dct, S_NH4/iSNH_STKN)
-        XB_Substi_N = _calib_XBsub_iN(cmps, cmp_dct, TKN - S_NH4/iSNH_STKN)
-        XB_Substi_P = _calib_XBsub_iP(cmps, cmp_dct, TP)
-        
-        cmps = Components(cmps)
-        if S_NH4 > 0 and cmp_dct['S_F'] > 0: cmps.S_F.i_N = SFi_N
-        cmps.X_B_Subst.i_N = XB_Substi_N
-        cmps.X_B_Subst.i_P = XB_Substi_P
-        cmps.compile()
-        _set_thermo(cmps)
-
-        #************ convert concentrations to flow rates *************
-        flow_tot /= vol_unit.conversion_factor(units[0])
-        factor = conc_unit.conversion_factor(units[1])
-            
-        cmp_dct = {k:v/factor*flow_tot*1e-6 for k,v in cmp_dct.items()}       # [mg/L]*[L/hr]*1e-6[kg/mg] = [kg/hr]
-        dwt = sum(cmp_dct.values())
-        
-        den = 1
-        i = 0
-        while True:
-            den0 = den
-            cmp_dct['H2O'] = flow_tot*den0 - dwt
-            new = cls(ID=ID, phase=phase, T=T, P=P, units='kg/hr', price=price, 
-                      thermo=thermo, pH=pH, SAlk=SAlk, **cmp_dct)
-            den = flow_tot*den0/(new.F_vol*1e3)            
-            i += 1
-            if abs(den-den0) <= 1e-3: break
-            if i > 50: raise ValueError('Density calculation failed to converge within 50 iterations.')
-        
-        new.ratios = r
-
-        return new
-
+        states = {k: v for k, v in locals().items() if k not in _inf_model_args}
+        return cls._from_inf_model('sludge', ID, flow_tot, units, phase, T, P, 
+                                   price, thermo, pH, ratios, **states)
 
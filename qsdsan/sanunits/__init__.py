@@ -30,6 +30,7 @@ from ._biogas_combustion import *
 from ._crop_application import *
 from ._component_splitter import *
 from ._lumped_cost import *
+from ._cstr import *
 
 from . import (
     _bst_units,
@@ -50,6 +51,7 @@ from . import (
     _crop_application,
     _component_splitter,
     _lumped_cost,
+    _cstr,
     )
 
 __all__ = (
@@ -71,4 +73,5 @@ __all__ = (
     *_crop_application.__all__,
     *_component_splitter.__all__,
     *_lumped_cost.__all__,
+    *_cstr.__all__,
            )
\ No newline at end of file
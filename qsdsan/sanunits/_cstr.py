@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+QSDsan: Quantitative Sustainable Design for sanitation and resource recovery systems
+
+This module is under the University of Illinois/NCSA Open Source License.
+Please refer to https://github.com/QSD-Group/QSDsan/blob/master/LICENSE.txt
+for license details.
+'''
+
+
+# %%
+
+import numpy as np
+from warnings import warn
+from scipy.integrate import solve_ivp
+from .. import SanUnit, CompiledProcesses
+
+__all__ = ('CSTR', 'BatchReactor')
+
+
+class CSTR(SanUnit):
+    '''
+    Completely stirred tank reactor with the kinetics described by
+    :class:`CompiledProcesses`, the effluent is at the steady state found by
+    integrating the mass balances of the components with :func:`scipy.integrate.solve_ivp`.
+
+    Concentrations are in mg/L (g/m3) and rates of the processes are assumed to be in
+    g/m3/d (e.g., as in the activated sludge models), components of the influent
+    that are not in the processes pass through the reactor unchanged.
+
+    Parameters
+    ----------
+    ins : WasteStream
+        Influent.
+    outs : WasteStream
+        Effluent.
+    processes : :class:`CompiledProcesses`
+        Processes taking place in the reactor, numerical kernels of the
+        rates and the Jacobian are compiled once and cached by the processes.
+    V : float
+        Reactor volume, [m3].
+    HRT : float
+        Hydraulic retention time, [d], used to calculate `V`
+        from the influent flow rate if `V` is not given.
+    aeration : float
+        Concentration of dissolved oxygen kept by aeration, [mg/L],
+        no aeration if None.
+    DO_ID : str
+        ID of the component of dissolved oxygen.
+    parameters : dict
+        Values of the free parameters of the processes
+        (i.e., :attr:`CompiledProcesses.free_parameters`).
+    method : str
+        Integration method of :func:`scipy.integrate.solve_ivp`,
+        the Jacobian will be used for implicit methods.
+    t_max : float
+        Maximum integration time, [d], 100 times of the HRT if not given.
+    ss_tol : float
+        The steady state is reached when the maximum absolute rate of change
+        of the concentrations is below this value, [mg/L/d].
+
+    '''
+
+    _N_ins = 1
+    _N_outs = 1
+    _units = {
+        'Volume': 'm3',
+        'Hydraulic retention time': 'd',
+        }
+    
+    # tolerances of `solve_ivp`, tighter than the defaults to reach the steady state
+    _rtol = 1e-6
+    _atol = 1e-8
+
+    def __init__(self, ID='', ins=None, outs=(), processes=None, V=None, HRT=None,
+                 aeration=None, DO_ID='S_O2', parameters=None, method='BDF',
+                 t_max=None, ss_tol=1e-6, **kwargs):
+        SanUnit.__init__(self, ID, ins, outs)
+        if not isinstance(processes, CompiledProcesses):
+            raise TypeError('`processes` must be a `CompiledProcesses`, '
+                            f'not {type(processes).__name__}.')
+        if V is None and HRT is None:
+            raise ValueError('At least one of `V` and `HRT` should be provided.')
+        self.processes = processes
+        self.V = V
+        self.HRT = HRT
+        self.aeration = aeration
+        self.DO_ID = DO_ID
+        self.parameters = parameters or {}
+        self.method = method
+        self.t_max = t_max
+        self.ss_tol = ss_tol
+        self._state = None
+
+        for attr, value in kwargs.items():
+            setattr(self, attr, value)
+
+    def _get_indices(self, stream):
+        processes = self.processes
+        cmp_IDs = processes._components.IDs
+        idx = np.asarray(stream.components.indices(cmp_IDs))
+        fixed = []
+        if self.aeration is not None:
+            if self.DO_ID not in cmp_IDs:
+                raise RuntimeError(f'{self.DO_ID} is not a component of the processes.')
+            fixed.append(cmp_IDs.index(self.DO_ID))
+        params = self.parameters
+        try: params = np.asarray([params[i] for i in processes.free_parameters], dtype=float)
+        except KeyError as error:
+            raise RuntimeError(f'Value of parameter {error.args[0]} is not given.')
+        return idx, fixed, params
+
+    def _get_functions(self, C_in, D, fixed, params):
+        # dC/dt and the Jacobian of the reactor, `D` is the dilution rate [1/d]
+        processes = self.processes
+        rates = processes.rates
+        jacobian = processes.jacobian_function
+        dilution = D * np.eye(len(C_in))
+        # rates are evaluated at non-negative concentrations as the integration
+        # can overshoot below zero, where terms like X_PP/X_PAO have no meaning
+        def dC_dt(t, C):
+            dC = D*(C_in-C) + rates(np.maximum(C, 0.), params)
+            dC[fixed] = 0.
+            return dC
+        def jac(t, C):
+            J = jacobian(np.maximum(C, 0.), params)
+            J[:, C < 0.] = 0.
+            J -= dilution
+            J[fixed] = 0.
+            return J
+        return dC_dt, jac
+
+    def _integrate(self, dC_dt, jac, C0, t_max, events=None):
+        sol = solve_ivp(dC_dt, (0., t_max), C0, method=self.method, jac=jac,
+                        events=events, rtol=self._rtol, atol=self._atol)
+        if not sol.success:
+            raise RuntimeError(f'Integration of {self.ID} failed: {sol.message}')
+        return sol
+
+    def _run(self):
+        inf = self.ins[0]
+        eff = self.outs[0]
+        eff.copy_like(inf)
+        Q = inf.F_vol * 24 # m3/d
+        if not Q: return
+        idx, fixed, params = self._get_indices(inf)
+        C_in = inf.mass[idx] * 1e3 / inf.F_vol # [kg/hr]*1e3[g/kg]/[m3/hr] = [g/m3]
+        if fixed: C_in[fixed] = self.aeration
+        V = self.V or self.HRT*Q
+        tau = V/Q
+        dC_dt, jac = self._get_functions(C_in, 1/tau, fixed, params)
+
+        # warm start from the last steady state if available
+        state = self._state
+        C0 = C_in if state is None or state.shape != C_in.shape else state.copy()
+        if fixed: C0[fixed] = self.aeration
+        ss_tol = self.ss_tol
+        def steady_state(t, C):
+            return np.abs(dC_dt(t, C)).max() - ss_tol
+        steady_state.terminal = True
+        if steady_state(0., C0) <= 0.: C = C0
+        else:
+            sol = self._integrate(dC_dt, jac, C0, self.t_max or 100*tau,
+                                  events=steady_state)
+            if sol.status != 1:
+                warn(f'Steady state of {self.ID} is not reached within {sol.t[-1]:.3g} d.',
+                     stacklevel=2)
+            C = sol.y[:, -1]
+        self._state = C
+        eff.mass[idx] = np.maximum(C, 0.) * inf.F_vol / 1e3
+
+    def _design(self):
+        design = self.design_results
+        Q = self.ins[0].F_vol * 24
+        design['Volume'] = V = self.V or self.HRT*Q
+        design['Hydraulic retention time'] = V/Q if Q else self.HRT
+
+    @property
+    def state(self):
+        '''[numpy.ndarray] Concentrations of the components of the processes in the last run, [mg/L].'''
+        return self._state
+
+    def reset_state(self):
+        '''Clear the last state so that the next run starts from the influent.'''
+        self._state = None
+
+
+class BatchReactor(CSTR):
+    '''
+    Batch reactor with the kinetics described by :class:`CompiledProcesses`,
+    the influent is treated in batches and the effluent is at the end of a batch
+    found by integrating the mass balances of the components with
+    :func:`scipy.integrate.solve_ivp`.
+
+    Refer to :class:`CSTR` for the units of the concentrations and rates.
+
+    Parameters
+    ----------
+    ins : WasteStream
+        Influent.
+    outs : WasteStream
+        Effluent.
+    processes : :class:`CompiledProcesses`
+        Processes taking place in the reactor.
+    t_batch : float
+        Reaction time of a batch, [d].
+    aeration : float
+        Concentration of dissolved oxygen kept by aeration, [mg/L],
+        no aeration if None.
+    DO_ID : str
+        ID of the component of dissolved oxygen.
+    parameters : dict
+        Values of the free parameters of the processes.
+    method : str
+        Integration method of :func:`scipy.integrate.solve_ivp`.
+
+    See Also
+    --------
+    :class:`CSTR`
+
+    '''
+
+    _units = {
+        'Volume': 'm3',
+        'Batch time': 'd',
+        }
+
+    def __init__(self, ID='', ins=None, outs=(), processes=None, t_batch=1.,
+                 aeration=None, DO_ID='S_O2', parameters=None, method='BDF',
+                 **kwargs):
+        CSTR.__init__(self, ID, ins, outs, processes, HRT=t_batch,
+                      aeration=aeration, DO_ID=DO_ID, parameters=parameters,
+                      method=method, **kwargs)
+
+    def _run(self):
+        inf = self.ins[0]
+        eff = self.outs[0]
+        eff.copy_like(inf)
+        if not inf.F_vol: return
+        idx, fixed, params = self._get_indices(inf)
+        C_in = inf.mass[idx] * 1e3 / inf.F_vol
+        if fixed: C_in[fixed] = self.aeration
+        dC_dt, jac = self._get_functions(C_in, 0., fixed, params)
+        sol = self._integrate(dC_dt, jac, C_in, self.t_batch)
+        self._state = C = sol.y[:, -1]
+        eff.mass[idx] = np.maximum(C, 0.) * inf.F_vol / 1e3
+
+    def _design(self):
+        design = self.design_results
+        t_batch = self.t_batch
+        design['Volume'] = self.ins[0].F_vol * 24 * t_batch
+        design['Batch time'] = t_batch
+
+    @property
+    def t_batch(self):
+        '''[float] Reaction time of a batch, [d].'''
+        return self.HRT
+    @t_batch.setter
+    def t_batch(self, i):
+        self.HRT = float(i)
@@ -27,7 +27,7 @@ from chaospy import distributions as shape
 from thermosteam.functional import V_to_rho, rho_to_V
 from biosteam import PowerUtility
 from biosteam.evaluation import Model, Metric
-from qsdsan import currency, ImpactItem
+from qsdsan import currency, ImpactItem, StreamTable
 from qsdsan.utils.loading import load_data, data_path
 from qsdsan.utils.setters import AttrSetter, AttrFuncSetter, DictAttrSetter
 from qsdsan.utils.getters import FuncGetter
@@ -38,7 +38,8 @@ getattr = getattr
 eval = eval
 
 __all__ = ('modelA', 'modelB', 'modelC', 'result_dct',
-           'run_uncertainty', 'save_uncertainty_results')
+           'run_uncertainty', 'evaluate_with_stream_table',
+           'save_uncertainty_results')
 
 
 # %%
@@ -779,25 +780,30 @@ all_paramsC = modelC.get_parameters()
 # =============================================================================
 
 result_dct = {
-        'sysA': dict.fromkeys(('parameters', 'data', 'percentiles', 'spearman')),
-        'sysB': dict.fromkeys(('parameters', 'data', 'percentiles', 'spearman')),
-        'sysC': dict.fromkeys(('parameters', 'data', 'percentiles', 'spearman')),
+        'sysA': dict.fromkeys(('parameters', 'data', 'percentiles', 'spearman', 'streams')),
+        'sysB': dict.fromkeys(('parameters', 'data', 'percentiles', 'spearman', 'streams')),
+        'sysC': dict.fromkeys(('parameters', 'data', 'percentiles', 'spearman', 'streams')),
         }
 
 @time_printer
 def run_uncertainty(model, seed=None, N=1000, rule='L',
                     percentiles=(0, 0.05, 0.25, 0.5, 0.75, 0.95, 1),
-                    print_time=False):
+                    stream_path=None, print_time=False):
     global result_dct
     if seed:
         np.random.seed(seed)
 
     samples = model.sample(N, rule)
     model.load_samples(samples)
-    model.evaluate()
+    dct = result_dct[model._system.ID]
+    if stream_path:
+        # Write states of the waste streams to memory-mapped files,
+        # one row for each sample
+        dct['streams'] = evaluate_with_stream_table(model, samples, stream_path)
+    else:
+        model.evaluate()
 
     # Data organization
-    dct = result_dct[model._system.ID]
     index_p = len(model.get_parameters())
     dct['parameters'] = model.table.iloc[:, :index_p].copy()
     dct['data'] = model.table.iloc[:, index_p:].copy()
@@ -811,6 +817,35 @@ def run_uncertainty(model, seed=None, N=1000, rule='L',
     dct['spearman'] = spearman_results
     return dct
 
+def evaluate_with_stream_table(model, samples, path):
+    '''
+    Evaluate the model at each of the samples (already loaded into the model)
+    while recording states of the waste streams in the system after simulating
+    the sample into memory-mapped files in the given directory,
+    row `i` of the records (and of `model.table`) is for `samples[i]`,
+    rows of the samples that failed to simulate are marked by
+    :func:`qsdsan.StreamTable.record_failure` (NaN flow rates and temperatures,
+    also see :attr:`qsdsan.StreamTable.failed`), return the :class:`qsdsan.StreamTable`.
+    '''
+    system = model._system
+    table = StreamTable.from_system(system, len(samples), path=path)
+    data = model.table
+    metric_indices = [i.index for i in model.metrics]
+    try:
+        for i, sample in enumerate(samples):
+            try: values = model(sample)
+            except Exception:
+                # failed samples have NaN metrics as in `model.evaluate`
+                system.empty_recycles()
+                system.reset_cache()
+                data.loc[i, metric_indices] = np.nan
+                table.record_failure(i)
+                continue
+            data.loc[i, values.index] = values.values
+            table.record(i)
+    finally: table.flush()
+    return table
+
 def save_uncertainty_results(model, path=None):
     if not path:
         import os
@@ -555,12 +555,15 @@ def get_total_inputs(unit):
         ins = unit.outs
     else:
         ins = unit.ins
+    ins = tuple(i for i in ins if i)
+    COD, N, P, K = WasteStream.composite_many(ins, ('COD', 'TN', 'TP', 'TK'),
+                                              as_load=True).sum(axis=0)
     inputs = {}
-    inputs['COD'] = sum(i.COD*i.F_vol/1e3 for i in ins)
-    inputs['N'] = sum(i.TN*i.F_vol/1e3 for i in ins)
+    inputs['COD'] = COD
+    inputs['N'] = N
     inputs['NH3'] = sum(i.imass['NH3'] for i in ins)
-    inputs['P'] = sum(i.TP*i.F_vol/1e3 for i in ins)
-    inputs['K'] = sum(i.TK*i.F_vol/1e3 for i in ins)
+    inputs['P'] = P
+    inputs['K'] = K
     hr = 365 * 24
     for i, j in inputs.items():
         inputs[i] = j * hr
@@ -570,15 +573,18 @@ def get_recovery(ins=None, outs=None, hr=365*24, ppl=1, if_relative=True):
     try: iter(outs)
     except: outs = (outs,)
     non_g = tuple(i for i in outs if i.phase != 'g')
+    COD, N, P, K = WasteStream.composite_many(non_g, ('COD', 'TN', 'TP', 'TK'),
+                                              as_load=True).sum(axis=0)
     recovery = {}
-    recovery['COD'] = sum(i.COD*i.F_vol/1e3 for i in non_g)
-    recovery['N'] = sum(i.TN*i.F_vol/1e3 for i in non_g)
+    recovery['COD'] = COD
+    recovery['N'] = N
     recovery['NH3'] = sum(i.imass['NH3'] for i in non_g)
-    recovery['P'] = sum(i.TP*i.F_vol/1e3 for i in non_g)
-    recovery['K'] = sum(i.TK*i.F_vol/1e3 for i in non_g)
+    recovery['P'] = P
+    recovery['K'] = K
+    if if_relative:
+        inputs = get_total_inputs(ins)
     for i, j in recovery.items():
         if if_relative:
-            inputs = get_total_inputs(ins)
             recovery[i] /= inputs[i]/hr * ppl
         else:
             recovery[i] /= 1/hr * ppl
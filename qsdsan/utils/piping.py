@@ -137,7 +137,6 @@ class WSSequence(StreamSequence):
                     self._initialize_missing_streams()
 
     def _create_missing_stream(self):
-        MissingWS(None, None).show()
         return MissingWS(None, None)
     
     def _create_N_missing_streams(self, N):
@@ -12,10 +12,108 @@ Please refer to https://github.com/QSD-Group/QSDsan/blob/master/LICENSE.txt
 for license details.
 '''
 
-def test_bwaise():
+import os
+from math import isclose, ceil
+import numpy as np
+
+def test_bwaise(tmp_path):
     from qsdsan.systems import bwaise as bw
     bw.print_summaries((bw.sysA, bw.sysB, bw.sysC))
     
+    # Stream states of each sample can be written to the disk
+    m = bw.models
+    dct = m.run_uncertainty(m.modelA, seed=3221, N=2, percentiles=(),
+                            stream_path=os.path.join(tmp_path, 'modelA'))
+    streams = dct['streams']
+    assert streams.mol.shape[0] == len(streams) == 2
+    assert not streams.failed.any()
+    assert m.modelA.specification is None
+    metrics = m.modelA(dct['parameters'].values[0]) # row 0 is for the first sample
+    assert np.allclose(streams.mol[0], [s.mol for s in streams.streams])
+    assert np.allclose(dct['data'].iloc[0], metrics, equal_nan=True)
+    
+    # Stream impacts use cached characterization factors until they are changed
+    lca = bw.lcaA
+    ind = 'GlobalWarming'
+    total = lca.get_stream_impacts(kind='all')[ind]
+    emission = lca.get_stream_impacts(kind='direct_emission')[ind]
+    offset = lca.get_stream_impacts(kind='offset')[ind]
+    assert isclose(emission+offset, total)
+    item = lca.stream_inventory[0]
+    CFs = item.CFs
+    CF = CFs.get(ind)
+    CFs[ind] = (CF or 0.) + 1.
+    F_mass = sum(i.linked_stream.F_mass for i in lca.stream_inventory if i.CFs is CFs)
+    assert isclose(lca.get_stream_impacts()[ind]-total, F_mass*lca.lifetime_hr)
+    if CF is None: del CFs[ind] # the items are shared with other tests
+    else: CFs[ind] = CF
+    
+    # Totals of each category are only recalculated when changed
+    constr = lca.total_construction_impacts
+    assert lca.total_construction_impacts == constr
+    c = lca.construction_inventory[0]
+    quantity = c.quantity
+    c.quantity = quantity + 1.
+    assert isclose(lca.total_construction_impacts[ind]-constr[ind], c.item.CFs.get(ind, 0.),
+                   rel_tol=1e-6) # difference of large totals
+    c.quantity = quantity
+    assert isclose(lca.total_impacts[ind], lca.get_total_impacts(time=lca.lifetime_hr)[ind])
+    
+    # Inventories are kept until the linkage of the items is changed
+    inventory = lca.construction_inventory
+    assert lca.construction_inventory is inventory
+    u = lca.construction_units[0]
+    constr = u.construction
+    u.construction = constr[1:]
+    assert len(lca.construction_inventory) == len(inventory) - 1
+    u.construction = constr
+    assert lca.construction_inventory == inventory
+    impacts = sum(i.impacts.get(ind, 0.) * (1 if i.lifetime is None else
+                                            ceil(lca.lifetime/i.lifetime))
+                  for i in u.construction)
+    assert isclose(lca.get_construction_impacts(u)[ind], impacts)
+    
+    # Impacts of multiple samples in one call
+    impacts = lca.evaluate_batch()
+    assert impacts.shape == (1, len(lca.indicators), 4)
+    col = [i.ID for i in lca.indicators].index(ind)
+    totals = (lca.total_construction_impacts, lca.total_transportation_impacts,
+              lca.total_stream_impacts, lca.total_other_impacts)
+    for n, total in enumerate(totals):
+        assert isclose(impacts[0, col, n], total[ind])
+    quantities = np.asarray([i.quantity for i in lca.construction_inventory])
+    impacts = lca.evaluate_batch(quantities=[quantities, 2*quantities])
+    assert np.allclose(impacts[1, :, 0], 2*impacts[0, :, 0])
+    assert np.allclose(impacts[1, :, 1:], impacts[0, :, 1:])
+
+    # Construction activities with lifetimes are replaced over the lifetime of the LCA
+    c = [i for i in lca.construction_inventory if i.item.CFs.get(ind)][0]
+    c.lifetime = lca.lifetime/2.5 # used three times
+    constr = lca.total_construction_impacts
+    assert isclose(constr[ind]-totals[0][ind], 2*c.impacts[ind])
+    assert isclose(lca.evaluate_batch()[0, col, 0], constr[ind])
+    unit = [i.unit for i in lca.indicators if i.ID == ind][0]
+    table = lca.get_impact_table('Construction')
+    item_totals = table.xs('Total', level='SanUnit')[f'{ind} [{unit}]']
+    assert isclose(item_totals.sum(), constr[ind])
+    c.lifetime = None
+    assert lca.total_construction_impacts == totals[0]
+
+    # Sum rows of the impact tables match the category totals
+    for cat, total in zip(('Construction', 'Transportation', 'Stream', 'Other'), totals):
+        table = lca.get_impact_table(cat)
+        if isinstance(table, str): continue
+        unit = [i.unit for i in lca.indicators if i.ID == ind][0]
+        assert isclose(table[f'{ind} [{unit}]'].iloc[-1], total[ind])
+    
+    # Units with their own objects of the same item share one block of the item
+    table = bw.lcaC.get_impact_table('Transportation')
+    trucking = table.loc['Trucking [tonne*km]']
+    assert tuple(trucking.index) == ('C3', 'C4', 'Total')
+    assert isclose(trucking['Item Ratio'].iloc[:-1].sum(), 1)
+    assert isclose(trucking['Quantity']['Total'], trucking['Quantity'].iloc[:-1].sum())
+    
 # This just means that if pytest runs this module, it calls the test_bwaise function
 if __name__ == '__main__':
-    test_bwaise()
\ No newline at end of file
+    import tempfile
+    test_bwaise(tempfile.mkdtemp())
\ No newline at end of file
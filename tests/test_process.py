@@ -12,13 +12,16 @@ for license details.
 
 import pytest
 import os
-from sympy import symbols, Eq
+from tempfile import TemporaryDirectory
+from sympy import symbols, sympify, Eq
 from sympy.parsing.sympy_parser import parse_expr
 from math import isclose
+import numpy as np
+from numpy.testing import assert_allclose
 
 def test_process():
     
-    from qsdsan import Components, Process, Processes, CompiledProcesses
+    from qsdsan import Components, WasteStream, Process, Processes, CompiledProcesses
     import thermosteam as tmo
     
     cmps = Components.load_default()
@@ -73,6 +76,38 @@ def test_process():
     assert abs(sum(p1._stoichiometry * p1._components.i_P).subs({'f_SI':1})) < 1e-8
     assert abs(sum(p1._stoichiometry * p1._components.i_charge).subs({'f_SI':1})) < 1e-8
     
+    p2 = Process('aero_hydrolysis_numeric', 
+                 'X_S -> [0.9]S_F + [0.1]S_I + [?]S_NH4 + [?]S_PO4 + [?]S_ALK', 
+                 ref_component='X_S',
+                 rate_equation='K_h * X_S',
+                 parameters=('K_h',))
+    assert isinstance(p2._stoichiometry, np.ndarray) # solved without sympy
+    assert_allclose(p2._stoichiometry, [float(sympify(v).subs({f_SI: 0.1})) 
+                                        for v in p1._stoichiometry], atol=1e-12)
+    
+    p2.check_conservation()
+    
+    p3 = Process('unbalanced', 'X_S -> [0.5]S_F', ref_component='X_S',
+                 rate_equation='K_h * X_S', parameters=('K_h',))
+    processes = Processes([p2, p3])
+    processes.compile()
+    with pytest.raises(RuntimeError):
+        processes.check_conservation((1.,))
+    assert processes.conserved_materials == ('COD', 'N', 'P', 'charge')
+    processes = Processes([p2])
+    processes.compile()
+    assert_allclose(processes.check_conservation((1.,)), 0, atol=1e-8)
+    p4 = Process('no_rate', 'X_S -> [0.9]S_F + [0.1]S_I + [?]S_NH4 + [?]S_PO4 + [?]S_ALK',
+                 ref_component='X_S')
+    processes = Processes([p2, p4])
+    processes.compile(skip_checks=True)
+    assert_allclose(processes.check_conservation((1.,)), 0, atol=1e-8) # no rates needed
+    with pytest.raises(RuntimeError, match='missing rate equations'):
+        processes.rate_function
+    compiled = CompiledProcesses([p2])
+    assert CompiledProcesses([p2]) is compiled
+    assert len(CompiledProcesses._cache) <= CompiledProcesses.cache_size
+    
     p1.set_parameters(f_SI = 0.0)
     assert p1.parameters['f_SI'] == 0.0
     assert Eq(p1._stoichiometry[p1._components._index['S_I']], parse_expr('1*f_SI'))
@@ -114,7 +149,101 @@ def test_process():
     assert isinstance(asm2d, CompiledProcesses)
     assert p12 in asm2d
     assert set(asm2d.parameters.keys()) == set(params)
-
+    # K_RED of ASM2d_original.csv is not in `params` (nor is S_CO3 of p14 a component)
+    with pytest.raises(RuntimeError, match="'K_RED'"):
+        asm2d.rate_function
     
+    asm2d = Processes.load_from_file(path, parameters=params)
+    with TemporaryDirectory() as cache_dir:
+        parsed = Processes.load_from_file(path, parameters=params, cache_dir=cache_dir)
+        assert len(os.listdir(cache_dir)) == 1
+        cached = Processes.load_from_file(path, parameters=params, cache_dir=cache_dir)
+    assert cached.IDs == asm2d.IDs
+    assert (cached.stoichiometry.values == parsed.stoichiometry.values).all()
+    assert (cached.rate_equations.values == parsed.rate_equations.values).all()
+    values = dict(zip(params, np.linspace(0.1, 1, len(params))))
+    asm2d.set_parameters(K_RED=0.5, **{k: v for k, v in values.items() if k != 'f_SI'})
+    assert asm2d.free_parameters == ('f_SI',)
+    C = np.linspace(1, 10, 2*len(asm2d._components)).reshape((2, -1))
+    rates = asm2d.rates(C, (values['f_SI'],))
+    assert rates.shape == C.shape
+    assert_allclose(rates[1], asm2d.rates(C[1], (values['f_SI'],)))
+    P = np.asarray([[0.1], [0.2]]) # f_SI of each sample
+    batch = asm2d.rates(C, P)
+    assert_allclose(batch[1], asm2d.rates(C[1], P[1]))
+    assert_allclose(asm2d.rates(C[0], P)[0], asm2d.rates(C[0], P[0]))
+    ws = WasteStream('ws_rates', S_F=1, X_S=2, X_H=3, S_O2=0.5)
+    idx = ws.components.indices(asm2d._components.IDs)
+    C_ws = ws.mass[idx] * 1e3 / ws.F_vol
+    assert_allclose(asm2d.rates_from_streams([ws, ws], P)[1], asm2d.rates(C_ws, P[1]))
+    rho_ws = asm2d.rate_function(C_ws, P[1]) # no X_PAO in the stream
+    assert np.isfinite(rho_ws).all()
+    assert rho_ws[asm2d.index('PAO_aero_growth_PHA')] == 0
+    C_nan = C_ws.copy()
+    C_nan[asm2d._components.index('S_O2')] = np.nan # not a zero in the denominators
+    assert np.isnan(asm2d.rate_function(C_nan, P[1])).any()
+    f_rates = asm2d._kernels['rate_function']
+    asm2d.set_parameters(f_SI=values['f_SI'])
+    assert asm2d._kernels['rate_function'] is f_rates # not recompiled
+    assert asm2d.free_parameters == ()
+    assert_allclose(asm2d.rates(C), rates)
+    concs = dict(zip(asm2d._components.IDs, C[0]))
+    rho = [float(eq.subs(concs)) for eq in asm2d.rate_equations.rate_equation]
+    assert_allclose(asm2d.rate_function(C[0]), rho)
+    stoichio = asm2d.stoichiometry.values.astype(float)
+    assert_allclose(asm2d.rates(C[0]), np.asarray(rho) @ stoichio)
+    J = asm2d.jacobian_function(C[0])
+    dC = np.eye(C.shape[1]) * 1e-6
+    J_fd = [(asm2d.rates(C[0]+i) - asm2d.rates(C[0]-i))/2e-6 for i in dC]
+    assert_allclose(J, np.column_stack(J_fd), rtol=1e-5, atol=1e-6)
+    J_sparse = asm2d.jacobian_function(C[0], sparse=True)
+    assert J_sparse.format == 'csr'
+    assert_allclose(J_sparse.toarray(), J)
+    assert np.isfinite(asm2d.jacobian_function(C_ws)).all() # no X_PAO
+    assert np.isnan(asm2d.jacobian_function(C_nan)).any()
+    assert_allclose(asm2d.sparse_stoichiometry.toarray(), stoichio)
+    assert not J[~asm2d.jacobian_sparsity.toarray()].any()
+    sub = asm2d.subgroup(asm2d.IDs[:3])
+    assert sub.IDs == asm2d.IDs[:3]
+    assert sub._kernels['rate_function'] # sliced without compiling
+    assert_allclose(sub.rates(C[0]), np.asarray(rho[:3]) @ stoichio[:3])
+    assert_allclose(sub.rates(C), (asm2d.rate_function(C)[:, :3] @ stoichio[:3]))
+    asm2d.set_parameters(K_h=2*values['K_h'])
+    assert asm2d._kernels['rate_function'] is f_rates
+    assert_allclose(asm2d.rate_function(C[0])[:3], 2*np.asarray(rho[:3])) # hydrolysis
+
+    # ASM2d in CSTRs with a typical influent (without PAO)
+    from qsdsan import sanunits
+    cmps_ww = Components([*cmps_asm2d, cmps.H2O])
+    cmps_ww.compile()
+    tmo.settings.set_thermo(cmps_ww)
+    asm2d = Processes.load_from_file(path, conserved_for=('COD', 'N', 'P', 'charge'),
+                                     parameters=(*params, 'K_RED'))
+    asm2d.set_parameters(
+        f_SI=0., Y_H=0.625, f_XI=0.1, Y_PO4=0.4, Y_PHA=0.2, Y_A=0.24, K_h=3.,
+        eta_NO3=0.6, eta_fe=0.4, K_O2=0.2, K_NO3=0.5, K_X=0.1, mu_H=6., q_fe=3.,
+        eta_NO3_deni=0.8, b_H=0.4, K_F=4., K_fe=4., K_A=4., K_NH4=0.05, K_P=0.01,
+        K_ALK=0.1, q_PHA=3., q_PP=1.5, mu_PAO=1., b_PAO=0.2, b_PP=0.2, b_PHA=0.2,
+        K_PS=0.2, K_PP=0.01, K_MAX=0.34, K_IPP=0.02, K_PHA=0.01, mu_AUT=1.,
+        b_AUT=0.15, K_O2_AUT=0.5, K_NH4_AUT=1., K_ALK_2=0.5, k_PRE=1., k_RED=0.6,
+        K_RED=0.5)
+    inf = WasteStream('inf_asm2d', S_F=0.1, X_S=0.2, X_H=0.03, S_NH4=0.025,
+                      S_PO4=0.005, S_ALK=0.084, S_O2=0.001, H2O=1000, units='kg/hr')
+    IDs = asm2d._components.IDs
+    C_in = inf.mass[inf.components.indices(IDs)] * 1e3 / inf.F_vol
+    R1 = sanunits.CSTR('R1_asm2d', ins=inf, processes=asm2d, HRT=4)
+    R1.simulate()
+    R2 = sanunits.CSTR('R2_asm2d', ins=inf.copy(), processes=asm2d, HRT=4, aeration=2.)
+    R2.simulate()
+    for R in (R1, R2):
+        assert np.isfinite(R.state).all()
+        assert (R.outs[0].mass >= 0).all()
+        assert float(R.outs[0].imass['S_F']) < float(inf.imass['S_F'])
+    C_in[IDs.index('S_O2')] = 2.
+    dC_dt = (C_in - R2.state)/4 + asm2d.rates(np.maximum(R2.state, 0.))
+    dC_dt[IDs.index('S_O2')] = 0
+    assert_allclose(dC_dt, 0, atol=1e-4)
+
+
 if __name__ == '__main__':
     test_process()    
\ No newline at end of file
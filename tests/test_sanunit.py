@@ -34,6 +34,34 @@ def test_sanunit():
     System.simulate()
     assert_allclose(M2.installed_cost, 65519.00446342958, rtol=1e-3)
 
+    # Reactors with kinetics of processes
+    from qsdsan import Process, Processes
+    Y = 0.6
+    growth = Process('growth', {'S_F': -1/Y, 'X_OHO': 1., 'S_O2': -(1-Y)/Y},
+                     ref_component='X_OHO',
+                     rate_equation='mu*S_F/(K_S+S_F)*S_O2/(K_O+S_O2)*X_OHO',
+                     parameters=('mu', 'K_S', 'K_O'))
+    decay = Process('decay', {'X_OHO': -1., 'S_O2': -1.}, ref_component='X_OHO',
+                    rate_equation='b*X_OHO', parameters=('b',))
+    processes = Processes((growth, decay))
+    processes.compile()
+    processes.set_parameters(mu=6., K_S=20., K_O=0.2)
+    inf = WasteStream('inf', S_F=0.2, X_OHO=0.01, H2O=1000, units='kg/hr')
+    R1 = sanunits.CSTR('R1', ins=inf, processes=processes, HRT=1., aeration=2.,
+                       parameters={'b': 0.4})
+    R1.simulate()
+    IDs = processes._components.IDs
+    C_in = inf.mass[inf.components.indices(IDs)] * 1e3 / inf.F_vol
+    dC_dt = C_in - R1.state + processes.rates(R1.state, (0.4,)) # HRT is 1 d
+    dC_dt[IDs.index('S_O2')] = 0
+    assert_allclose(dC_dt, 0, atol=1e-5)
+    assert float(R1.outs[0].imass['S_F']) < float(inf.imass['S_F'])
+    
+    R2 = sanunits.BatchReactor('R2', ins=inf.copy(), processes=processes,
+                               t_batch=0.5, aeration=2., parameters={'b': 0.4})
+    R2.simulate()
+    assert float(R1.outs[0].imass['S_F']) < float(R2.outs[0].imass['S_F']) < float(inf.imass['S_F'])
+
 
 # This just means that if pytest runs this module, it calls the test_sanunit function
 if __name__ == '__main__':
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+QSDsan: Quantitative Sustainable Design for sanitation and resource recovery systems
+
+This module is under the University of Illinois/NCSA Open Source License.
+Please refer to https://github.com/QSD-Group/QSDsan/blob/master/LICENSE.txt
+for license details.
+'''
+
+import os, pytest
+from numpy.testing import assert_allclose
+
+def test_stream_table(tmp_path):
+    import biosteam as bst
+    from qsdsan import Components, WasteStream, StreamTable, sanunits
+    components = Components.load_default()
+    bst.settings.set_thermo(components)
+    ws1 = WasteStream('ws1', S_Ac=5, H2O=1000, units='kg/hr')
+    ws2 = WasteStream('ws2', X_NOO=10, H2O=1000, units='kg/hr')
+    M1 = sanunits.Mixer('M1', ins=(ws1, ws2), outs='mixture')
+    sys = bst.System('sys', path=(M1,))
+    sys.simulate()
+    
+    table = StreamTable.from_system(sys, size=3)
+    assert table.stream_IDs == ('mixture', 'ws1', 'ws2')
+    table.record()
+    ws1.imass['S_Ac'] = 10
+    ws1._COD = 100.
+    sys.simulate()
+    assert table.record() == 1
+    assert len(table) == 2
+    assert_allclose(table.get_component_data('S_Ac')[:2, 1]*components.S_Ac.MW, (5, 10))
+    assert table.states['COD'][1, 1] == 100.
+    
+    table.restore(0)
+    assert_allclose(float(ws1.imass['S_Ac']), 5)
+    assert ws1._COD is None
+    
+    path = os.path.join(tmp_path, 'table.npz')
+    table.save(path)
+    loaded = StreamTable.load(path, streams=table.streams)
+    assert loaded.mol.shape == (3, 3, components.size)
+    assert len(loaded) == 2 # only two of the three rows are recorded
+    assert loaded.record() == 2
+    loaded.restore(1)
+    assert_allclose(float(ws1.imass['S_Ac']), 10)
+    assert_allclose(float(M1.outs[0].imass['S_Ac']), 10)
+    assert ws1.COD == 100.
+    
+    table.record_failure(2)
+    assert tuple(table.failed) == (False, False, True)
+    with pytest.raises(ValueError):
+        table.restore(2)
+    with pytest.raises(IndexError):
+        table.record()
+    
+    # Memory-mapped tables
+    path = os.path.join(tmp_path, 'table')
+    table = StreamTable.from_system(sys, size=2, path=path)
+    table.record()
+    table.flush()
+    opened = StreamTable.open(path)
+    assert len(opened) == 1
+    assert opened.stream_IDs == table.stream_IDs
+    assert_allclose(opened.get_stream_data('ws1'), table.get_stream_data('ws1'))
+    assert opened.T[1, 0] == 0
+    table.record_failure(1)
+    table.flush()
+    opened = StreamTable.open(path)
+    assert len(opened) == 2
+    assert tuple(opened.failed) == (False, True)
+
+
+if __name__ == '__main__':
+    import tempfile
+    test_stream_table(tempfile.mkdtemp())
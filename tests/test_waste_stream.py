@@ -24,13 +24,46 @@ def test_waste_stream():
     components = Components.load_default()
     tmo.settings.set_thermo(components)
 
+    # streams without flows should be cheap and ready for flows in any units
+    ws0 = WasteStream('ws0')
+    assert ws0.F_mass == 0
+    ws0.set_flow(1, 'kg/hr', 'H2O')
+    assert isclose(ws0.F_mass, 1)
+
     ws1 = WasteStream.codstates_inf_model('ws1', 1e5)
     ws2 = WasteStream.codstates_inf_model('ws2', 1e5*24/1e3, units=('m3/d', 'g/m3'))
     assert isclose(ws1.COD, 430, rel_tol=1e-3)
     assert isclose(ws1.TKN, 40, rel_tol=1e-3)
+    profile = ws1.solids_profile()
+    assert_allclose(profile.TSS, ws1.composite('solids', particle_size='x'))
+    assert_allclose(profile.VSS + profile.ISS, profile.TSS)
+    assert_allclose(ws1.get_TDS(), ws1.get_TDS(False) + profile.colloidal)
     assert isclose(ws1.TP, 10, rel_tol=1e-3)
     assert isclose(ws1.F_vol, ws2.F_vol)
     
+    # Weights of composite variables are compiled once and reused
+    cmps = ws1.components
+    assert cmps.get_composite_coefficients('N', specification='TKN') is \
+        cmps.get_composite_coefficients('N', specification='TKN')
+    sub = cmps.subgroup(('S_NH4', 'S_F', 'X_B_Subst'))
+    TKN_sub = sum(ws1.composite('N', subgroup=cmps.subgroup((i,))) for i in sub.IDs)
+    assert isclose(ws1.composite('N', subgroup=sub), TKN_sub)
+    with pytest.raises(KeyError):
+        ws1.composite('COD', specification='X_Undefined')
+    
+    # Characterize multiple influents at once
+    C, calibrated = WasteStream.batch_inf_model('codstates', COD=(430, 450), TP=10)
+    assert C.shape == (2, cmps.size)
+    assert_allclose(C[0, :-1], ws1.mass[:-1]*1e6/1e5) # kg/hr to mg/L
+    iXB = cmps.index('X_B_Subst')
+    assert_allclose(calibrated['i_P']['X_B_Subst'][0], cmps.i_P[iXB])
+    # Calibrated properties are overlaid on the compiled components
+    assert cmps.i_P[iXB] != components.X_B_Subst.i_P
+    assert cmps.i_mass is components.i_mass
+    ws4 = WasteStream.codbased_inf_model('ws4', 1e5)
+    assert isclose(ws4.COD, 430, rel_tol=1e-3)
+    assert WasteStream._default_ratios['iSUInf_SU'] == 1
+    
 
     ws1 = WasteStream(S_Ac=5, H2O=1000, units='kg/hr')
     ws2 = WasteStream(X_NOO=10, H2O=1000, units='kg/hr')
@@ -40,6 +73,37 @@ def test_waste_stream():
     # TODO: After updating the default component properties,
     # add in tests here to make sure COD, etc. are calculated correctly
     assert_allclose(ws3.COD, 7424.606289711915, rtol=1e-3)
+    # Only state variables set for all streams are mixed
+    assert_allclose(ws3.pH, 7)
+    ws1._TP = 1.
+    ws3.mix_from((ws1, ws2))
+    assert ws3._TP is None
+    ws1._TP = None
+    
+    values = WasteStream.composite_many((ws1, ws2, ws3), ('COD', 'TN', 'N'))
+    assert values.shape == (3, 3)
+    assert_allclose(values[:, 0], [ws.COD for ws in (ws1, ws2, ws3)])
+    ws3._TN = 1.
+    values = WasteStream.composite_many((ws1, ws3), ('TN', 'N'), as_load=True)
+    assert_allclose(values[1], (ws3.F_vol/1e3, ws3.composite('N')*ws3.F_vol/1e3))
+    
+    # Cached composite variables are updated with the flow
+    ws3._TN = None
+    ws3.cache_composites = True
+    TN = ws3.TN
+    assert ws3.TN == TN
+    ws3.imass['S_NH4'] = 1
+    assert ws3.TN > TN
+    TN = ws3.TN
+    ws3.mol[ws3.components.index('S_NH4')] *= 2
+    assert ws3.TN > TN
+    TN = ws3.TN
+    ws3.T += 10.
+    assert ws3.TN != TN
+    ws3.empty()
+    assert ws3.TN == 0
+    ws3.mix_from((ws1, ws2))
+    assert_allclose(ws3.COD, 7424.606289711915, rtol=1e-3)
     
     # Make sure below attributes are calculated based on flow info, cannot be set
     with pytest.raises(AttributeError):